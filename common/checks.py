@@ -0,0 +1,149 @@
+# pylint: disable=C0209,W0613
+"""
+System checks validating the database connection, cache and
+password hashing settings at startup
+"""
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core import checks
+from django.db import connections
+
+POOL_ENGINE = 'common.db.backends.postgresql_pool'
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+REHASH_POLICIES = ('always', 'upgrade', 'never')
+
+
+@checks.register(checks.Tags.compatibility)
+def check_connection_settings(app_configs, **kwargs) -> list:
+    """
+    Validates CONN_MAX_AGE, CONN_HEALTH_CHECKS and the pool
+    options of every database
+    """
+    messages = []
+    for alias, database in settings.DATABASES.items():
+        max_age = database.get('CONN_MAX_AGE', 0)
+        if max_age is not None and (
+            isinstance(max_age, bool) or
+            not isinstance(max_age, int) or
+            max_age < 0
+        ):
+            messages.append(checks.Error(
+                "CONN_MAX_AGE of database '{}' must be None or a "
+                "non-negative integer, got {!r}.".format(alias, max_age),
+                id='common.E001'
+            ))
+        health_checks = database.get('CONN_HEALTH_CHECKS', False)
+        if not isinstance(health_checks, bool):
+            messages.append(checks.Error(
+                "CONN_HEALTH_CHECKS of database '{}' must be a boolean, "
+                "got {!r}.".format(alias, health_checks),
+                id='common.E002'
+            ))
+        if database.get('ENGINE') != POOL_ENGINE:
+            continue
+        if find_spec('psycopg2') is None:
+            messages.append(checks.Error(
+                "The engine of database '{}' requires psycopg2.".format(
+                    alias
+                ),
+                id='common.E003'
+            ))
+        pool = database.get('POOL', {})
+        for option in ('MAX_IDLE', 'MAX_IDLE_TIME'):
+            value = pool.get(option, 1)
+            if isinstance(value, bool) or not isinstance(value, int) \
+                    or value < 1:
+                messages.append(checks.Error(
+                    "POOL['{}'] of database '{}' must be a positive "
+                    "integer, got {!r}.".format(option, alias, value),
+                    id='common.E004'
+                ))
+        if max_age != 0:
+            messages.append(checks.Warning(
+                "Database '{}' uses the connection pool with a "
+                "CONN_MAX_AGE other than 0.".format(alias),
+                hint=(
+                    "Connections kept by a thread between requests are "
+                    "not returned to the pool. Set CONN_MAX_AGE to 0."
+                ),
+                id='common.W001'
+            ))
+    return messages
+
+
+@checks.register(checks.Tags.database)
+def check_database_connection(app_configs, databases=None, **kwargs) -> list:
+    """
+    Connects to the given databases, run only when the check
+    command is called with --database
+    """
+    messages = []
+    for alias in databases or []:
+        try:
+            connections[alias].ensure_connection()
+        except Exception as error:  # pylint: disable=W0703
+            messages.append(checks.Error(
+                "Cannot connect to database '{}': {}".format(alias, error),
+                id='common.E005'
+            ))
+    return messages
+
+
+@checks.register(checks.Tags.caches)
+def check_cache_settings(app_configs, **kwargs) -> list:
+    """
+    Validates that the caches are shared between the WEB_WORKERS
+    processes, since the data versions and user statuses they
+    hold must be seen by every worker
+    """
+    messages = []
+    if settings.WEB_WORKERS <= 1:
+        return messages
+    for alias, cache in settings.CACHES.items():
+        if cache.get('BACKEND') == LOCMEM_BACKEND:
+            messages.append(checks.Error(
+                "Cache '{}' is local to each process, but WEB_WORKERS "
+                "is {}.".format(alias, settings.WEB_WORKERS),
+                hint=(
+                    "Writes and deactivations handled by a worker are "
+                    "not seen by the others. Set CACHE_URL to a file "
+                    "or Redis cache."
+                ),
+                id='common.E008'
+            ))
+    return messages
+
+
+@checks.register(checks.Tags.security)
+def check_password_hashing(app_configs, **kwargs) -> list:
+    """
+    Validates BCRYPT_ROUNDS and BCRYPT_REHASH
+    """
+    messages = []
+    rounds = settings.BCRYPT_ROUNDS
+    if isinstance(rounds, bool) or not isinstance(rounds, int) or \
+            not 4 <= rounds <= 31:
+        messages.append(checks.Error(
+            "BCRYPT_ROUNDS must be an integer between 4 and 31, "
+            "got {!r}.".format(rounds),
+            id='common.E006'
+        ))
+    elif rounds < 10:
+        messages.append(checks.Warning(
+            "BCRYPT_ROUNDS is lower than 10.",
+            hint=(
+                "A low cost makes logins cheaper, and brute forcing "
+                "stolen hashes as well."
+            ),
+            id='common.W002'
+        ))
+    if settings.BCRYPT_REHASH not in REHASH_POLICIES:
+        messages.append(checks.Error(
+            "BCRYPT_REHASH must be one of {}, got {!r}.".format(
+                ", ".join(REHASH_POLICIES),
+                settings.BCRYPT_REHASH
+            ),
+            id='common.E007'
+        ))
+    return messages
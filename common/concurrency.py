@@ -0,0 +1,65 @@
+"""
+Contains the bounded thread pool used to run independent
+database queries concurrently
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+
+class QueryPool:
+    """
+    Process wide pool of QUERY_POOL_WORKERS threads. Each thread
+    holds its own database connection, which is recycled as the
+    request connections are (CONN_MAX_AGE)
+    """
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return settings.QUERY_POOL_WORKERS > 1
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.QUERY_POOL_WORKERS,
+                    thread_name_prefix='query-pool'
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown()
+                cls._executor = None
+
+    @staticmethod
+    def _call(function):
+        close_old_connections()
+        try:
+            return function()
+        finally:
+            close_old_connections()
+
+    @classmethod
+    def map(cls, functions) -> list:
+        """
+        Results of the given callables, in order. They run on the
+        pool when it is enabled, unless a transaction is open in
+        the calling thread: other connections would not see
+        its uncommitted writes
+        """
+        functions = list(functions)
+        if (
+            not cls.enabled() or
+            len(functions) < 2 or
+            connection.in_atomic_block
+        ):
+            return [function() for function in functions]
+        return list(cls.executor().map(cls._call, functions))
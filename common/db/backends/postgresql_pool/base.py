@@ -0,0 +1,130 @@
+"""
+PostgreSQL backend sharing a pool of idle connections between the
+threads of a process. Closing a connection, which Django does at the
+end of every request when CONN_MAX_AGE is 0, returns it to the pool
+and the next connection of any thread reuses it
+"""
+import threading
+import time
+from collections import deque
+
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+
+class ConnectionPool:
+    """
+    Idle connections of a database alias. The most recently returned
+    connection is reused first, so the surplus ones expire after
+    max_idle_time seconds
+    """
+    def __init__(self, max_idle: int, max_idle_time: float):
+        self.max_idle = max_idle
+        self.max_idle_time = max_idle_time
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _expired(self) -> list:
+        """
+        Removes the connections idle for too long, oldest first
+        """
+        deadline = time.monotonic() - self.max_idle_time
+        expired = []
+        while self._idle and self._idle[0][1] < deadline:
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def get(self):
+        """
+        Idle open connection, or None when there is none
+        """
+        with self._lock:
+            expired = self._expired()
+            connection = self._idle.pop()[0] if self._idle else None
+        for stale in expired:
+            stale.close()
+        if connection is not None and connection.closed:
+            return self.get()
+        return connection
+
+    def put(self, connection) -> bool:
+        """
+        Keeps an idle connection. Returns False when the pool is full
+        """
+        with self._lock:
+            expired = self._expired()
+            kept = len(self._idle) < self.max_idle
+            if kept:
+                self._idle.append((connection, time.monotonic()))
+        for stale in expired:
+            stale.close()
+        return kept
+
+    def clear(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            connection.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pools = {}
+    pools_lock = threading.Lock()
+
+    @property
+    def pool(self) -> ConnectionPool:
+        with self.pools_lock:
+            if self.alias not in self.pools:
+                options = self.settings_dict.get('POOL', {})
+                self.pools[self.alias] = ConnectionPool(
+                    max_idle=options.get('MAX_IDLE', 10),
+                    max_idle_time=options.get('MAX_IDLE_TIME', 300)
+                )
+            return self.pools[self.alias]
+
+    def is_reusable(self, connection) -> bool:
+        """
+        Whether an idle connection still works, checked only when
+        CONN_HEALTH_CHECKS is enabled
+        """
+        if not self.settings_dict['CONN_HEALTH_CHECKS']:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+        except base.Database.Error:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params):
+        while True:
+            connection = self.pool.get()
+            if connection is None:
+                return super().get_new_connection(conn_params)
+            if self.is_reusable(connection):
+                break
+            connection.close()
+        # Pooled connections were opened with the same OPTIONS
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level',
+            connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        connection = self.connection
+        if (
+            connection is not None and
+            not connection.closed and
+            not self.errors_occurred and
+            connection.get_transaction_status() ==
+            extensions.TRANSACTION_STATUS_IDLE and
+            self.pool.put(connection)
+        ):
+            return None
+        return super()._close()
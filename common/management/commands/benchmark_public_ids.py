@@ -0,0 +1,139 @@
+# pylint: disable=C0209
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+from common.uuids import uuid7
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the public id storages (36 character strings against "
+        "the UUID type of the database, with random or time-ordered "
+        "UUIDs) by insert time, unique index size and lookup latency, "
+        "over throwaway tables"
+    )
+
+    VARIANTS = (
+        ('varchar(36), uuid4', False, uuid.uuid4),
+        ('uuid, uuid4', True, uuid.uuid4),
+        ('uuid, uuid7', True, uuid7),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=200000,
+            help="Number of rows per table."
+        )
+        parser.add_argument(
+            "--lookups",
+            type=int,
+            default=5000,
+            help="Number of lookups by public id per table."
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database the tables are created in."
+        )
+
+    @staticmethod
+    def index_size(cursor, connection, table: str) -> int:
+        """
+        Bytes used by the indexes of the table
+        """
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT pg_indexes_size(%s)", [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT SUM(pgsize) FROM dbstat WHERE name IN ("
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = %s)",
+                [table]
+            )
+        else:
+            return 0
+        return cursor.fetchone()[0] or 0
+
+    def measure(self, connection, table, native, generate, options):
+        field = models.UUIDField()
+        column_type = field.db_type(connection) if native else 'varchar(36)'
+        ids = [generate() for _ in range(options['rows'])]
+        values = [
+            field.get_db_prep_value(value, connection) if native
+            else str(value)
+            for value in ids
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE {} (id integer PRIMARY KEY, "
+                "public_id {} NOT NULL UNIQUE)".format(table, column_type)
+            )
+            try:
+                insert = self.insert(cursor, connection, table, values)
+                size = self.index_size(cursor, connection, table)
+                lookup = self.lookup(cursor, table, random.sample(
+                    values,
+                    min(options['lookups'], len(values))
+                ))
+            finally:
+                cursor.execute("DROP TABLE {}".format(table))
+        return insert, size, lookup
+
+    @staticmethod
+    def insert(cursor, connection, table, values) -> float:
+        """
+        Seconds taken to insert the given public ids, in batches
+        """
+        started = time.perf_counter()
+        for start in range(0, len(values), 5000):
+            with transaction.atomic(using=connection.alias):
+                cursor.executemany(
+                    "INSERT INTO {} (id, public_id) "
+                    "VALUES (%s, %s)".format(table),
+                    list(enumerate(values[start:start + 5000], start))
+                )
+        return time.perf_counter() - started
+
+    @staticmethod
+    def lookup(cursor, table, sample) -> float:
+        """
+        Average seconds taken to look up one of the given public ids
+        """
+        started = time.perf_counter()
+        for value in sample:
+            cursor.execute(
+                "SELECT id FROM {} WHERE public_id = %s".format(table),
+                [value]
+            )
+            cursor.fetchone()
+        return (time.perf_counter() - started) / len(sample)
+
+    def handle(self, **options):
+        connection = connections[options['database']]
+        self.stdout.write("{} on {}".format(
+            "{} rows".format(options['rows']),
+            connection.vendor
+        ))
+        for index, (name, native, generate) in enumerate(self.VARIANTS):
+            insert, size, lookup = self.measure(
+                connection,
+                "benchmark_public_ids_{}".format(index),
+                native,
+                generate,
+                options
+            )
+            self.stdout.write(
+                "{name:<20} insert {insert:>7.2f}s "
+                "indexes {size:>8.1f}MiB lookup {lookup:>7.1f}us".format(
+                    name=name,
+                    insert=insert,
+                    size=size / 2 ** 20,
+                    lookup=lookup * 1e6
+                )
+            )
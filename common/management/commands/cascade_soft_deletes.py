@@ -0,0 +1,44 @@
+# pylint: disable=C0209
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from common.managers.custom_base_model_manager import active_descendants
+
+
+class Command(BaseCommand):
+    help = (
+        "Deactivates the active entries whose ancestors were "
+        "deactivated before deactivation cascaded, so that queries "
+        "can filter on the is_active of the entries alone. They are "
+        "stamped with the deactivated_on of their ancestor, so that "
+        "activating it restores them. Entries already consistent "
+        "are left untouched, so it can run on every deploy"
+    )
+
+    def handle(self, **options):
+        for model in apps.get_models():
+            ancestors = set()
+            for child, path in active_descendants(model):
+                ancestors.update(
+                    child.all_objects.filter(
+                        is_active=True,
+                        **{path + '__is_active': False}
+                    ).values_list(path, flat=True).distinct()
+                )
+            if not ancestors:
+                continue
+            # Deactivated before deactivated_on was set
+            model.all_objects.filter(
+                pk__in=ancestors,
+                deactivated_on__isnull=True
+            ).update(deactivated_on=models.F('modified_on'))
+            for ancestor in model.all_objects.filter(pk__in=ancestors):
+                with transaction.atomic():
+                    ancestor.cascade_active(False)
+            self.stdout.write(
+                "{}: cascaded {} inactive entries.".format(
+                    model._meta.label,
+                    len(ancestors)
+                )
+            )
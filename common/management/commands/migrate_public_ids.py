@@ -0,0 +1,111 @@
+# pylint: disable=C0209
+import uuid
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts the public ids stored as 36 character strings, before "
+        "public_id became a UUIDField, to the UUID storage of the "
+        "database. PostgreSQL converts them when migrating to its "
+        "native uuid type; other databases store 32 hex digits, which "
+        "this command rewrites with one UPDATE per table. --check only "
+        "reports the values that are not valid UUIDs, and can run "
+        "before migrating"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only reports the invalid public ids, changing nothing."
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to convert."
+        )
+
+    @staticmethod
+    def tables(connection) -> list:
+        """
+        Existing tables of the models with a public id
+        """
+        existing = set(connection.introspection.table_names())
+        return [
+            model._meta.db_table
+            for model in apps.get_models()
+            if model._meta.db_table in existing and any(
+                field.name == 'public_id'
+                for field in model._meta.concrete_fields
+            )
+        ]
+
+    @staticmethod
+    def invalid_ids(cursor, table: str) -> int:
+        """
+        Number of values of the table that are not UUIDs, read
+        as text so that it works with either column type
+        """
+        cursor.execute("SELECT public_id FROM {}".format(table))
+        invalid = 0
+        while True:
+            rows = cursor.fetchmany(2000)
+            if not rows:
+                return invalid
+            for (value,) in rows:
+                try:
+                    uuid.UUID(str(value))
+                except ValueError:
+                    invalid += 1
+
+    def handle(self, **options):
+        connection = connections[options['database']]
+        quote = connection.ops.quote_name
+        invalid = {}
+        with connection.cursor() as cursor:
+            for table in self.tables(connection):
+                count = self.invalid_ids(cursor, quote(table))
+                if count:
+                    invalid[table] = count
+        for table, count in invalid.items():
+            self.stderr.write(
+                "{}: {} public ids are not valid UUIDs.".format(table, count)
+            )
+        if options['check']:
+            if invalid:
+                raise CommandError("Invalid public ids found.")
+            self.stdout.write("All public ids are valid UUIDs.")
+            return
+        if invalid:
+            raise CommandError(
+                "Fix the invalid public ids before converting them."
+            )
+        if connection.features.has_native_uuid_field:
+            self.stdout.write(
+                "Public ids use the native uuid type, nothing to convert."
+            )
+            return
+        field = models.UUIDField()
+        if field.db_type(connection) != 'char(32)':
+            raise CommandError(
+                "Unexpected UUID storage: {}".format(field.db_type(connection))
+            )
+        with transaction.atomic(using=options['database']), \
+                connection.cursor() as cursor:
+            for table in self.tables(connection):
+                cursor.execute(
+                    "UPDATE {} SET public_id = LOWER(REPLACE(public_id, "
+                    "'-', '')) WHERE LENGTH(public_id) = 36".format(
+                        quote(table)
+                    )
+                )
+                self.stdout.write(
+                    "{}: converted {} public ids.".format(
+                        table,
+                        cursor.rowcount
+                    )
+                )
@@ -5,23 +5,103 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
-class CustomBaseModelManager(models.Manager):
+def active_filter(model, prefix: str = '', ancestors: bool = True):
+    """
+    Q object selecting the active entries of model, reached through
+    the relation path prefix (e.g. 'task'). Unless ancestors is
+    False, the entries of the model ACTIVE_ANCESTORS must be
+    active as well, which is resolved with INNER JOINs
+    """
+    paths = [prefix] if prefix else ['']
+    if ancestors:
+        paths.extend(
+            "__".join(filter(None, (prefix, ancestor)))
+            for ancestor in getattr(model, 'ACTIVE_ANCESTORS', ())
+        )
+    return models.Q(**{
+        "__".join(filter(None, (path, 'is_active'))): True
+        for path in paths
+    })
+
+
+def active_descendants(model, path: str = '') -> list:
+    """
+    (model, path) pairs of the models whose ACTIVE_ANCESTORS reach
+    the given model through path, e.g. [(Tasks, 'project'),
+    (Cycles, 'task__project')] for the projects
+    """
+    descendants = []
+    for relation in model._meta.related_objects:
+        child = relation.related_model
+        child_path = "__".join(filter(None, (relation.field.name, path)))
+        if relation.one_to_many and \
+                child_path in getattr(child, 'ACTIVE_ANCESTORS', ()):
+            descendants.append((child, child_path))
+            descendants.extend(active_descendants(child, child_path))
+    return descendants
+
+
+class CustomBaseQuerySet(models.QuerySet):
+    def active(self, ancestors: bool = True) -> QuerySet:
+        """
+        Queries only the active entries whose ancestors are
+        active as well, or regardless of them when ancestors
+        is False (e.g. when the ancestors are already known
+        to be active)
+        """
+        return self.filter(active_filter(self.model, ancestors=ancestors))
+
+    def inactive(self) -> QuerySet:
+        """
+        Queries only the deactivated entries
+        """
+        return self.filter(is_active=False)
+
+    def update_active(self, **fields) -> int:
+        """
+        Updates the active status (and the given fields) of the
+        entries, overridden by the models that keep data derived
+        from it
+        """
+        return self.update(**fields)
+
+
+class CustomBaseModelManager(models.Manager.from_queryset(CustomBaseQuerySet)):
+    """
+    Manager of every entry, the default manager of the models,
+    which Django and DRF use for uniqueness validation, creation
+    and the related managers. A scoped manager (scoped=True)
+    queries only the active entries whose ancestors are active
+    as well. Unscoped is the default, since Django instantiates
+    the related managers from the default manager class without
+    arguments
+    """
+    def __init__(self, scoped: bool = False):
+        super().__init__()
+        self.scoped = scoped
+
+    def get_queryset(self) -> QuerySet:
+        query = super().get_queryset()
+        if self.scoped:
+            return query.active()
+        return query
+
     def query_active(self) -> QuerySet:
         """
         Queries only active entries
         """
-        return self.filter(is_active=True)
+        return super().get_queryset().active()
 
     def query_inactive(self) -> QuerySet:
         """
         Queries only the deactivated entries
         """
-        return self.filter(is_active=False)
+        return super().get_queryset().inactive()
 
 
 class CustomUserLogBaseModelManager(CustomBaseModelManager):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, scoped: bool = False):
+        super().__init__(scoped=scoped)
         # Fields to be ignored
         self.IGNORE_FIELDS_CREATE = ["created_by", "modified_by"]
 
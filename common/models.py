@@ -1,11 +1,13 @@
-import uuid
-
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .managers.custom_base_model_manager import (CustomBaseModelManager,
-                                                 CustomUserLogBaseModelManager)
+                                                 CustomUserLogBaseModelManager,
+                                                 active_descendants)
+from .signals import active_cascaded
+from .uuids import public_id_default
 
 Users = get_user_model()
 
@@ -16,10 +18,9 @@ class CustomBaseModel(models.Model):
     Base Custom Model containing common properties and
     methods that can be used by other apps
     """
-    public_id = models.CharField(
-        default=uuid.uuid4,
-        unique=True,
-        max_length=36
+    public_id = models.UUIDField(
+        default=public_id_default,
+        unique=True
     )
     is_active = models.BooleanField(
         help_text=_("Show whether the entry is active or not"),
@@ -34,25 +35,81 @@ class CustomBaseModel(models.Model):
         help_text=_("Date of last modification"),
         auto_now=True
     )
+    # Shared by the descendants deactivated along with the entry,
+    # which activating it restores. Saves leave it untouched
+    deactivated_on = models.DateTimeField(
+        help_text=_("Date of deactivation"),
+        null=True,
+        editable=False
+    )
+
+    # Relation paths of the entries that must be active for
+    # an entry to be considered active, e.g. ('project',)
+    ACTIVE_ANCESTORS = ()
 
-    objects = CustomBaseModelManager()
+    all_objects = CustomBaseModelManager()
+    objects = CustomBaseModelManager(scoped=True)
 
     def activate(self):
         """
         Method to activate entry
         """
-        self.is_active = True
-        self.save()
+        self.set_active(True)
 
     def deactivate(self):
         """
         Method to deactivate entry
         """
-        self.is_active = False
-        self.save()
+        self.set_active(False)
+
+    def set_active(self, is_active: bool, **fields) -> None:
+        """
+        Activates or deactivates the entry along with its
+        descendants in a single transaction. Only the changed
+        fields of the entry are saved
+        """
+        deactivated_on = self.deactivated_on
+        with transaction.atomic():
+            if is_active:
+                self.deactivated_on = None
+            elif self.is_active or deactivated_on is None:
+                self.deactivated_on = timezone.now()
+            self.is_active = is_active
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.save(update_fields=[
+                'is_active', 'deactivated_on', 'modified_on', *fields
+            ])
+            self.cascade_active(is_active, deactivated_on, **fields)
+
+    def cascade_active(self, is_active: bool, since=None, **fields):
+        """
+        Applies the active status of the entry to its descendants
+        (the entries whose ACTIVE_ANCESTORS reach it) with one
+        UPDATE per model, stamping them with its deactivated_on.
+        Activation only restores the descendants stamped with
+        since, i.e. those deactivated along with the entry.
+        Sends active_cascaded for each updated model
+        """
+        for model, path in active_descendants(type(self)):
+            query = model.all_objects.filter(
+                **{path: self.pk, 'is_active': not is_active}
+            )
+            if is_active:
+                if since is None:
+                    continue
+                query = query.filter(deactivated_on=since)
+            if query.update_active(
+                is_active=is_active,
+                deactivated_on=self.deactivated_on,
+                modified_on=self.modified_on,
+                **fields
+            ):
+                active_cascaded.send(sender=model, instance=self, path=path)
 
     class Meta:
         abstract = True
+        default_manager_name = 'all_objects'
 
 
 class CustomUserLogBaseModel(CustomBaseModel):
@@ -78,25 +135,23 @@ class CustomUserLogBaseModel(CustomBaseModel):
         help_text=_("Last modified by this user")
     )
 
-    objects = CustomUserLogBaseModelManager()
+    all_objects = CustomUserLogBaseModelManager()
+    objects = CustomUserLogBaseModelManager(scoped=True)
 
     def activate(self, user):
         """
         Overrided method to activate an entry
         It will also log which user activated
         """
-        self.is_active = True
-        self.modified_by = user
-        self.save()
+        self.set_active(True, modified_by=user)
 
     def deactivate(self, user):
         """
         Overrided method to deactivate an entry
         It will also log which user activated
         """
-        self.is_active = False
-        self.modified_by = user
-        self.save()
+        self.set_active(False, modified_by=user)
 
     class Meta:
         abstract = True
+        default_manager_name = 'all_objects'
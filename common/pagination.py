@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class CreationCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination ordered by creation, newest first.
+    Pages are fetched with a range predicate over the ordering
+    field instead of an OFFSET, so every page costs the same
+    regardless of how deep the client is. The cursor position
+    only holds the first ordering field, so it is the id: it is
+    unique and increases with creation, unlike created_on, whose
+    ties could be skipped or repeated across pages
+    """
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = settings.MAX_PAGE_SIZE
@@ -0,0 +1,114 @@
+from rest_framework.exceptions import ValidationError
+
+
+class Fieldset:
+    """
+    Sparse fieldset and expansion options requested by a client.
+    Nested fields are addressed with dotted paths,
+    e.g.: fields=name,tasks.name&expand=tasks
+    """
+    def __init__(self, fields=None, expand=None, depth=None):
+        self.fields = set(fields or [])
+        self.expand = set(expand or [])
+        self.depth = depth
+
+    @classmethod
+    def from_query_params(cls, query_params, default_depth=None):
+        """
+        Builds a fieldset from the ?fields=, ?expand= and ?depth=
+        query params. When none of them is given, nested fields are
+        expanded up to default_depth (None means the whole tree)
+        """
+        fields = cls._split(query_params.get('fields'))
+        expand = cls._split(query_params.get('expand'))
+        depth = query_params.get('depth')
+        if depth is not None:
+            try:
+                depth = int(depth)
+            except ValueError as e:
+                raise ValidationError(
+                    {'depth': "A valid integer is required."}
+                ) from e
+        elif not fields and not expand:
+            depth = default_depth
+        return cls(fields=fields, expand=expand, depth=depth)
+
+    @staticmethod
+    def _split(value) -> list:
+        if not value:
+            return []
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+    @staticmethod
+    def join(path: str, name: str) -> str:
+        return f"{path}.{name}" if path else name
+
+    def is_expanded(self, path: str) -> bool:
+        """
+        Whether the nested field in the given dotted path
+        must be built or not
+        """
+        requested = self.expand | self.fields
+        if any(
+            item == path or item.startswith(path + '.')
+            for item in requested
+        ):
+            return True
+        if self.depth is None:
+            return not requested
+        return path.count('.') < self.depth
+
+    def allowed_fields(self, path: str):
+        """
+        Set of field names requested for the given dotted path,
+        or None when every field is allowed
+        """
+        prefix = path + '.' if path else ''
+        allowed = {
+            item[len(prefix):].split('.')[0]
+            for item in self.fields
+            if item.startswith(prefix)
+        }
+        if not allowed:
+            return None
+        # Expanded nested fields are kept even if not listed in fields
+        return allowed | {
+            item[len(prefix):].split('.')[0]
+            for item in self.expand
+            if item.startswith(prefix)
+        }
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that drops the fields that were not
+    requested through the Fieldset found in the serializer context.
+    Fields listed in expandable_fields are only built when expanded
+    """
+    expandable_fields = ()
+
+    @property
+    def fieldset_path(self) -> str:
+        names = []
+        node = self
+        while node is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return '.'.join(reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get('fieldset')
+        if fieldset is None:
+            return fields
+        path = self.fieldset_path
+        allowed = fieldset.allowed_fields(path)
+        for name in list(fields):
+            if name in self.expandable_fields and not fieldset.is_expanded(
+                fieldset.join(path, name)
+            ):
+                fields.pop(name)
+            elif allowed is not None and name not in allowed:
+                fields.pop(name)
+        return fields
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent for each model updated by the cascade of the active status of
+# an entry (instance) to its descendants, which reach it through path.
+# The cascade updates querysets, which send no post_save
+active_cascaded = Signal()
@@ -0,0 +1,147 @@
+import unittest
+from copy import deepcopy
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from common.checks import (
+    POOL_ENGINE,
+    check_cache_settings,
+    check_connection_settings,
+    check_database_connection,
+    check_password_hashing
+)
+
+
+def databases(**options) -> dict:
+    default = deepcopy(settings.DATABASES['default'])
+    default.update(options)
+    return {'default': default}
+
+
+class ConnectionSettingsCheckTests(SimpleTestCase):
+    """
+    TestCase to test the validation of the connection settings
+    """
+    def ids(self) -> list:
+        return [message.id for message in check_connection_settings(None)]
+
+    def test_valid_settings(self):
+        self.assertEqual(self.ids(), [])
+        with override_settings(DATABASES=databases(CONN_MAX_AGE=None)):
+            self.assertEqual(self.ids(), [])
+
+    def test_invalid_max_age(self):
+        for max_age in (-1, '60', True):
+            with override_settings(
+                DATABASES=databases(CONN_MAX_AGE=max_age)
+            ):
+                self.assertEqual(self.ids(), ['common.E001'])
+
+    def test_invalid_health_checks(self):
+        with override_settings(
+            DATABASES=databases(CONN_HEALTH_CHECKS='False')
+        ):
+            self.assertEqual(self.ids(), ['common.E002'])
+
+    def test_pool_engine(self):
+        with override_settings(DATABASES=databases(
+            ENGINE=POOL_ENGINE,
+            CONN_MAX_AGE=60,
+            POOL={'MAX_IDLE': 0, 'MAX_IDLE_TIME': 300}
+        )):
+            ids = self.ids()
+        self.assertIn('common.E004', ids)
+        self.assertIn('common.W001', ids)
+        self.assertEqual(
+            'common.E003' in ids,
+            find_spec('psycopg2') is None
+        )
+
+
+class CacheSettingsCheckTests(SimpleTestCase):
+    """
+    TestCase to test the validation of the cache settings
+    """
+    def ids(self) -> list:
+        return [message.id for message in check_cache_settings(None)]
+
+    def test_single_worker(self):
+        with self.settings(WEB_WORKERS=1):
+            self.assertEqual(self.ids(), [])
+
+    def test_local_cache_with_workers(self):
+        with self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+        }}, WEB_WORKERS=4):
+            self.assertEqual(self.ids(), ['common.E008'])
+        with self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/var/tmp/tasktime'
+        }}, WEB_WORKERS=4):
+            self.assertEqual(self.ids(), [])
+
+
+class PasswordHashingCheckTests(SimpleTestCase):
+    """
+    TestCase to test the validation of the bcrypt settings
+    """
+    def ids(self) -> list:
+        return [message.id for message in check_password_hashing(None)]
+
+    def test_valid_settings(self):
+        self.assertEqual(self.ids(), [])
+
+    def test_invalid_settings(self):
+        with self.settings(BCRYPT_ROUNDS=32, BCRYPT_REHASH='sometimes'):
+            self.assertEqual(self.ids(), ['common.E006', 'common.E007'])
+        with self.settings(BCRYPT_ROUNDS=8):
+            self.assertEqual(self.ids(), ['common.W002'])
+
+
+class DatabaseConnectionCheckTests(TestCase):
+    """
+    TestCase to test the database connectivity check
+    """
+    def test_connection(self):
+        self.assertEqual(check_database_connection(None), [])
+        self.assertEqual(
+            check_database_connection(None, databases=['default']),
+            []
+        )
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed = 1
+
+
+@unittest.skipIf(find_spec('psycopg2') is None, "requires psycopg2")
+class ConnectionPoolTests(SimpleTestCase):
+    """
+    TestCase to test the pool of idle connections
+    """
+    def setUp(self):
+        # pylint: disable=C0415
+        from common.db.backends.postgresql_pool.base import ConnectionPool
+        self.pool = ConnectionPool(max_idle=2, max_idle_time=300)
+
+    def test_reuse(self):
+        first, second, third = (FakeConnection() for _ in range(3))
+        self.assertTrue(self.pool.put(first))
+        self.assertTrue(self.pool.put(second))
+        self.assertFalse(self.pool.put(third))
+        self.assertIs(self.pool.get(), second)
+        first.close()
+        self.assertIsNone(self.pool.get())
+
+    def test_expiry(self):
+        self.pool.max_idle_time = -1
+        connection = FakeConnection()
+        self.pool.put(connection)
+        self.assertIsNone(self.pool.get())
+        self.assertTrue(connection.closed)
@@ -0,0 +1,53 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+
+from common.concurrency import QueryPool
+
+
+def query_in_thread() -> tuple:
+    return (
+        threading.current_thread().name,
+        get_user_model().objects.count()
+    )
+
+
+@override_settings(QUERY_POOL_WORKERS=2)
+class QueryPoolTests(TransactionTestCase):
+    """
+    TestCase to test the thread pool running
+    independent queries
+    """
+    def setUp(self):
+        get_user_model().objects.create(
+            email="pool@test.com",
+            username="pool"
+        )
+
+    def tearDown(self):
+        QueryPool.shutdown()
+
+    def test_map(self):
+        results = QueryPool.map([query_in_thread, query_in_thread, list])
+        self.assertEqual([], results[2])
+        for name, count in results[:2]:
+            self.assertTrue(name.startswith('query-pool'))
+            self.assertEqual(1, count)
+
+    def test_serial_within_transaction(self):
+        with transaction.atomic():
+            results = QueryPool.map([query_in_thread, query_in_thread])
+        self.assertEqual(
+            [(threading.current_thread().name, 1)] * 2,
+            results
+        )
+
+    @override_settings(QUERY_POOL_WORKERS=0)
+    def test_disabled(self):
+        results = QueryPool.map([query_in_thread, query_in_thread])
+        self.assertEqual(
+            {threading.current_thread().name},
+            {name for name, _ in results}
+        )
@@ -0,0 +1,70 @@
+import uuid
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from common.uuids import public_id_default, uuid7
+
+User = get_user_model()
+
+
+class PublicIdGenerationTests(SimpleTestCase):
+    """
+    TestCase to test the generation of the public ids
+    """
+    def test_uuid7(self):
+        ids = [uuid7() for _ in range(1000)]
+        self.assertEqual({value.version for value in ids}, {7})
+        self.assertEqual({value.variant for value in ids}, {uuid.RFC_4122})
+        self.assertEqual(len(set(ids)), 1000)
+        # Ordered by their millisecond timestamp
+        timestamps = [value.int >> 80 for value in ids]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_default(self):
+        self.assertEqual(public_id_default().version, 4)
+        with override_settings(PUBLIC_ID_UUID7=True):
+            self.assertEqual(public_id_default().version, 7)
+
+
+class MigratePublicIdsTests(TestCase):
+    """
+    TestCase to test the conversion of the public ids
+    stored as strings before the UUIDField
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password="testpassword"
+        )
+
+    def store_raw(self, value: str) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE users_customuser SET public_id = %s WHERE id = %s",
+                [value, self.user.id]
+            )
+
+    def test_convert(self):
+        self.store_raw(str(self.user.public_id).upper())
+        call_command('migrate_public_ids', stdout=StringIO())
+        self.assertEqual(
+            User.objects.get(public_id=self.user.public_id),
+            self.user
+        )
+
+    def test_check(self):
+        self.store_raw('not a uuid')
+        err = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('migrate_public_ids', check=True, stderr=err)
+        self.assertIn(
+            "users_customuser: 1 public ids are not valid UUIDs.",
+            err.getvalue()
+        )
+        with self.assertRaises(CommandError):
+            call_command('migrate_public_ids', stderr=StringIO())
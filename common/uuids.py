@@ -0,0 +1,37 @@
+"""
+Contains the generation of the public ids
+"""
+import os
+import time
+import uuid
+
+from django.conf import settings
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (version 7): 48 bits of Unix milliseconds,
+    12 bits of sub-millisecond fraction and 62 random bits. New ids
+    land at the end of the unique index instead of a random page
+    """
+    nanoseconds = time.time_ns()
+    milliseconds, remainder = divmod(nanoseconds, 1000000)
+    fraction = remainder * 4096 // 1000000
+    random_bits = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    return uuid.UUID(int=(
+        (milliseconds & ((1 << 48) - 1)) << 80 |
+        7 << 76 |
+        fraction << 64 |
+        2 << 62 |
+        random_bits
+    ))
+
+
+def public_id_default() -> uuid.UUID:
+    """
+    Default of the public_id fields: a UUIDv7 when PUBLIC_ID_UUID7
+    is enabled, a random UUIDv4 otherwise
+    """
+    if settings.PUBLIC_ID_UUID7:
+        return uuid7()
+    return uuid.uuid4()
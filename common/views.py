@@ -1 +1,55 @@
-# Create your views here.
+from rest_framework.permissions import SAFE_METHODS
+
+from .serializers import Fieldset
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin that parses the ?fields=, ?expand= and ?depth=
+    query params and hands them to the serializers through the
+    serializer context. Write requests always get every field
+    """
+    # How deep nested fields are expanded by default (None: everything)
+    default_depth = None
+
+    def get_fieldset(self) -> Fieldset:
+        """
+        Fieldset requested by the client. Write requests
+        get the default fieldset
+        """
+        if hasattr(self, '_fieldset'):
+            return self._fieldset
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            self._fieldset = Fieldset(depth=self.default_depth)
+        else:
+            self._fieldset = Fieldset.from_query_params(
+                self.request.query_params,
+                default_depth=self.default_depth
+            )
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
+
+
+class SoftDeleteViewMixin:
+    """
+    View mixin that deactivates the entries on destroy instead of
+    deleting them, cascading to their descendants. Updates that
+    change is_active cascade as well
+    """
+    def perform_destroy(self, instance):
+        instance.deactivate(user=self.request.user)
+
+    def perform_update(self, serializer):
+        is_active = serializer.validated_data.pop(
+            'is_active',
+            serializer.instance.is_active
+        )
+        instance = serializer.save()
+        if is_active and not instance.is_active:
+            instance.activate(user=self.request.user)
+        elif not is_active and instance.is_active:
+            instance.deactivate(user=self.request.user)
@@ -86,9 +86,15 @@ MIDDLEWARE = [
 
 # Password hashers
 PASSWORD_HASHERS = [
-    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'users.hashers.ConfigurableBCryptSHA256PasswordHasher',
 ]
 
+# bcrypt cost (log2 of its rounds), each step doubles the time of a
+# login. Stored hashes of another cost are rehashed at login according
+# to BCRYPT_REHASH: 'always', 'upgrade' (only weaker hashes) or 'never'
+BCRYPT_ROUNDS = env.int('BCRYPT_ROUNDS', default=12)
+BCRYPT_REHASH = env.str('BCRYPT_REHASH', default='always')
+
 # SuperUser
 DJANGO_SUPERUSER_USERNAME = env.str('DJANGO_SUPERUSER_USERNAME', None)
 DJANGO_SUPERUSER_PASSWORD = env.str('DJANGO_SUPERUSER_PASSWORD', None)
@@ -122,9 +128,59 @@ SQLITE_DEFAULT = {
     'NAME': BASE_DIR / 'db.sqlite3',
 }
 
+# Serves the analytics endpoints with async views, meant for ASGI workers
+ASYNC_ANALYTICS = env.bool('ASYNC_ANALYTICS', default=False)
+
 DATABASES = {
     'default': env.dict('DATABASE', default=SQLITE_DEFAULT)
 }
+DATABASES['default'].update({
+    # Seconds a connection is reused across requests (0: a new
+    # connection per request). Meant for sync workers, whose
+    # threads outlive the requests: connections persisted by the
+    # short-lived threads and async contexts of ASGI workers leak,
+    # and the pool engine keeps the idle connections itself, so it
+    # defaults to 0 with either of them
+    'CONN_MAX_AGE': env.int(
+        'DB_CONN_MAX_AGE',
+        default=0 if ASYNC_ANALYTICS or DATABASES['default'].get(
+            'ENGINE'
+        ) == 'common.db.backends.postgresql_pool' else 60
+    ),
+    # Checks a reused connection before the first query of a request
+    'CONN_HEALTH_CHECKS': env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+    # Idle connections kept by the common.db.backends.postgresql_pool
+    # engine, meant for threaded or async workers with CONN_MAX_AGE 0
+    'POOL': {
+        'MAX_IDLE': env.int('DB_POOL_MAX_IDLE', default=10),
+        'MAX_IDLE_TIME': env.int('DB_POOL_MAX_IDLE_TIME', default=300),
+    },
+})
+
+
+# Cache
+# Accepts a cache URL, e.g.: locmemcache://tasktime (single process),
+# filecache:///var/tmp/tasktime (single node) or
+# rediscache://host:6379/1 (shared between nodes)
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://tasktime'),
+}
+
+# Number of gunicorn worker processes started by entrypoint.sh. With
+# more than one, the cache must be shared between them
+WEB_WORKERS = env.int('WEB_WORKERS', default=1)
+
+# Seconds an analytics response is kept in cache. Entries are
+# invalidated earlier whenever the user data changes
+ANALYTICS_CACHE_TIMEOUT = env.int('ANALYTICS_CACHE_TIMEOUT', default=3600)
+
+# Longest cycle, in days, the analytics account for when it starts
+# before the analyzed range, which bounds their scans over dt_start
+ANALYTICS_MAX_CYCLE_DAYS = env.int('ANALYTICS_MAX_CYCLE_DAYS', default=7)
+
+# Threads running independent analytics queries concurrently, each
+# one with its own database connection (0 or 1: queries run serially)
+QUERY_POOL_WORKERS = env.int('QUERY_POOL_WORKERS', default=0)
 
 
 # Password validation
@@ -192,11 +248,17 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS':
+        'common.pagination.CreationCursorPagination',
+    'PAGE_SIZE': env.int('PAGE_SIZE', default=50),
 }
 
+# Maximum page size a client can request through ?page_size=
+MAX_PAGE_SIZE = env.int('MAX_PAGE_SIZE', default=500)
+
 if not DEBUG:
     REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
         'rest_framework.renderers.JSONRenderer',
@@ -232,6 +294,43 @@ SIMPLE_JWT = {
     'TOKEN_USER_CLASS': 'rest_framework_simplejwt.models.TokenUser',
 }
 
+# Seconds the active status of a user is cached by the stateless JWT
+# authentication. Saving a user refreshes it, while bulk updates are
+# only noticed once it expires
+USER_STATUS_CACHE_TIMEOUT = env.int('USER_STATUS_CACHE_TIMEOUT', default=60)
+
+# Months of access logs kept by prune_access_logs, and months of
+# partitions created ahead of time on PostgreSQL
+ACCESS_LOG_RETENTION_MONTHS = env.int(
+    'ACCESS_LOG_RETENTION_MONTHS',
+    default=12
+)
+ACCESS_LOG_PARTITIONS_AHEAD = env.int('ACCESS_LOG_PARTITIONS_AHEAD', default=3)
+
+# Generates the public ids as time-ordered UUIDv7 instead of random
+# UUIDv4, so that inserts append to the end of their unique index
+PUBLIC_ID_UUID7 = env.bool('PUBLIC_ID_UUID7', default=False)
+
+# Number of most recent access logs nested in each user, the full
+# history is listed by /api/v1/auth/users/<public_id>/access-logs/
+RECENT_ACCESS_LOGS = env.int('RECENT_ACCESS_LOGS', default=5)
+
+# Access logs are queued and inserted in batches of up to
+# ACCESS_LOG_BATCH_SIZE logs, at least every ACCESS_LOG_FLUSH_INTERVAL
+# seconds, by a background thread. Logs that cannot be inserted are
+# appended to ACCESS_LOG_FALLBACK_FILE (see replay_access_logs)
+ACCESS_LOG_ASYNC = env.bool('ACCESS_LOG_ASYNC', default=True)
+ACCESS_LOG_BATCH_SIZE = env.int('ACCESS_LOG_BATCH_SIZE', default=100)
+ACCESS_LOG_FLUSH_INTERVAL = env.float(
+    'ACCESS_LOG_FLUSH_INTERVAL',
+    default=1.0
+)
+ACCESS_LOG_QUEUE_SIZE = env.int('ACCESS_LOG_QUEUE_SIZE', default=10000)
+ACCESS_LOG_FALLBACK_FILE = env.str(
+    'ACCESS_LOG_FALLBACK_FILE',
+    default=str(BASE_DIR / 'access_logs.jsonl')
+)
+
 # SPECTACULAR DRF
 SPECTACULAR_SETTINGS = {
     'TITLE': _('Task time management API'),
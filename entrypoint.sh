@@ -1,20 +1,41 @@
 #!/bin/bash
 
+# The per process cache is not shared between several workers
+if [ "${WEB_WORKERS:-1}" -gt 1 ] && [ -z "${CACHE_URL}" ]; then
+    export CACHE_URL="filecache:///var/tmp/tasktime"
+fi
+
 echo "Checking database availability"
 while ! nc -z $DB_HOST $DB_PORT; do
     sleep 0.1
 done
 
+echo "Validate settings and database connection"
+python manage.py check --database default || exit 1
+
 echo "Makemigrations"
 python manage.py makemigrations --no-input
 
 echo "Migrate"
 python manage.py migrate --no-input
 
+echo "Convert public ids stored as strings"
+python manage.py migrate_public_ids
+
+echo "Cascade soft deletes of earlier deactivations"
+python manage.py cascade_soft_deletes
+
 echo "Create super user"
 python manage.py custom_create_superuser --no-input
 
-echo "Run gunicorn"
-gunicorn --bind 0.0.0.0:8000 --workers 1 core.wsgi:application
+if [ "${ASYNC_ANALYTICS}" = "True" ]; then
+    echo "Run gunicorn with uvicorn (ASGI) workers"
+    gunicorn --bind 0.0.0.0:8000 --workers ${WEB_WORKERS:-1} \
+        --worker-class uvicorn.workers.UvicornWorker core.asgi:application
+else
+    echo "Run gunicorn"
+    gunicorn --bind 0.0.0.0:8000 --workers ${WEB_WORKERS:-1} \
+        core.wsgi:application
+fi
 
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,388 @@
+"""
+Contains the analytics builders used by the tasktime views
+"""
+import asyncio
+from datetime import date, datetime, time, timedelta
+from functools import partial
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Greatest, Least
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from common.concurrency import QueryPool
+from common.managers.custom_base_model_manager import active_filter
+
+from .intervals import Intervals, to_epoch
+from .models import Cycles, TaskDailyBuckets, Tasks
+
+
+def timezone_from_query_params(query_params):
+    """
+    Timezone requested through ?timezone=, defaulting to TIME_ZONE
+    """
+    try:
+        return ZoneInfo(query_params.get('timezone', settings.TIME_ZONE))
+    except (ValueError, ZoneInfoNotFoundError) as error:
+        raise ValidationError(
+            {'timezone': "Unknown IANA timezone"}
+        ) from error
+
+
+class LocalDays:
+    """
+    Splits time intervals at the midnights of a timezone, over
+    the half-open [start, end) date interval. Days across DST
+    transitions last 23 or 25 hours
+    """
+    def __init__(self, tz, start: date, end: date):
+        self.tz = tz
+        self.days = [
+            start + timedelta(days=offset)
+            for offset in range((end - start).days)
+        ]
+        self.boundaries = [
+            to_epoch(self.midnight(day))
+            for day in (*self.days, end)
+        ]
+
+    def midnight(self, day: date) -> datetime:
+        """
+        First instant of the given local day
+        """
+        return timezone.make_aware(datetime.combine(day, time.min), self.tz)
+
+    def seconds_per_day(self, intervals: Intervals) -> dict:
+        """
+        Duration of the intervals within each day, as
+        a dict {day: seconds} without empty days
+        """
+        sums = intervals.\
+            clip(self.boundaries[0], self.boundaries[-1]).\
+            sum_per_bucket(self.boundaries)
+        return {
+            day: seconds
+            for day, seconds in zip(self.days, sums)
+            if seconds
+        }
+
+
+class Histogram:
+    """
+    Builds the week, month and year duration histograms of a
+    date target, along with the previous period totals, in the
+    given timezone. Cycles are fetched with a single range scan
+    over Cycles.dt_start and split at the local midnights
+    """
+    def __init__(self, date_target: date, tz=None):
+        self.date_target = date_target
+        # ISO weeks start on monday and may begin in the previous year
+        iso_year, iso_week, _ = date_target.isocalendar()
+        week_start = date.fromisocalendar(iso_year, iso_week, 1)
+        month_start = date_target.replace(day=1)
+        year_start = date_target.replace(month=1, day=1)
+        last_month_start = (month_start - timedelta(days=1)).replace(day=1)
+        next_year_start = year_start.replace(year=year_start.year + 1)
+        last_year_start = year_start.replace(year=year_start.year - 1)
+        # Periods as half-open [start, end) date intervals
+        self.periods = {
+            'week': (week_start, week_start + timedelta(weeks=1)),
+            'last_week': (week_start - timedelta(weeks=1), week_start),
+            'month': (month_start, self._next_month(month_start)),
+            'last_month': (last_month_start, month_start),
+            'year': (year_start, next_year_start),
+            'last_year': (last_year_start, year_start),
+        }
+        self.days = LocalDays(
+            tz or timezone.get_default_timezone(),
+            *self.scan_range
+        )
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        """
+        Histogram of the requested ?date_target= in the requested
+        ?timezone=, defaulting to today in TIME_ZONE
+        """
+        tz = timezone_from_query_params(query_params)
+        date_target = timezone.localdate(timezone=tz)
+        if query_params.get('date_target'):
+            try:
+                date_target = datetime.strptime(
+                    query_params['date_target'],
+                    '%Y-%m-%d'
+                ).date()
+            except ValueError as error:
+                raise ValidationError(
+                    {'date_target': "Invalid date, use YYYY-MM-DD"}
+                ) from error
+        return cls(date_target, tz=tz)
+
+    @staticmethod
+    def _next_month(month_start: date) -> date:
+        return (month_start + timedelta(days=32)).replace(day=1)
+
+    @property
+    def scan_range(self) -> tuple:
+        """
+        Date interval covering every period
+        """
+        return (
+            min(start for start, _ in self.periods.values()),
+            max(end for _, end in self.periods.values())
+        )
+
+    def query(self, cycles_query: QuerySet) -> QuerySet:
+        """
+        Cycles intersecting the scan range. The range predicate
+        over dt_start can be answered by an index, looking back
+        ANALYTICS_MAX_CYCLE_DAYS for the cycles that started
+        before the scan range
+        """
+        scan_start, scan_end = self.scan_range
+        scan_start = self.days.midnight(scan_start)
+        return cycles_query.filter(
+            dt_start__gte=scan_start - timedelta(
+                days=settings.ANALYTICS_MAX_CYCLE_DAYS
+            ),
+            dt_start__lt=self.days.midnight(scan_end),
+            dt_end__gt=scan_start
+        )
+
+    def build(self, cycles_query: QuerySet) -> dict:
+        return self.build_from(
+            Intervals.from_queryset(self.query(cycles_query))
+        )
+
+    async def abuild(self, cycles_query: QuerySet) -> dict:
+        return self.build_from(
+            await Intervals.afrom_queryset(self.query(cycles_query))
+        )
+
+    def build_from(self, intervals: Intervals) -> dict:
+        """
+        Buckets the daily totals into the series and
+        period totals in one pass
+        """
+        totals = dict.fromkeys(self.periods, 0)
+        series = {'week': {}, 'month': {}, 'year': {}}
+        daily = self.days.seconds_per_day(intervals)
+        for day, seconds in daily.items():
+            for period, (start, end) in self.periods.items():
+                if start <= day < end:
+                    totals[period] += seconds
+            for period in ('week', 'month'):
+                start, end = self.periods[period]
+                if start <= day < end:
+                    series[period][day] = seconds
+            start, end = self.periods['year']
+            if start <= day < end:
+                series['year'][day.month] = series['year'].get(
+                    day.month, 0
+                ) + seconds
+        return {
+            period: {
+                'plot_data': {
+                    'series': list(series[period].values()),
+                    'xaxis': list(series[period].keys())
+                },
+                'additional_info': {
+                    'current_value': totals[period],
+                    'last_value': totals['last_' + period]
+                }
+            }
+            for period in ('week', 'month', 'year')
+        }
+
+
+class DurationRanking:
+    """
+    Builds the rankings of the tasks and projects with the longest
+    duration within an interval of local days. The daily buckets
+    are summed when their days (in TIME_ZONE) are the requested
+    ones, otherwise the cycles are clipped to the interval
+    """
+    PERIODS = ('week', 'month', 'year', 'all')
+    SIZE = 5
+
+    def __init__(self, start: date = None, end: date = None, tz=None):
+        # Half-open [start, end) interval, None stands for unbounded
+        self.start = start
+        self.end = end
+        self.tz = tz or timezone.get_default_timezone()
+
+    @classmethod
+    def from_query_params(cls, query_params, today: date = None):
+        """
+        Interval requested through ?period= or ?from=&to=
+        (both inclusive) in the requested ?timezone=.
+        Defaults to every recorded day
+        """
+        tz = timezone_from_query_params(query_params)
+        today = today or timezone.localdate(timezone=tz)
+        period = query_params.get('period')
+        if period and (query_params.get('from') or query_params.get('to')):
+            raise ValidationError(
+                {'period': "Use either period or from/to"}
+            )
+        if period:
+            if period not in cls.PERIODS:
+                raise ValidationError(
+                    {'period': "Supported periods: week, month, year, all"}
+                )
+            start = {
+                'week': today - timedelta(days=today.weekday()),
+                'month': today.replace(day=1),
+                'year': today.replace(month=1, day=1),
+                'all': None,
+            }[period]
+            return cls(start=start, tz=tz)
+        bounds = {}
+        for param in ('from', 'to'):
+            if not query_params.get(param):
+                continue
+            try:
+                bounds[param] = datetime.strptime(
+                    query_params[param],
+                    '%Y-%m-%d'
+                ).date()
+            except ValueError as error:
+                raise ValidationError(
+                    {param: "Invalid date, use YYYY-MM-DD"}
+                ) from error
+        end = bounds.get('to')
+        return cls(
+            start=bounds.get('from'),
+            end=end + timedelta(days=1) if end else None,
+            tz=tz
+        )
+
+    @property
+    def uses_buckets(self) -> bool:
+        """
+        Whether the daily buckets, split at the midnights of
+        TIME_ZONE, fit the interval
+        """
+        return (self.start is None and self.end is None) or \
+            str(self.tz) == settings.TIME_ZONE
+
+    def midnight(self, day: date) -> datetime:
+        return timezone.make_aware(datetime.combine(day, time.min), self.tz)
+
+    def query(self, user, name_field: str, **filters) -> QuerySet:
+        if self.uses_buckets:
+            return self.buckets_query(user, name_field, **filters)
+        return self.cycles_query(user, name_field, **filters)
+
+    def cycles_query(self, user, name_field: str, **filters) -> QuerySet:
+        """
+        Total duration per name_field of the finished active
+        cycles of the active tasks, clipped to the interval
+        """
+        query = Cycles.all_objects.active(ancestors=False).filter(
+            active_filter(Tasks, 'task', ancestors=False),
+            task__created_by=user,
+            dt_end__gte=models.F('dt_start'),
+            **filters
+        )
+        dt_start = models.F('dt_start')
+        dt_end = models.F('dt_end')
+        if self.start is not None:
+            start = self.midnight(self.start)
+            query = query.filter(
+                dt_start__gte=start - timedelta(
+                    days=settings.ANALYTICS_MAX_CYCLE_DAYS
+                ),
+                dt_end__gt=start
+            )
+            dt_start = Greatest(dt_start, models.Value(start))
+        if self.end is not None:
+            end = self.midnight(self.end)
+            query = query.filter(dt_start__lt=end)
+            dt_end = Least(dt_end, models.Value(end))
+        return query.\
+            values(name=models.F(name_field)).\
+            annotate(interval=models.Sum(
+                models.ExpressionWrapper(
+                    dt_end - dt_start,
+                    output_field=models.DurationField()
+                )
+            )).\
+            values_list('name', 'interval').\
+            order_by('-interval')[0:self.SIZE]
+
+    def buckets_query(self, user, name_field: str, **filters) -> QuerySet:
+        """
+        Total duration per name_field within the interval, summed
+        over the buckets of the active tasks (deactivating a project
+        deactivates its tasks)
+        """
+        query = TaskDailyBuckets.objects.filter(
+            active_filter(Tasks, 'task', ancestors=False),
+            task__created_by=user,
+            **filters
+        )
+        if self.start is not None:
+            query = query.filter(day__gte=self.start)
+        if self.end is not None:
+            query = query.filter(day__lt=self.end)
+        return query.\
+            values(name=models.F(name_field)).\
+            annotate(interval=models.Sum('total_seconds')).\
+            values_list('name', 'interval').\
+            order_by('-interval')[0:self.SIZE]
+
+    def queries(self, user) -> dict:
+        """
+        Independent ranking queries by response key
+        """
+        return {
+            'projects': self.query(
+                user,
+                'task__project__name',
+                task__project__created_by=user
+            ),
+            'tasks': self.query(user, 'task__name'),
+        }
+
+    @staticmethod
+    def as_data(rankings: dict) -> dict:
+        return {
+            key: {
+                # Clipped cycles are summed as durations
+                'series': [
+                    int(interval.total_seconds())
+                    if isinstance(interval, timedelta) else interval
+                    for _, interval in ranking
+                ],
+                'labels': [name for name, _ in ranking]
+            }
+            for key, ranking in rankings.items()
+        }
+
+    def build(self, user) -> dict:
+        """
+        Runs the ranking queries, concurrently
+        when the query pool is enabled
+        """
+        queries = self.queries(user)
+        rankings = QueryPool.map(
+            partial(list, query) for query in queries.values()
+        )
+        return self.as_data(dict(zip(queries, rankings)))
+
+    async def abuild(self, user) -> dict:
+        """
+        Async version of build, running the ranking queries
+        concurrently
+        """
+        queries = self.queries(user)
+
+        async def fetch(query):
+            return [row async for row in query]
+
+        rankings = await asyncio.gather(*map(fetch, queries.values()))
+        return self.as_data(dict(zip(queries, rankings)))
@@ -1,6 +1,28 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+from common.signals import active_cascaded
 
 
 class TasktimeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tasktime'
+
+    def ready(self):
+        # Imported once the models are loaded
+        # pylint: disable=C0415
+        from .constraints import create_cycles_overlap_constraint
+        from .signals import (bump_cascaded_user_data_versions,
+                              bump_user_data_version)
+        post_migrate.connect(
+            create_cycles_overlap_constraint,
+            sender=self
+        )
+        for model_name in ('Projects', 'Tasks', 'Cycles'):
+            model = self.get_model(model_name)
+            post_save.connect(bump_user_data_version, sender=model)
+            post_delete.connect(bump_user_data_version, sender=model)
+            active_cascaded.connect(
+                bump_cascaded_user_data_versions,
+                sender=model
+            )
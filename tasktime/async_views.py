@@ -0,0 +1,124 @@
+"""
+Async versions of the analytics views, served when the application
+runs under an ASGI server with ASYNC_ANALYTICS enabled
+"""
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .analytics import DurationRanking, Histogram
+from .caching import cache_per_user, conditional_per_user
+from .models import Cycles, Tasks
+
+
+class AsyncAPIView(View):
+    """
+    Base of the async analytics views. DRF views are sync only, so
+    this view authenticates the request with the DRF authentication
+    classes, requires an authenticated user and renders the DRF
+    responses and API exceptions itself
+    """
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    renderer_class = JSONRenderer
+
+    # Awaited by Django as the handlers of this view are coroutines
+    # pylint: disable-next=invalid-overridden-method
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(
+            request,
+            authenticators=[auth() for auth in self.authentication_classes]
+        )
+        try:
+            # Authentication may query the users table
+            user = await sync_to_async(lambda: request.user)()
+            if not user or not user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            response = await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as error:
+            response = self.handle_exception(request, error)
+        return self.finalize_response(request, response)
+
+    def handle_exception(self, request, error) -> Response:
+        response = Response(
+            data=error.detail
+            if isinstance(error.detail, (list, dict))
+            else {'detail': error.detail},
+            status=error.status_code
+        )
+        if isinstance(
+            error,
+            (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ) and request.authenticators:
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response['WWW-Authenticate'] = request.authenticators[0].\
+                authenticate_header(request)
+        return response
+
+    def finalize_response(self, request, response):
+        """
+        Sets the renderer of DRF responses, which are
+        rendered by the Django request handler
+        """
+        if isinstance(response, Response):
+            response.accepted_renderer = self.renderer_class()
+            response.accepted_media_type = \
+                response.accepted_renderer.media_type
+            response.renderer_context = {
+                'view': self,
+                'request': request,
+                'response': response
+            }
+        return response
+
+
+class AsyncDurationRankingView(AsyncAPIView):
+    @conditional_per_user
+    @cache_per_user
+    async def get(self, request):
+        ranking = DurationRanking.from_query_params(request.query_params)
+        return Response(
+            data=await ranking.abuild(request.user),
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncOpenTasksView(AsyncAPIView):
+    @conditional_per_user
+    @cache_per_user
+    async def get(self, request):
+        return Response(
+            data=[
+                row async for row in Tasks.objects.query_open(request.user)
+            ],
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncLastModifiedTasks(AsyncAPIView):
+    @conditional_per_user
+    @cache_per_user
+    async def get(self, request):
+        return Response(
+            data=[
+                row async for row in
+                Tasks.objects.query_last_modified(request.user)
+            ],
+            status=status.HTTP_200_OK
+        )
+
+
+class AsyncHistogramView(AsyncAPIView):
+    @conditional_per_user
+    @cache_per_user
+    async def get(self, request):
+        histogram = Histogram.from_query_params(request.query_params)
+        return Response(
+            data=await histogram.abuild(
+                Cycles.objects.query_finished(request.user)
+            ),
+            status=status.HTTP_200_OK
+        )
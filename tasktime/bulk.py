@@ -0,0 +1,167 @@
+"""
+Contains the bulk import of cycles
+"""
+from bisect import bisect_left
+from datetime import datetime, timezone
+
+from django.db import models, transaction
+from django.utils.translation import gettext_lazy as _
+
+from .caching import UserDataVersion
+from .models import Cycles, Tasks
+from .serializers import CyclesBulkItemSerializer
+
+# Sort key standing for the end of a cycle without end datetime
+OPEN_END = datetime.max.replace(tzinfo=timezone.utc)
+
+
+class CyclesBulkImport:
+    """
+    Imports a batch of cycles of a user. Items are validated one by
+    one, overlaps are detected against the stored cycles and within
+    the batch with a sort-and-sweep per task, and the accepted items
+    are inserted with bulk_create inside one transaction
+    """
+    def __init__(self, user, items: list, batch_size: int = 500):
+        self.user = user
+        self.items = items
+        self.batch_size = batch_size
+        self.results = [None] * len(items)
+
+    @staticmethod
+    def _end_key(dt_end) -> datetime:
+        return OPEN_END if dt_end is None else dt_end
+
+    def _error(self, index: int, errors) -> None:
+        self.results[index] = {
+            'index': index,
+            'status': 'error',
+            'errors': errors
+        }
+
+    def _overlap_error(self, index: int) -> None:
+        self._error(
+            index,
+            {'message': "O intervalo se sobrepõe a outro intervalo"}
+        )
+
+    def validate(self) -> dict:
+        """
+        Validates every item, returning the valid
+        ones grouped by task id
+        """
+        valid = {}
+        for index, item in enumerate(self.items):
+            serializer = CyclesBulkItemSerializer(data=item)
+            if serializer.is_valid():
+                data = serializer.validated_data
+                valid.setdefault(data['task'], []).append((index, data))
+            else:
+                self._error(index, serializer.errors)
+        user_tasks = set(
+            Tasks.objects.filter(
+                pk__in=valid.keys(),
+                created_by=self.user
+            ).values_list('id', flat=True)
+        )
+        for task_id in set(valid) - user_tasks:
+            for index, _data in valid.pop(task_id):
+                self._error(index, {'task': [_("Invalid task")]})
+        return valid
+
+    def existing_intervals(self, valid: dict) -> dict:
+        """
+        Stored active intervals of the batch tasks that may
+        intersect the batch, sorted by start per task
+        """
+        intervals = {task_id: [] for task_id in valid}
+        if not valid:
+            return intervals
+        batch = [data for items in valid.values() for _i, data in items]
+        batch_start = min(data['dt_start'] for data in batch)
+        batch_end = max(self._end_key(data.get('dt_end')) for data in batch)
+        query = Cycles.all_objects.active(ancestors=False).filter(
+            models.Q(dt_end__isnull=True) | models.Q(
+                dt_end__gt=batch_start,
+                dt_end__gte=models.F('dt_start')
+            ),
+            task_id__in=valid.keys()
+        )
+        if batch_end != OPEN_END:
+            query = query.filter(dt_start__lt=batch_end)
+        for task_id, dt_start, dt_end in query.values_list(
+            'task_id', 'dt_start', 'dt_end'
+        ).order_by('task_id', 'dt_start'):
+            intervals[task_id].append((dt_start, self._end_key(dt_end)))
+        return intervals
+
+    def sweep(self, items: list, intervals: list) -> list:
+        """
+        Accepts the items of a task that intersect neither the stored
+        intervals nor a previously accepted item (by start order)
+        """
+        starts = [dt_start for dt_start, _end in intervals]
+        # Greatest end among the stored intervals up to each position
+        max_ends = []
+        for _start, dt_end in intervals:
+            max_ends.append(max(dt_end, max_ends[-1]) if max_ends else dt_end)
+        accepted = []
+        accepted_end = None
+        for index, data in sorted(items, key=lambda item: item[1]['dt_start']):
+            dt_start = data['dt_start']
+            dt_end = self._end_key(data.get('dt_end'))
+            position = bisect_left(starts, dt_end)
+            if position and max_ends[position - 1] > dt_start:
+                self._overlap_error(index)
+            elif accepted_end is not None and accepted_end > dt_start:
+                self._overlap_error(index)
+            else:
+                accepted.append((index, data))
+                accepted_end = max(dt_end, accepted_end or dt_end)
+        return accepted
+
+    def run(self) -> list:
+        """
+        Imports the batch, returning one result per item
+        in the same order they were given
+        """
+        valid = self.validate()
+        with transaction.atomic():
+            # Serializes concurrent writes on the batch tasks
+            Tasks.all_objects.filter(pk__in=valid.keys()).update(
+                modified_on=models.F('modified_on')
+            )
+            intervals = self.existing_intervals(valid)
+            accepted = []
+            for task_id, items in valid.items():
+                accepted.extend(self.sweep(items, intervals[task_id]))
+            cycles = [
+                Cycles(
+                    task_id=data['task'],
+                    dt_start=data['dt_start'],
+                    dt_end=data.get('dt_end'),
+                    created_by=self.user,
+                    modified_by=self.user
+                )
+                for _index, data in accepted
+            ]
+            Cycles.objects.bulk_create(cycles, batch_size=self.batch_size)
+            Cycles.apply_rollup_changes(
+                [(None, cycle.rollup_state) for cycle in cycles],
+                last_activity=max(
+                    (cycle.modified_on for cycle in cycles),
+                    default=None
+                )
+            )
+            if cycles:
+                UserDataVersion.bump(self.user.id)
+                transaction.on_commit(
+                    lambda: UserDataVersion.bump(self.user.id)
+                )
+        for (index, _data), cycle in zip(accepted, cycles):
+            self.results[index] = {
+                'index': index,
+                'status': 'created',
+                'public_id': cycle.public_id
+            }
+        return self.results
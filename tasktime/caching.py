@@ -0,0 +1,219 @@
+# pylint: disable=C0209
+"""
+Contains the per user cache of the analytics responses and
+the conditional GET handling built on the same data version
+"""
+import hashlib
+import time
+from asyncio import iscoroutinefunction
+from datetime import datetime
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .analytics import timezone_from_query_params
+
+
+class UserDataVersion:
+    """
+    Version of the tasktime data of a user, bumped on every write.
+    Cached responses are keyed by it, so a write makes every
+    previous response of the user unreachable
+    """
+    KEY = "tasktime:version:{user_id}"
+    MODIFIED_KEY = "tasktime:modified:{user_id}"
+
+    @classmethod
+    def get(cls, user_id: int) -> int:
+        key = cls.KEY.format(user_id=user_id)
+        version = cache.get(key)
+        if version is None:
+            # Versions start from the current time, so that an evicted
+            # version key never brings back previously cached responses
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key, 0)
+        return version
+
+    @classmethod
+    def last_modified(cls, user_id: int) -> int:
+        """
+        Timestamp of the last write of the user. When unknown it
+        is assumed to be now, which is never wrongly fresh
+        """
+        key = cls.MODIFIED_KEY.format(user_id=user_id)
+        modified = cache.get(key)
+        if modified is None:
+            cache.add(key, int(time.time()), timeout=None)
+            modified = cache.get(key, int(time.time()))
+        return modified
+
+    @classmethod
+    def bump(cls, user_id: int) -> None:
+        if user_id is None:
+            return
+        key = cls.KEY.format(user_id=user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        cache.set(
+            cls.MODIFIED_KEY.format(user_id=user_id),
+            int(time.time()),
+            timeout=None
+        )
+
+
+def local_today(request) -> tuple:
+    """
+    Timezone of the request (?timezone=) and its current date, which
+    the analytics responses depend on. Unknown timezones fall back
+    to TIME_ZONE, leaving their rejection to the views
+    """
+    try:
+        tz = timezone_from_query_params(request.GET)
+    except ValidationError:
+        tz = timezone.get_default_timezone()
+    return tz, timezone.localdate(timezone=tz)
+
+
+def response_key(view, request) -> str:
+    """
+    Identifies the response of a view to a request of
+    the current data version of the user
+    """
+    query = hashlib.md5(
+        request.GET.urlencode().encode(),
+        usedforsecurity=False
+    ).hexdigest()
+    return "{user}:{version}:{view}:{day}:{query}".format(
+        user=request.user.id,
+        version=UserDataVersion.get(request.user.id),
+        view=type(view).__name__,
+        # Responses may depend on the current date
+        day=local_today(request)[1].isoformat(),
+        query=query
+    )
+
+
+def cache_per_user(view_method):
+    """
+    Decorator for the get methods of the analytics views (sync or
+    async), it caches the response data per user, data version
+    and query params
+    """
+    if iscoroutinefunction(view_method):
+        @wraps(view_method)
+        async def async_wrapper(self, request, *args, **kwargs):
+            key = "tasktime:analytics:" + await sync_to_async(
+                response_key
+            )(self, request)
+            data = await cache.aget(key)
+            if data is not None:
+                return Response(data=data, status=status.HTTP_200_OK)
+            response = await view_method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                await cache.aset(
+                    key,
+                    response.data,
+                    settings.ANALYTICS_CACHE_TIMEOUT
+                )
+            return response
+        return async_wrapper
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = "tasktime:analytics:" + response_key(self, request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data=data, status=status.HTTP_200_OK)
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, settings.ANALYTICS_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+def validators(view, request) -> tuple:
+    """
+    ETag and Last-Modified timestamp of the response of
+    a view to a request
+    """
+    etag = '"{}"'.format(
+        hashlib.md5(
+            response_key(view, request).encode(),
+            usedforsecurity=False
+        ).hexdigest()
+    )
+    # Responses change at midnight even without writes
+    tz, day = local_today(request)
+    today = timezone.make_aware(
+        datetime.combine(day, datetime.min.time()),
+        tz
+    )
+    last_modified = max(
+        UserDataVersion.last_modified(request.user.id),
+        int(today.timestamp())
+    )
+    return etag, last_modified
+
+
+def set_validators(response, etag: str, last_modified: int):
+    if response.status_code in (
+        status.HTTP_200_OK,
+        status.HTTP_304_NOT_MODIFIED
+    ):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def conditional_per_user(view_method):
+    """
+    Decorator for get methods (sync or async), it answers
+    If-None-Match and If-Modified-Since requests with 304 Not
+    Modified out of the user data version alone, without running
+    the view. Last-Modified has a one second resolution, so
+    clients should rather rely on the ETag
+    """
+    if iscoroutinefunction(view_method):
+        @wraps(view_method)
+        async def async_wrapper(self, request, *args, **kwargs):
+            etag, last_modified = await sync_to_async(validators)(
+                self,
+                request
+            )
+            response = get_conditional_response(
+                request,
+                etag=etag,
+                last_modified=last_modified
+            )
+            if response is None:
+                response = await view_method(
+                    self,
+                    request,
+                    *args,
+                    **kwargs
+                )
+            return set_validators(response, etag, last_modified)
+        return async_wrapper
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = validators(self, request)
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified
+        )
+        if response is None:
+            response = view_method(self, request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+    return wrapper
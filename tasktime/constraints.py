@@ -0,0 +1,50 @@
+"""
+Contains the database constraints that cannot be declared in the
+models Meta because they are specific to a database backend
+"""
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+CYCLES_NO_OVERLAP = "tasktime_cycles_no_overlap"
+
+
+def create_cycles_overlap_constraint(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate receiver that creates, on PostgreSQL, an exclusion
+    constraint (backed by a GiST index) forbidding two active cycles
+    of the same task from having intersecting intervals. Cycles
+    without end datetime are unbounded ranges. Other backends rely
+    on the serialized check done by CyclesView
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_constraint WHERE conname = %s",
+            [CYCLES_NO_OVERLAP]
+        )
+        if cursor.fetchone() is not None:
+            return
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+            cursor.execute(
+                "ALTER TABLE tasktime_cycles "
+                "ADD CONSTRAINT " + CYCLES_NO_OVERLAP + " "
+                "EXCLUDE USING gist ("
+                "task_id WITH =, "
+                "tstzrange(dt_start, dt_end, '[)') WITH &&"
+                ") WHERE (is_active AND "
+                "(dt_end IS NULL OR dt_end >= dt_start))"
+            )
+        except DatabaseError as e:
+            # e.g.: missing privileges to create the extension or
+            # overlapping cycles already stored
+            logger.warning(
+                "Could not create the %s constraint: %s",
+                CYCLES_NO_OVERLAP,
+                e
+            )
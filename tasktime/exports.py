@@ -0,0 +1,89 @@
+"""
+Contains the streamed exports of the tasktime data
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.query import QuerySet
+
+
+class Echo:
+    """
+    File-like object whose write method returns the value
+    written instead of buffering it, so the csv module
+    can be used to produce streamed rows
+    """
+    def write(self, value):
+        return value
+
+
+class CyclesExport:
+    """
+    Streams the cycles of a query, joined with their task and
+    project names, as CSV or NDJSON rows. Cycles are fetched in
+    chunks (with a server-side cursor when the database supports it),
+    so the memory used does not depend on the number of cycles
+    """
+    COLUMNS = (
+        'public_id',
+        'task_public_id',
+        'task_name',
+        'project_public_id',
+        'project_name',
+        'dt_start',
+        'dt_end',
+        'duration',
+    )
+    CONTENT_TYPES = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def __init__(self, cycles_query: QuerySet, chunk_size: int = 2000):
+        self.cycles_query = cycles_query
+        self.chunk_size = chunk_size
+
+    def rows(self):
+        """
+        Yields one tuple per cycle following COLUMNS
+        """
+        cycles = self.cycles_query.\
+            order_by('dt_start', 'id').\
+            values_list(
+                'public_id',
+                'task__public_id',
+                'task__name',
+                'task__project__public_id',
+                'task__project__name',
+                'dt_start',
+                'dt_end'
+            ).\
+            iterator(chunk_size=self.chunk_size)
+        for *row, dt_start, dt_end in cycles:
+            if dt_end is not None and dt_end >= dt_start:
+                duration = int((dt_end - dt_start).total_seconds())
+            else:
+                duration = None
+            yield (*row, dt_start, dt_end, duration)
+
+    def csv_lines(self):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.COLUMNS)
+        for row in self.rows():
+            yield writer.writerow(
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in row
+            )
+
+    def ndjson_lines(self):
+        for row in self.rows():
+            yield json.dumps(
+                dict(zip(self.COLUMNS, row)),
+                cls=DjangoJSONEncoder
+            ) + '\n'
+
+    def lines(self, output: str):
+        if output == 'ndjson':
+            return self.ndjson_lines()
+        return self.csv_lines()
@@ -0,0 +1,197 @@
+"""
+Contains the batched interval math used by the analytics, over
+cycle intervals stored as compact epoch-second arrays
+"""
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+from itertools import accumulate, compress, repeat
+from operator import add, and_, gt, lt, mul, not_, sub
+
+from django.db.models.query import QuerySet
+
+
+def to_epoch(moment: datetime) -> int:
+    """
+    Epoch seconds of an aware datetime
+    """
+    return int(moment.timestamp())
+
+
+class Intervals:
+    """
+    Set of [start, end) intervals as two int64 arrays of epoch
+    seconds. Operations run over whole arrays through builtins
+    (map, accumulate, bisect) instead of per object timedelta
+    arithmetic
+    """
+    TYPECODE = 'q'
+
+    def __init__(self, starts=(), ends=()):
+        self.starts = array(self.TYPECODE, starts)
+        self.ends = array(self.TYPECODE, ends)
+        if len(self.starts) != len(self.ends):
+            raise ValueError("Starts and ends must have the same length")
+
+    @classmethod
+    def from_queryset(
+        cls,
+        cycles_query: QuerySet,
+        open_end: datetime = None,
+        chunk_size: int = 5000
+    ):
+        """
+        Loads the intervals of the given cycles query. Open cycles
+        end at open_end, or are skipped when it is not given
+        """
+        if open_end is None:
+            cycles_query = cycles_query.filter(dt_end__isnull=False)
+        intervals = cls()
+        rows = cycles_query.values_list('dt_start', 'dt_end').\
+            iterator(chunk_size=chunk_size)
+        open_epoch = to_epoch(open_end) if open_end is not None else None
+        for dt_start, dt_end in rows:
+            intervals.starts.append(to_epoch(dt_start))
+            intervals.ends.append(
+                to_epoch(dt_end) if dt_end is not None else open_epoch
+            )
+        return intervals
+
+    @classmethod
+    async def afrom_queryset(
+        cls,
+        cycles_query: QuerySet,
+        open_end: datetime = None
+    ):
+        """
+        Async version of from_queryset. The rows are fetched at once,
+        since QuerySet.aiterator() cannot run ValuesListIterable
+        queries from an async context on Django 4.1
+        """
+        if open_end is None:
+            cycles_query = cycles_query.filter(dt_end__isnull=False)
+        intervals = cls()
+        rows = cycles_query.values_list('dt_start', 'dt_end')
+        open_epoch = to_epoch(open_end) if open_end is not None else None
+        async for dt_start, dt_end in rows:
+            intervals.starts.append(to_epoch(dt_start))
+            intervals.ends.append(
+                to_epoch(dt_end) if dt_end is not None else open_epoch
+            )
+        return intervals
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def durations(self) -> array:
+        """
+        Duration in seconds of each interval
+        """
+        return array(self.TYPECODE, map(sub, self.ends, self.starts))
+
+    def total(self) -> int:
+        """
+        Sum of the interval durations, overlapping time is
+        counted once per interval
+        """
+        return sum(self.ends) - sum(self.starts)
+
+    def clip(self, start: int, end: int):
+        """
+        Intervals cut to [start, end), empty ones are dropped
+        """
+        starts = list(map(max, self.starts, repeat(start)))
+        ends = list(map(min, self.ends, repeat(end)))
+        keep = list(map(gt, ends, starts))
+        return Intervals(compress(starts, keep), compress(ends, keep))
+
+    def non_empty(self):
+        """
+        Intervals with empty ones (end == start) dropped
+        """
+        keep = list(map(gt, self.ends, self.starts))
+        return Intervals(
+            compress(self.starts, keep),
+            compress(self.ends, keep)
+        )
+
+    def covered_before(self, boundaries) -> list:
+        """
+        Time covered by the intervals before each of the sorted
+        boundaries. It comes from binary searches over the sorted
+        starts and ends and their prefix sums, so the cost grows
+        with the number of boundaries times log n
+        """
+        starts = sorted(self.starts)
+        ends = sorted(self.ends)
+        start_sums = [0, *accumulate(starts)]
+        end_sums = [0, *accumulate(ends)]
+        covered = []
+        for boundary in boundaries:
+            # Intervals started before the boundary count up to
+            # their end or up to the boundary, when still running
+            started = bisect_left(starts, boundary)
+            ended = bisect_left(ends, boundary)
+            covered.append(
+                end_sums[ended] +
+                boundary * (started - ended) -
+                start_sums[started]
+            )
+        return covered
+
+    def sum_per_bucket(self, boundaries) -> list:
+        """
+        Duration within each [boundaries[i], boundaries[i + 1])
+        bucket, intervals crossing a boundary are split
+        """
+        covered = self.covered_before(boundaries)
+        return list(map(sub, covered[1:], covered[:-1]))
+
+    def union(self):
+        """
+        Disjoint intervals covering the same time
+        """
+        starts = sorted(self.starts)
+        ends = sorted(self.ends)
+        # The time between the (i + 1)th start and the (i + 1)th end
+        # is a gap when every earlier started interval has ended
+        gaps = list(map(lt, ends, starts[1:]))
+        return Intervals(
+            compress(starts, [bool(starts), *gaps]),
+            compress(ends, [*gaps, True])
+        )
+
+    def events(self) -> list:
+        """
+        Starts and ends as a single sorted list of 2 * t + 1
+        and 2 * t values, so that ends come first on ties
+        """
+        return sorted([
+            *map(add, map(mul, self.starts, repeat(2)), repeat(1)),
+            *map(mul, self.ends, repeat(2))
+        ])
+
+    def overlap_stats(self) -> dict:
+        """
+        Overlapping time, number of overlapping interval
+        pairs and maximum number of simultaneous intervals
+        """
+        # Empty intervals overlap nothing, and their end would
+        # sort before their own start
+        intervals = self.non_empty()
+        events = intervals.events()
+        is_start = list(map(and_, events, repeat(1)))
+        started = list(accumulate(is_start))
+        ended = list(map(sub, range(1, len(events) + 1), started))
+        # Each interval overlaps the ones started before its end
+        # and not ended by its start, itself included
+        pairs = sum(compress(started, map(not_, is_start))) - sum(
+            compress(ended, is_start)
+        ) - len(intervals)
+        return {
+            'overlapping_seconds': (
+                intervals.total() - intervals.union().total()
+            ),
+            'overlapping_pairs': pairs // 2,
+            'max_concurrency': max(map(sub, started, ended), default=0),
+        }
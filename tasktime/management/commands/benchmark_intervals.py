@@ -0,0 +1,153 @@
+# pylint: disable=C0209
+import random
+import time
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+
+from tasktime.intervals import Intervals, to_epoch
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the throughput of the batched interval math against "
+        "per object timedelta arithmetic over synthetic cycles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cycles",
+            type=int,
+            default=1000000,
+            help="Number of synthetic cycles."
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=730,
+            help="Number of days the cycles are spread over."
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the synthetic cycles."
+        )
+
+    @staticmethod
+    def generate(size: int, days: int, seed: int) -> list:
+        """
+        Cycles of up to four hours, as (dt_start, dt_end) pairs
+        """
+        rand = random.Random(seed)
+        origin = datetime(2022, 1, 1, tzinfo=dt_timezone.utc)
+        cycles = []
+        for _ in range(size):
+            dt_start = origin + timedelta(
+                seconds=rand.randrange(days * 86400)
+            )
+            cycles.append(
+                (dt_start, dt_start + timedelta(seconds=rand.randrange(14400)))
+            )
+        return cycles
+
+    def report(self, name: str, size: int, elapsed: float):
+        self.stdout.write(
+            "{name:<32} {elapsed:>8.3f}s {rate:>14,.0f} cycles/s".format(
+                name=name,
+                elapsed=elapsed,
+                rate=size / elapsed if elapsed else float('inf')
+            )
+        )
+
+    @staticmethod
+    def timed(function, *args):
+        started = time.perf_counter()
+        result = function(*args)
+        return result, time.perf_counter() - started
+
+    def run(self, name: str, size: int, function, *args):
+        """
+        Times the given function and reports it, returning its result
+        """
+        result, elapsed = self.timed(function, *args)
+        self.report(name, size, elapsed)
+        return result
+
+    @staticmethod
+    def timedelta_total(cycles) -> int:
+        total = 0
+        for dt_start, dt_end in cycles:
+            total += int((dt_end - dt_start).total_seconds())
+        return total
+
+    @staticmethod
+    def timedelta_per_day(cycles, origin, days) -> dict:
+        sums = {}
+        for dt_start, dt_end in cycles:
+            while dt_start < dt_end:
+                midnight = datetime.combine(
+                    dt_start.date() + timedelta(days=1),
+                    datetime.min.time(),
+                    tzinfo=dt_timezone.utc
+                )
+                boundary = min(midnight, dt_end)
+                day = (dt_start - origin).days
+                if 0 <= day < days:
+                    sums[day] = sums.get(day, 0) + int(
+                        (boundary - dt_start).total_seconds()
+                    )
+                dt_start = boundary
+        return sums
+
+    def handle(self, **options):
+        size, days = options['cycles'], options['days']
+        cycles = self.generate(size, days, options['seed'])
+        origin = datetime(2022, 1, 1, tzinfo=dt_timezone.utc)
+        boundaries = [
+            to_epoch(origin) + day * 86400 for day in range(days + 1)
+        ]
+
+        def load():
+            return Intervals(
+                [to_epoch(dt_start) for dt_start, _ in cycles],
+                [to_epoch(dt_end) for _, dt_end in cycles]
+            )
+
+        intervals = self.run("load as epoch arrays", size, load)
+        baseline = self.run(
+            "total (timedelta loop)",
+            size,
+            self.timedelta_total,
+            cycles
+        )
+        total = self.run("total (arrays)", size, intervals.total)
+        baseline_days = self.run(
+            "per day sums (timedelta loop)",
+            size,
+            self.timedelta_per_day,
+            cycles,
+            origin,
+            days
+        )
+        per_day = self.run(
+            "per day sums (arrays)",
+            size,
+            intervals.clip(boundaries[0], boundaries[-1]).sum_per_bucket,
+            boundaries
+        )
+        self.run("union (arrays)", size, intervals.union)
+        stats = self.run(
+            "overlap statistics (arrays)",
+            size,
+            intervals.overlap_stats
+        )
+        consistent = baseline == total and all(
+            baseline_days.get(day, 0) == seconds
+            for day, seconds in enumerate(per_day)
+        )
+        self.stdout.write(
+            "Results match the timedelta loops: {}".format(consistent)
+        )
+        self.stdout.write("Overlap statistics: {}".format(stats))
@@ -0,0 +1,71 @@
+# pylint: disable=C0209
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from common.concurrency import QueryPool
+from tasktime.analytics import DurationRanking
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the duration ranking with its queries run serially "
+        "and on the query pool, over the data of an existing user"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            help="User whose data is ranked, defaults to the first user."
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Query pool size of the concurrent run."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Number of rankings per run."
+        )
+
+    def measure(self, user, repeat: int) -> list:
+        ranking = DurationRanking()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            ranking.build(user)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def handle(self, **options):
+        users = get_user_model().objects.order_by('id')
+        if options['user_id'] is not None:
+            users = users.filter(id=options['user_id'])
+        user = users.first()
+        if user is None:
+            raise CommandError("No user to rank the data of.")
+        for name, workers in (
+            ('serial', 0),
+            ('query pool', options['workers'])
+        ):
+            with override_settings(QUERY_POOL_WORKERS=workers):
+                # Warms up the pool threads and their connections
+                self.measure(user, 1)
+                timings = self.measure(user, options['repeat'])
+                QueryPool.shutdown()
+            self.stdout.write(
+                "{name:<12} mean {mean:.2f}ms median {median:.2f}ms "
+                "max {max:.2f}ms".format(
+                    name=name,
+                    mean=statistics.mean(timings),
+                    median=statistics.median(timings),
+                    max=max(timings)
+                )
+            )
@@ -0,0 +1,123 @@
+# pylint: disable=C0209
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires concurrent requests at the analytics endpoints (or the "
+        "given paths) of a running server and reports the throughput and "
+        "latency percentiles, to compare worker modes and connection "
+        "settings"
+    )
+
+    PATHS = (
+        'duration-ranking/',
+        'open-tasks/',
+        'latest-tasks/',
+        'total-time/',
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost:8000/api/v1/timer/",
+            help="Base URL of the analytics endpoints."
+        )
+        parser.add_argument(
+            "--token",
+            required=True,
+            help="JWT access token sent as a Bearer token."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=400,
+            help="Total number of requests."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Number of simultaneous clients."
+        )
+        parser.add_argument(
+            "--paths",
+            nargs="+",
+            default=self.PATHS,
+            help=(
+                "Paths requested in turn, relative to the base URL. "
+                "Defaults to the analytics endpoints."
+            )
+        )
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help=(
+                "Repeats the same query strings, so responses may be "
+                "served from the analytics cache. By default every "
+                "request has a distinct query string."
+            )
+        )
+
+    def fetch(self, url: str, token: str) -> tuple:
+        request = Request(url, headers={'Authorization': 'Bearer ' + token})
+        started = time.perf_counter()
+        try:
+            with urlopen(request, timeout=60) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            status = error.code
+        except URLError as error:
+            raise CommandError(
+                "Could not reach {}: {}".format(url, error.reason)
+            ) from error
+        return time.perf_counter() - started, status
+
+    @staticmethod
+    def percentile(latencies: list, rank: int) -> float:
+        return statistics.quantiles(latencies, n=100)[rank - 1] * 1000
+
+    def handle(self, **options):
+        paths = options['paths']
+        urls = [
+            "{base}{path}{query}".format(
+                base=options['base_url'],
+                path=paths[index % len(paths)],
+                # A distinct query string misses the analytics cache
+                query='' if options['cached'] else '?run={}'.format(index)
+            )
+            for index in range(options['requests'])
+        ]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(
+                pool.map(lambda url: self.fetch(url, options['token']), urls)
+            )
+        elapsed = time.perf_counter() - started
+        latencies = [latency for latency, _ in results]
+        errors = sum(status != 200 for _, status in results)
+        self.stdout.write(
+            "{requests} requests, {concurrency} clients, {errors} errors, "
+            "{rate:.1f} req/s".format(
+                requests=len(results),
+                concurrency=options['concurrency'],
+                errors=errors,
+                rate=len(results) / elapsed
+            )
+        )
+        self.stdout.write(
+            "latency p50 {p50:.1f}ms p95 {p95:.1f}ms p99 {p99:.1f}ms "
+            "max {max:.1f}ms".format(
+                p50=self.percentile(latencies, 50),
+                p95=self.percentile(latencies, 95),
+                p99=self.percentile(latencies, 99),
+                max=max(latencies) * 1000
+            )
+        )
@@ -0,0 +1,197 @@
+# pylint: disable=C0209
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tasktime.models import (Cycles, ProjectRollups, Projects,
+                             TaskDailyBuckets, TaskRollups, Tasks)
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the task and project duration rollups and "
+        "the daily buckets from the cycles"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help=(
+                "Only verifies whether the stored rollups drifted from "
+                "the cycles, without writing. Exits with an error when "
+                "any drift is found."
+            )
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of cycles fetched from the database per chunk."
+        )
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {
+            'total_seconds': 0,
+            'cycle_count': 0,
+            'open_cycle_count': 0,
+            'last_activity': None,
+        }
+
+    def _merge(self, stats: dict, contribution: tuple, last_activity):
+        for field, value in zip(TaskRollups.COUNTERS, contribution):
+            stats[field] += value
+        if last_activity is not None and (
+            stats['last_activity'] is None or
+            last_activity > stats['last_activity']
+        ):
+            stats['last_activity'] = last_activity
+
+    def compute(self, chunk_size: int) -> tuple:
+        """
+        Computes the expected task and project rollups
+        and daily buckets by streaming every cycle once
+        """
+        task_projects = dict(Tasks.all_objects.values_list('id', 'project_id'))
+        task_stats = {
+            task_id: self._empty_stats()
+            for task_id in task_projects
+        }
+        project_stats = {
+            project_id: self._empty_stats()
+            for project_id in Projects.all_objects.values_list('id', flat=True)
+        }
+        bucket_stats = {}
+        cycles = Cycles.all_objects.values_list(
+            'task_id', 'is_active', 'dt_start', 'dt_end', 'modified_on'
+        ).iterator(chunk_size=chunk_size)
+        # Rows are (task_id, *(is_active, dt_start, dt_end), modified_on)
+        for task_id, *state, modified_on in cycles:
+            self._merge(
+                task_stats[task_id],
+                Cycles.rollup_contribution(*state),
+                modified_on
+            )
+            for day, seconds in Cycles.daily_contribution(*state).items():
+                bucket_stats[(task_id, day)] = bucket_stats.get(
+                    (task_id, day), 0
+                ) + seconds
+        for task_id, stats in task_stats.items():
+            self._merge(
+                project_stats[task_projects[task_id]],
+                tuple(stats[field] for field in TaskRollups.COUNTERS),
+                stats['last_activity']
+            )
+        return task_stats, project_stats, bucket_stats
+
+    def find_drift(self, model, expected: dict) -> list:
+        """
+        Lists the owners whose stored counters differ
+        from the expected ones
+        """
+        owner_field = model.OWNER_FIELD + '_id'
+        stored = {
+            row[owner_field]: row
+            for row in model.objects.values(owner_field, *model.COUNTERS)
+        }
+        drift = []
+        for owner_id, stats in expected.items():
+            row = stored.get(owner_id, {})
+            for field in model.COUNTERS:
+                if row.get(field, 0) != stats[field]:
+                    drift.append(
+                        (owner_id, field, row.get(field), stats[field])
+                    )
+        return drift
+
+    @staticmethod
+    def find_bucket_drift(expected: dict) -> list:
+        """
+        Lists the (task, day) buckets whose stored
+        duration differs from the expected one
+        """
+        stored = {
+            (task_id, day): total_seconds
+            for task_id, day, total_seconds in
+            TaskDailyBuckets.objects.values_list(
+                'task_id', 'day', 'total_seconds'
+            )
+        }
+        return [
+            (key, stored.get(key, 0), expected.get(key, 0))
+            for key in stored.keys() | expected.keys()
+            if stored.get(key, 0) != expected.get(key, 0)
+        ]
+
+    def handle(self, **options):
+        task_stats, project_stats, bucket_stats = self.compute(
+            options['chunk_size']
+        )
+        drift_found = False
+        for model, expected in (
+            (TaskRollups, task_stats),
+            (ProjectRollups, project_stats)
+        ):
+            for owner_id, field, stored, computed in self.find_drift(
+                model,
+                expected
+            ):
+                drift_found = True
+                self.stdout.write(
+                    "Drift on {owner} {owner_id}: {field} stored as "
+                    "{stored}, expected {computed}".format(
+                        owner=model.OWNER_FIELD,
+                        owner_id=owner_id,
+                        field=field,
+                        stored=stored,
+                        computed=computed
+                    )
+                )
+        for (task_id, day), stored, computed in self.find_bucket_drift(
+            bucket_stats
+        ):
+            drift_found = True
+            self.stdout.write(
+                "Drift on task {task_id} bucket {day}: stored as "
+                "{stored}, expected {computed}".format(
+                    task_id=task_id,
+                    day=day,
+                    stored=stored,
+                    computed=computed
+                )
+            )
+        if options['check']:
+            if drift_found:
+                raise CommandError("Rollups drifted from the cycles.")
+            self.stdout.write("Rollups are consistent.")
+            return
+        with transaction.atomic():
+            for model, expected in (
+                (TaskRollups, task_stats),
+                (ProjectRollups, project_stats)
+            ):
+                model.objects.all().delete()
+                model.objects.bulk_create(
+                    [
+                        model(
+                            **{model.OWNER_FIELD + '_id': owner_id},
+                            **stats
+                        )
+                        for owner_id, stats in expected.items()
+                    ],
+                    batch_size=1000
+                )
+            TaskDailyBuckets.objects.all().delete()
+            TaskDailyBuckets.objects.bulk_create(
+                [
+                    TaskDailyBuckets(
+                        task_id=task_id,
+                        day=day,
+                        total_seconds=total_seconds
+                    )
+                    for (task_id, day), total_seconds in bucket_stats.items()
+                    if total_seconds
+                ],
+                batch_size=1000
+            )
+        self.stdout.write("Rollups rebuilt successfully.")
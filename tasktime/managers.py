@@ -0,0 +1,254 @@
+from functools import reduce
+from operator import or_
+
+from django.db import models
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.query import QuerySet
+
+from common.managers.custom_base_model_manager import (
+    CustomBaseQuerySet,
+    CustomUserLogBaseModelManager
+)
+
+
+class RollupsManager(models.Manager):
+    """
+    Manager for the duration rollup tables, it applies
+    incremental changes to the rollup entry of a given owner
+    (task or project) with a single UPDATE statement
+    """
+    def apply_delta(
+        self,
+        owner_id: int,
+        seconds: int = 0,
+        cycles: int = 0,
+        open_cycles: int = 0,
+        last_activity=None
+    ) -> None:
+        """
+        Adds the given deltas to the rollup entry of owner_id,
+        creating the entry when it does not exist yet
+        """
+        updates = {
+            'total_seconds': models.F('total_seconds') + seconds,
+            'cycle_count': models.F('cycle_count') + cycles,
+            'open_cycle_count': models.F('open_cycle_count') + open_cycles,
+        }
+        if last_activity is not None:
+            updates['last_activity'] = Greatest(
+                Coalesce(
+                    'last_activity',
+                    models.Value(last_activity)
+                ),
+                models.Value(last_activity)
+            )
+        owner_filter = {self.model.OWNER_FIELD + '_id': owner_id}
+        if self.filter(**owner_filter).update(**updates):
+            return
+        self.get_or_create(**owner_filter)
+        self.filter(**owner_filter).update(**updates)
+
+
+class DailyBucketsManager(models.Manager):
+    """
+    Manager for the daily duration buckets, it applies
+    incremental changes to many (task, day) buckets with
+    a few set-based statements
+    """
+    def apply_deltas(self, deltas: dict, batch_size: int = 500) -> None:
+        """
+        Adds the seconds of a dict {(task_id, day): seconds}
+        to the corresponding buckets. Buckets that are emptied
+        are removed
+        """
+        keys = [key for key, seconds in deltas.items() if seconds]
+        for offset in range(0, len(keys), batch_size):
+            batch = keys[offset:offset + batch_size]
+            self.bulk_create(
+                [
+                    self.model(task_id=task_id, day=day)
+                    for task_id, day in batch
+                ],
+                ignore_conflicts=True
+            )
+            match = reduce(
+                or_,
+                (models.Q(task_id=task_id, day=day) for task_id, day in batch)
+            )
+            self.filter(match).update(
+                total_seconds=models.F('total_seconds') + models.Case(
+                    *(
+                        models.When(
+                            task_id=task_id,
+                            day=day,
+                            then=models.Value(deltas[(task_id, day)])
+                        )
+                        for task_id, day in batch
+                    ),
+                    default=models.Value(0),
+                    output_field=models.BigIntegerField()
+                )
+            )
+            self.filter(match, total_seconds=0).delete()
+
+
+class TasksManager(CustomUserLogBaseModelManager):
+    def query_tree(self, user, with_cycles: bool = True) -> QuerySet:
+        """
+        Queries the active tasks of the given user along with
+        their rollups and prefetched active cycles, so that
+        a nested serialization does not hit the database again
+        """
+        query = self.filter(
+            created_by=user
+        ).select_related(
+            'rollup'
+        )
+        if with_cycles:
+            cycles_model = self.model.cycles.rel.related_model
+            query = query.prefetch_related(
+                models.Prefetch(
+                    'cycles',
+                    # The tasks are active already
+                    queryset=cycles_model.all_objects.active(ancestors=False)
+                )
+            )
+        return query
+
+    def query_open(self, user) -> QuerySet:
+        """
+        Queries the active tasks of the given user that have
+        an open active cycle, along with their project public_id
+        """
+        return self.model.all_objects.active(ancestors=False).filter(
+            created_by=user,
+            cycles__created_by=user,
+            cycles__is_active=True,
+            cycles__dt_end__isnull=True
+        ).annotate(
+            project_public_id=models.F('project_id__public_id')
+        ).values('public_id', 'name', 'project_public_id')
+
+    def query_last_modified(self, user, size: int = 5) -> QuerySet:
+        """
+        Queries the active tasks of the given user whose
+        cycles were modified the most recently
+        """
+        return self.model.all_objects.active(ancestors=False).filter(
+            created_by=user,
+            cycles__created_by=user,
+            cycles__is_active=True
+        ).annotate(
+            project_public_id=models.F('project_id__public_id'),
+            last_modified_on=models.Max('cycles__modified_on')
+        ).values(
+            'public_id',
+            'name',
+            'project_public_id',
+            'last_modified_on'
+        ).order_by('-last_modified_on')[0:size]
+
+    def lock(self, task_id: int) -> None:
+        """
+        Takes the row write lock of the given task until the end of
+        the current transaction, through a no-op UPDATE. Unlike
+        select_for_update(), it also serializes writers on SQLite
+        """
+        self.model.all_objects.filter(pk=task_id).update(
+            modified_on=models.F('modified_on')
+        )
+
+
+class ProjectsManager(CustomUserLogBaseModelManager):
+    def query_tree(
+        self,
+        user,
+        with_tasks: bool = True,
+        with_cycles: bool = True
+    ) -> QuerySet:
+        """
+        Queries the active projects of the given user along with
+        their rollups and the prefetched tree of active tasks
+        and cycles (three queries regardless of the tree size)
+        """
+        query = self.filter(
+            created_by=user
+        ).select_related(
+            'rollup'
+        )
+        if not with_tasks:
+            return query
+        tasks_model = self.model.tasks.rel.related_model
+        query = query.prefetch_related(
+            models.Prefetch(
+                'tasks',
+                # The projects are active already
+                queryset=tasks_model.all_objects.active(
+                    ancestors=False
+                ).select_related('rollup')
+            )
+        )
+        if with_cycles:
+            cycles_model = tasks_model.cycles.rel.related_model
+            query = query.prefetch_related(
+                models.Prefetch(
+                    'tasks__cycles',
+                    queryset=cycles_model.all_objects.active(ancestors=False)
+                )
+            )
+        return query
+
+
+class CyclesQuerySet(CustomBaseQuerySet):
+    def update_active(self, **fields) -> int:
+        """
+        Updates the active status of the cycles, applying the
+        change of their contributions to the rollups
+        """
+        states = list(
+            self.filter(
+                ~models.Q(is_active=fields['is_active'])
+            ).values_list('task_id', 'is_active', 'dt_start', 'dt_end')
+        )
+        updated = self.update(**fields)
+        if states:
+            self.model.apply_rollup_changes(
+                [
+                    (state, (state[0], fields['is_active'], *state[2:]))
+                    for state in states
+                ],
+                last_activity=fields.get('modified_on')
+            )
+        return updated
+
+
+class CyclesManager(
+    CustomUserLogBaseModelManager.from_queryset(CyclesQuerySet)
+):
+    def query_finished(self, user) -> QuerySet:
+        """
+        Queries the finished active cycles of the given user.
+        Deactivating a task or project deactivates its cycles,
+        so their ancestors are not joined
+        """
+        return self.model.all_objects.active(ancestors=False).filter(
+            created_by=user,
+            dt_end__gte=models.F('dt_start')
+        )
+
+    def query_overlapping(self, task, dt_start, dt_end=None) -> QuerySet:
+        """
+        Queries the active cycles of the given task whose interval
+        intersects [dt_start, dt_end). Cycles without end datetime
+        extend indefinitely
+        """
+        query = self.model.all_objects.active(ancestors=False).filter(
+            models.Q(dt_end__isnull=True) | models.Q(
+                dt_end__gt=dt_start,
+                dt_end__gte=models.F('dt_start')
+            ),
+            task=task
+        )
+        if dt_end is not None:
+            query = query.filter(dt_start__lt=dt_end)
+        return query
@@ -1,10 +1,17 @@
 # pylint: disable=C0209
-from django.db import models
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import models, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from common.models import CustomUserLogBaseModel
 from common.utils import Utils
 
+from .managers import (CyclesManager, DailyBucketsManager, ProjectsManager,
+                       RollupsManager, TasksManager)
+
 
 # Create your models here.
 class Projects(CustomUserLogBaseModel):
@@ -21,13 +28,18 @@ class Projects(CustomUserLogBaseModel):
         help_text=_("Project description")
     )
 
+    objects = ProjectsManager(scoped=True)
+
     @property
     def duration(self):
-        return sum(
-            tk.duration
-            for tk in
-            self.tasks.all()
-        )
+        """
+        Total duration for project related cycles
+        in seconds, read from the project rollup
+        """
+        rollup = getattr(self, 'rollup', None)
+        if rollup is None:
+            return 0
+        return rollup.total_seconds
 
     @property
     def parsed_duration(self):
@@ -41,6 +53,14 @@ class Projects(CustomUserLogBaseModel):
 
     class Meta:
         db_table = "tasktime_projects"
+        default_manager_name = 'all_objects'
+        indexes = [
+            models.Index(
+                fields=['created_by'],
+                condition=models.Q(is_active=True),
+                name='projects_user_active_idx'
+            ),
+        ]
 
 
 class Tasks(CustomUserLogBaseModel):
@@ -64,19 +84,54 @@ class Tasks(CustomUserLogBaseModel):
         help_text=_("Project to which this task is related")
     )
 
+    ACTIVE_ANCESTORS = ('project',)
+
+    objects = TasksManager(scoped=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rollup_project_id = instance.project_id
+        return instance
+
     @property
     def duration(self):
         """
         Total duration for task related cycles
-        in seconds
-        """
-        return sum(
-            cy.duration
-            for cy in self.cycles.filter(
-                dt_end__isnull=False,
-                dt_end__gte=models.F('dt_start')
-            ).all()
-        )
+        in seconds, read from the task rollup
+        """
+        rollup = getattr(self, 'rollup', None)
+        if rollup is None:
+            return 0
+        return rollup.total_seconds
+
+    def save(self, *args, **kwargs):
+        """
+        Overrided save method, when the task is moved to
+        another project its rollup is moved along with it
+        """
+        previous_project_id = getattr(self, '_rollup_project_id', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous_project_id not in (None, self.project_id):
+                rollup = TaskRollups.objects.filter(task_id=self.pk).first()
+                if rollup is not None:
+                    rollup.move_to_project(
+                        previous_project_id,
+                        self.project_id
+                    )
+        self._rollup_project_id = self.project_id
+
+    def delete(self, *args, **kwargs):
+        """
+        Overrided delete method, it also discounts
+        the task rollup from its project rollup
+        """
+        with transaction.atomic():
+            rollup = TaskRollups.objects.filter(task_id=self.pk).first()
+            if rollup is not None:
+                rollup.move_to_project(self.project_id, None)
+            return super().delete(*args, **kwargs)
 
     @property
     def parsed_duration(self):
@@ -93,6 +148,20 @@ class Tasks(CustomUserLogBaseModel):
 
     class Meta:
         db_table = "tasktime_tasks"
+        default_manager_name = 'all_objects'
+        indexes = [
+            models.Index(
+                fields=['created_by'],
+                condition=models.Q(is_active=True),
+                name='tasks_user_active_idx'
+            ),
+            # Active tasks of the prefetched projects
+            models.Index(
+                fields=['project'],
+                condition=models.Q(is_active=True),
+                name='tasks_project_active_idx'
+            ),
+        ]
 
 
 class Cycles(CustomUserLogBaseModel):
@@ -113,6 +182,191 @@ class Cycles(CustomUserLogBaseModel):
         help_text=_("End datetime for this cycle")
     )
 
+    ACTIVE_ANCESTORS = ('task', 'task__project')
+
+    all_objects = CyclesManager()
+    objects = CyclesManager(scoped=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rollup_snapshot = instance.rollup_state
+        return instance
+
+    @property
+    def rollup_state(self) -> tuple:
+        """
+        Fields of this cycle that are relevant for
+        the duration rollups
+        """
+        return (self.task_id, self.is_active, self.dt_start, self.dt_end)
+
+    @staticmethod
+    def rollup_contribution(is_active, dt_start, dt_end) -> tuple:
+        """
+        Contribution of a cycle to its task rollup as a tuple
+        (seconds, cycles, open cycles). Inactive cycles
+        do not contribute and invalid intervals count as zero seconds
+        """
+        if not is_active:
+            return (0, 0, 0)
+        if dt_end is None:
+            return (0, 1, 1)
+        if dt_end < dt_start:
+            return (0, 1, 0)
+        return (int((dt_end - dt_start).total_seconds()), 1, 0)
+
+    @staticmethod
+    def daily_contribution(is_active, dt_start, dt_end) -> dict:
+        """
+        Contribution of a cycle to the daily buckets of its task
+        as a dict {day: seconds}, splitting the interval at the
+        midnights of the default timezone. Only finished active
+        cycles contribute
+        """
+        if not is_active or dt_end is None or dt_end < dt_start:
+            return {}
+        tz = timezone.get_default_timezone()
+        # Aware datetimes sharing a tzinfo subtract as wall times,
+        # which is wrong across DST changes
+        dt_start = dt_start.astimezone(dt_timezone.utc)
+        dt_end = dt_end.astimezone(dt_timezone.utc)
+        contribution = {}
+        start = timezone.localtime(dt_start, tz)
+        elapsed = 0
+        while start < dt_end:
+            next_day = timezone.make_aware(
+                datetime.combine(start.date() + timedelta(days=1), time.min),
+                tz
+            )
+            boundary = min(next_day, dt_end)
+            # Seconds are truncated on the cumulative duration, so the
+            # buckets add up to the same total as the rollups
+            total = int((boundary - dt_start).total_seconds())
+            contribution[start.date()] = total - elapsed
+            elapsed = total
+            start = timezone.localtime(boundary, tz)
+        return contribution
+
+    @staticmethod
+    def signed_states(changes):
+        """
+        (sign, task_id, contribution state) of the existing states of
+        the given (previous, current) pairs, previous ones discounted
+        """
+        for previous_state, current_state in changes:
+            for sign, state in ((-1, previous_state), (1, current_state)):
+                if state is not None:
+                    task_id, *contribution_state = state
+                    yield sign, task_id, contribution_state
+
+    @classmethod
+    def task_rollup_deltas(cls, changes) -> dict:
+        """
+        (seconds, cycles, open cycles) changes per task
+        """
+        deltas = {}
+        for sign, task_id, state in cls.signed_states(changes):
+            current = deltas.get(task_id, (0, 0, 0))
+            deltas[task_id] = tuple(
+                value + sign * delta
+                for value, delta in zip(
+                    current,
+                    cls.rollup_contribution(*state)
+                )
+            )
+        return deltas
+
+    @staticmethod
+    def project_rollup_deltas(task_deltas: dict) -> dict:
+        """
+        Changes per project of the given changes per task, so that
+        tasks of the same project are applied to it at once
+        """
+        project_ids = dict(
+            Tasks.all_objects.filter(pk__in=task_deltas.keys()).
+            values_list('id', 'project_id')
+        )
+        deltas = {}
+        for task_id, delta in task_deltas.items():
+            project_id = project_ids.get(task_id)
+            if project_id is None:
+                continue
+            current = deltas.get(project_id, (0, 0, 0))
+            deltas[project_id] = tuple(
+                value + change for value, change in zip(current, delta)
+            )
+        return deltas
+
+    @classmethod
+    def daily_bucket_deltas(cls, changes) -> dict:
+        """
+        Seconds changes per (task, local day)
+        """
+        deltas = {}
+        for sign, task_id, state in cls.signed_states(changes):
+            for day, seconds in cls.daily_contribution(*state).items():
+                deltas[(task_id, day)] = deltas.get(
+                    (task_id, day), 0
+                ) + sign * seconds
+        return deltas
+
+    @classmethod
+    def apply_rollup_changes(cls, changes, last_activity=None):
+        """
+        Applies the difference between pairs of cycle states
+        (previous, current) to the task and project rollups
+        and to the daily buckets.
+        A None state stands for a cycle that does not exist
+        """
+        changes = list(changes)
+        TaskDailyBuckets.objects.apply_deltas(
+            cls.daily_bucket_deltas(changes)
+        )
+        task_deltas = cls.task_rollup_deltas(changes)
+        for model, owner_deltas in (
+            (TaskRollups, task_deltas),
+            (ProjectRollups, cls.project_rollup_deltas(task_deltas))
+        ):
+            for owner_id, (seconds, cycles, open_cycles) in \
+                    owner_deltas.items():
+                model.objects.apply_delta(
+                    owner_id,
+                    seconds=seconds,
+                    cycles=cycles,
+                    open_cycles=open_cycles,
+                    last_activity=last_activity
+                )
+
+    def save(self, *args, **kwargs):
+        """
+        Overrided save method, it keeps the task and project
+        rollups up to date within the same transaction
+        """
+        previous_state = getattr(self, '_rollup_snapshot', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.apply_rollup_changes(
+                [(previous_state, self.rollup_state)],
+                last_activity=self.modified_on
+            )
+        self._rollup_snapshot = self.rollup_state
+
+    def delete(self, *args, **kwargs):
+        """
+        Overrided delete method, it discounts this cycle
+        from the task and project rollups
+        """
+        previous_state = getattr(self, '_rollup_snapshot', None)
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.apply_rollup_changes(
+                [(previous_state, None)],
+                last_activity=self.modified_on
+            )
+        self._rollup_snapshot = None
+        return result
+
     @property
     def duration(self):
         """
@@ -137,3 +391,137 @@ class Cycles(CustomUserLogBaseModel):
 
     class Meta:
         db_table = "tasktime_cycles"
+        default_manager_name = 'all_objects'
+        indexes = [
+            # Per user analytics, ranging over dt_start
+            models.Index(
+                fields=['created_by', 'dt_start'],
+                condition=models.Q(is_active=True),
+                name='cycles_user_active_start_idx'
+            ),
+            # Overlap checks within a task
+            models.Index(
+                fields=['task', 'dt_start', 'dt_end'],
+                condition=models.Q(is_active=True),
+                name='cycles_task_active_range_idx'
+            ),
+            # Open cycles (without end datetime) are few
+            models.Index(
+                fields=['created_by', 'task'],
+                condition=models.Q(dt_end__isnull=True),
+                name='cycles_open_idx'
+            ),
+        ]
+
+
+class DurationRollup(models.Model):
+    """
+    Abstract rollup containing pre-aggregated cycle
+    statistics, kept up to date on every cycle write
+    """
+    total_seconds = models.BigIntegerField(
+        default=0,
+        help_text=_("Total duration of the finished active cycles")
+    )
+    cycle_count = models.IntegerField(
+        default=0,
+        help_text=_("Number of active cycles")
+    )
+    open_cycle_count = models.IntegerField(
+        default=0,
+        help_text=_("Number of active cycles without end datetime")
+    )
+    last_activity = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("Last time a related cycle was written")
+    )
+
+    objects = RollupsManager()
+
+    # Statistics that are incrementally maintained
+    COUNTERS = ('total_seconds', 'cycle_count', 'open_cycle_count')
+
+    class Meta:
+        abstract = True
+
+
+class TaskRollups(DurationRollup):
+    OWNER_FIELD = 'task'
+
+    task = models.OneToOneField(
+        Tasks,
+        on_delete=models.CASCADE,
+        related_name="rollup",
+        related_query_name="rollup",
+        help_text=_("Task to which this rollup is related")
+    )
+
+    def move_to_project(self, source_project_id, target_project_id):
+        """
+        Moves this task rollup statistics from the source
+        project rollup to the target project rollup
+        """
+        for sign, project_id in (
+            (-1, source_project_id),
+            (1, target_project_id)
+        ):
+            if project_id is None:
+                continue
+            ProjectRollups.objects.apply_delta(
+                project_id,
+                seconds=sign * self.total_seconds,
+                cycles=sign * self.cycle_count,
+                open_cycles=sign * self.open_cycle_count,
+                last_activity=self.last_activity if sign > 0 else None
+            )
+
+    class Meta:
+        db_table = "tasktime_task_rollups"
+
+
+class ProjectRollups(DurationRollup):
+    OWNER_FIELD = 'project'
+
+    project = models.OneToOneField(
+        Projects,
+        on_delete=models.CASCADE,
+        related_name="rollup",
+        related_query_name="rollup",
+        help_text=_("Project to which this rollup is related")
+    )
+
+    class Meta:
+        db_table = "tasktime_project_rollups"
+
+
+class TaskDailyBuckets(models.Model):
+    """
+    Duration of the finished active cycles of a task per day,
+    kept up to date on every cycle write
+    """
+    task = models.ForeignKey(
+        Tasks,
+        on_delete=models.CASCADE,
+        related_name="daily_buckets",
+        related_query_name="daily_buckets",
+        help_text=_("Task to which this bucket is related")
+    )
+    day = models.DateField(
+        help_text=_("Day of the default timezone")
+    )
+    total_seconds = models.BigIntegerField(
+        default=0,
+        help_text=_("Duration of the cycles within this day")
+    )
+
+    objects = DailyBucketsManager()
+
+    class Meta:
+        db_table = "tasktime_task_daily_buckets"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['task', 'day'],
+                name='task_daily_buckets_unique'
+            ),
+        ]
@@ -1,13 +1,16 @@
+# pylint: disable=W0223
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from common.serializers import SparseFieldsetMixin
+
 from .models import Cycles, Projects, Tasks
 
 User = get_user_model()
 
 
-class CyclesSerializer(serializers.ModelSerializer):
+class CyclesSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     duration = serializers.FloatField(
         read_only=True
     )
@@ -43,13 +46,16 @@ class CyclesSerializer(serializers.ModelSerializer):
         model = Cycles
         fields = "__all__"
         extra_kwargs = {
+            # Only active tasks take new cycles
+            "task": {"queryset": Tasks.objects.all()},
             "public_id": {"read_only": True},
             "duration": {"read_only": True},
             "parsed_duration": {"read_only": True}
         }
 
 
-class TasksSerializer(serializers.ModelSerializer):
+class TasksSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = ('cycles',)
     duration = serializers.FloatField(
         read_only=True
     )
@@ -72,13 +78,16 @@ class TasksSerializer(serializers.ModelSerializer):
         model = Tasks
         fields = "__all__"
         extra_kwargs = {
+            # Only active projects take new tasks
+            "project": {"queryset": Projects.objects.all()},
             "public_id": {"read_only": True},
             "duration": {"read_only": True},
             "parsed_duration": {"read_only": True}
         }
 
 
-class ProjectsSerializer(serializers.ModelSerializer):
+class ProjectsSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    expandable_fields = ('tasks',)
     duration = serializers.FloatField(
         read_only=True
     )
@@ -105,3 +114,26 @@ class ProjectsSerializer(serializers.ModelSerializer):
             "duration": {"read_only": True},
             "parsed_duration": {"read_only": True},
         }
+
+
+class CyclesBulkItemSerializer(serializers.Serializer):
+    """
+    Lightweight serializer for the items of a bulk cycles import.
+    Tasks are given by id and resolved for the whole batch at once
+    """
+    task = serializers.IntegerField()
+    dt_start = serializers.DateTimeField()
+    dt_end = serializers.DateTimeField(
+        required=False,
+        allow_null=True
+    )
+
+    def validate(self, attrs):
+        dt_end = attrs.get('dt_end')
+        if dt_end is not None and dt_end < attrs['dt_start']:
+            raise serializers.ValidationError(
+                _("Invalid End datetime: end datetime must"
+                  " not be lesser than start datetime"),
+                code="invalid_end_datetime"
+            )
+        return attrs
@@ -0,0 +1,36 @@
+from django.db import transaction
+
+from .caching import UserDataVersion
+
+
+def bump_user_data_version(instance, **kwargs):
+    """
+    post_save/post_delete receiver that invalidates
+    the cached analytics of the entry owner
+    """
+    bump_user_data_versions([instance.created_by_id])
+
+
+def bump_cascaded_user_data_versions(sender, instance, path, **kwargs):
+    """
+    active_cascaded receiver that invalidates the cached
+    analytics of the owners of the cascaded entries
+    """
+    bump_user_data_versions(
+        sender.all_objects.filter(
+            **{path: instance.pk}
+        ).values_list('created_by', flat=True).distinct()
+    )
+
+
+def bump_user_data_versions(user_ids) -> None:
+    user_ids = set(user_ids)
+    for user_id in user_ids:
+        UserDataVersion.bump(user_id)
+
+    def bump_committed():
+        for user_id in user_ids:
+            UserDataVersion.bump(user_id)
+    # Bumps again once committed, discarding responses cached by
+    # concurrent requests before the write was visible to them
+    transaction.on_commit(bump_committed)
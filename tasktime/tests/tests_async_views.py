@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytz
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tasktime.async_views import (AsyncDurationRankingView,
+                                  AsyncHistogramView, AsyncLastModifiedTasks,
+                                  AsyncOpenTasksView)
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import Cycles
+from users.factories.users_factories import CustomUserFactory
+
+
+class AsyncViewsTests(APITestCase):
+    """
+    TestCase to assert that the async analytics
+    views answer as their sync counterparts
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUserFactory(
+            is_active=True
+        )
+        for i in range(1, 4):
+            project = ProjectFactory(
+                is_active=True,
+                created_by=cls.user,
+                modified_by=cls.user
+            )
+            task = TaskFactory(
+                project=project,
+                is_active=True,
+                created_by=cls.user,
+                modified_by=cls.user
+            )
+            Cycles.objects.create(
+                user=cls.user,
+                task=task,
+                dt_start=datetime(2023, 3, 1, 1, tzinfo=pytz.UTC),
+                dt_end=datetime(2023, 3, 1, 1 + i, tzinfo=pytz.UTC)
+            )
+        Cycles.objects.create(
+            user=cls.user,
+            task=task,
+            dt_start=datetime(2023, 3, 2, 1, tzinfo=pytz.UTC)
+        )
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def setUp(self):
+        cache.clear()
+
+    def async_get(self, view, params=None, **headers):
+        request = RequestFactory().get(
+            '/',
+            params,
+            HTTP_AUTHORIZATION='Bearer ' + self.token,
+            **headers
+        )
+        return async_to_sync(view.as_view())(request)
+
+    def test_same_responses(self):
+        self.client.force_authenticate(user=self.user)
+        params = {'date_target': '2023-03-03', 'period': 'all'}
+        for url_name, view, query in (
+            ('duration_ranking', AsyncDurationRankingView, 'period'),
+            ('open_tasks', AsyncOpenTasksView, None),
+            ('latest_tasks', AsyncLastModifiedTasks, None),
+            ('total_time', AsyncHistogramView, 'date_target'),
+        ):
+            query_params = {query: params[query]} if query else {}
+            expected = self.client.get(reverse(url_name), query_params)
+            cache.clear()
+            response = self.async_get(view, query_params)
+            self.assertEqual(status.HTTP_200_OK, response.status_code)
+            self.assertEqual(expected.data, response.data)
+            self.assertIn('ETag', response)
+            # Rendered by the request handler
+            self.assertTrue(response.render().content)
+
+    def test_not_modified(self):
+        response = self.async_get(AsyncDurationRankingView)
+        response = self.async_get(
+            AsyncDurationRankingView,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_errors(self):
+        request = RequestFactory().get('/')
+        response = async_to_sync(AsyncOpenTasksView.as_view())(request)
+        self.assertEqual(status.HTTP_401_UNAUTHORIZED, response.status_code)
+        self.assertIn('WWW-Authenticate', response)
+        response = self.async_get(AsyncHistogramView, {'timezone': 'Nowhere'})
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn('timezone', response.data)
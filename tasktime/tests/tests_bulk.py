@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytz
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import Cycles, TaskRollups
+from users.factories.users_factories import CustomUserFactory
+
+
+class CyclesBulkImportTests(APITestCase):
+    """
+    TestCase for testing the bulk cycles import endpoint
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_1 = CustomUserFactory(
+            is_active=True
+        )
+        cls.user_2 = CustomUserFactory(
+            is_active=True
+        )
+        cls.project = ProjectFactory(
+            created_by=cls.user_1,
+            modified_by=cls.user_1
+        )
+        cls.task_1 = TaskFactory(
+            project=cls.project,
+            created_by=cls.user_1,
+            modified_by=cls.user_1
+        )
+        cls.task_2 = TaskFactory(
+            project=cls.project,
+            created_by=cls.user_2,
+            modified_by=cls.user_2
+        )
+        Cycles.objects.create(
+            user=cls.user_1,
+            task=cls.task_1,
+            dt_start=datetime(2023, 2, 2, 6, tzinfo=pytz.UTC),
+            dt_end=datetime(2023, 2, 2, 7, tzinfo=pytz.UTC)
+        )
+        cls.url = reverse('cycles-bulk')
+
+    @staticmethod
+    def item(task, start_hour, end_hour=None):
+        return {
+            'task': task.id,
+            'dt_start': datetime(2023, 2, 2, start_hour, tzinfo=pytz.UTC),
+            'dt_end': datetime(2023, 2, 2, end_hour, tzinfo=pytz.UTC)
+            if end_hour is not None else None
+        }
+
+    def test_bulk_import(self):
+        self.client.force_authenticate(user=self.user_1)
+        response = self.client.post(
+            self.url,
+            data=[
+                self.item(self.task_1, 8, 9),
+                # Overlaps the stored cycle
+                self.item(self.task_1, 5, 7),
+                self.item(self.task_1, 10),
+                # Overlaps the open cycle above
+                self.item(self.task_1, 11, 12),
+                # Another user task
+                self.item(self.task_2, 8, 9),
+                # Invalid end datetime
+                self.item(self.task_1, 4, 3),
+                self.item(self.task_1, 7, 8),
+            ],
+            format="json"
+        )
+        self.assertEqual(
+            status.HTTP_207_MULTI_STATUS,
+            response.status_code
+        )
+        self.assertEqual(
+            ['created', 'error', 'created', 'error', 'error', 'error',
+             'created'],
+            [result['status'] for result in response.data['results']]
+        )
+        self.assertEqual(3, response.data['created'])
+        self.assertEqual(
+            4,
+            Cycles.objects.filter(task=self.task_1).count()
+        )
+        rollup = TaskRollups.objects.get(task=self.task_1)
+        self.assertEqual(
+            (10800, 4, 1),
+            (rollup.total_seconds, rollup.cycle_count,
+             rollup.open_cycle_count)
+        )
+
+    def test_bulk_import_validation(self):
+        self.client.force_authenticate(user=self.user_1)
+        response = self.client.post(self.url, data={}, format="json")
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+        response = self.client.post(
+            self.url,
+            data=[self.item(self.task_1, 8, 9)],
+            format="json"
+        )
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
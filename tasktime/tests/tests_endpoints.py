@@ -1,6 +1,7 @@
 from datetime import datetime
 
 import pytz
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -104,10 +105,37 @@ class TasktimeEndpointsTest(APITestCase):
             status.HTTP_200_OK
         )
         self.assertEqual(
-            len(response.data),
+            len(response.data['results']),
             2
         )
 
+    def test_projects_list_pagination(self):
+        """
+        Test projects listing through cursor pages
+        """
+        self.client.force_authenticate(
+            user=self.user_1
+        )
+        response = self.client.get(
+            reverse('projects-list'),
+            {'page_size': 1}
+        )
+        self.assertEqual(
+            status.HTTP_200_OK,
+            response.status_code
+        )
+        self.assertEqual(
+            [self.project_4.name],
+            [pj['name'] for pj in response.data['results']]
+        )
+        self.assertIsNone(response.data['previous'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [self.project_1.name],
+            [pj['name'] for pj in response.data['results']]
+        )
+        self.assertIsNone(response.data['next'])
+
     def test_projects_create(self):
         """
         Test project creation
@@ -464,3 +492,121 @@ class TasktimeEndpointsTest(APITestCase):
         self.assertTrue(
             'término' in response.data['message']
         )
+
+    def test_create_cycle_containing_another_interval(self):
+        self.client.force_authenticate(
+            user=self.user_1
+        )
+        url = reverse(
+            'cycles-list'
+        )
+        response = self.client.post(
+            url,
+            format="json",
+            data={
+                'dt_start': datetime(2023, 2, 2, 5, tzinfo=pytz.UTC),
+                'dt_end': datetime(2023, 2, 2, 8, tzinfo=pytz.UTC),
+                'task': self.task_1.id,
+            }
+        )
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+        self.assertTrue(
+            'contém' in response.data['message']
+        )
+        # Adjacent intervals do not overlap
+        response = self.client.post(
+            url,
+            format="json",
+            data={
+                'dt_start': datetime(2023, 2, 2, 7, 30, tzinfo=pytz.UTC),
+                'task': self.task_1.id,
+            }
+        )
+        self.assertEqual(
+            status.HTTP_201_CREATED,
+            response.status_code
+        )
+        # But anything after an open cycle start does
+        response = self.client.post(
+            url,
+            format="json",
+            data={
+                'dt_start': datetime(2023, 2, 3, 7, tzinfo=pytz.UTC),
+                'dt_end': datetime(2023, 2, 3, 8, tzinfo=pytz.UTC),
+                'task': self.task_1.id,
+            }
+        )
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+        self.assertTrue(
+            'início' in response.data['message']
+        )
+
+    def test_cycles_export(self):
+        self.client.force_authenticate(
+            user=self.user_1
+        )
+        url = reverse('cycles_export')
+        response = self.client.get(url)
+        self.assertEqual(
+            status.HTTP_200_OK,
+            response.status_code
+        )
+        self.assertEqual('text/csv', response['Content-Type'])
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[0].startswith('public_id,task_public_id'))
+        self.assertIn(self.task_1.name, lines[1])
+        self.assertTrue(lines[1].endswith(',5400'))
+        response = self.client.get(
+            url,
+            {'output': 'ndjson', 'from': '2023-02-03'}
+        )
+        self.assertEqual(b'', b''.join(response.streaming_content))
+        response = self.client.get(
+            url,
+            {'output': 'ndjson', 'to': '2023-02-02'}
+        )
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(1, len(lines))
+        self.assertIn('"duration": 5400', lines[0])
+        response = self.client.get(url, {'output': 'xml'})
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+
+    def test_conditional_list(self):
+        cache.clear()
+        self.client.force_authenticate(
+            user=self.user_1
+        )
+        url = reverse('projects-list')
+        response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        response = self.client.get(
+            url,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+        # Other query params are other representations
+        response = self.client.get(
+            url,
+            {'fields': 'name'},
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.project_4.name = "Renamed"
+        self.project_4.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertNotEqual(etag, response['ETag'])
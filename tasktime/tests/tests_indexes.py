@@ -0,0 +1,68 @@
+from datetime import date, datetime
+
+import pytz
+from django.db import connection
+from django.test import TestCase
+
+from tasktime.analytics import Histogram
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import Cycles
+from users.factories.users_factories import CustomUserFactory
+
+
+class IndexUsageTests(TestCase):
+    """
+    TestCase to assert that the analytics and overlap
+    queries are planned using the cycles indexes
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUserFactory(
+            is_active=True
+        )
+        cls.project = ProjectFactory(
+            created_by=cls.user,
+            modified_by=cls.user
+        )
+        cls.task = TaskFactory(
+            project=cls.project,
+            created_by=cls.user,
+            modified_by=cls.user
+        )
+        Cycles.objects.create(
+            user=cls.user,
+            task=cls.task,
+            dt_start=datetime(2023, 2, 2, 6, tzinfo=pytz.UTC),
+            dt_end=datetime(2023, 2, 2, 7, tzinfo=pytz.UTC)
+        )
+
+    def explain(self, query) -> str:
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would be sequentially scanned
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+        return query.explain()
+
+    def assertUsesIndex(self, query, index_name):
+        self.assertIn(index_name, self.explain(query))
+
+    def test_analytics_query(self):
+        query = Histogram(date(2023, 2, 2)).query(
+            Cycles.objects.query_finished(self.user)
+        )
+        self.assertUsesIndex(query, 'cycles_user_active_start_idx')
+
+    def test_overlap_query(self):
+        query = Cycles.objects.query_overlapping(
+            self.task,
+            datetime(2023, 2, 2, 6, 30, tzinfo=pytz.UTC),
+            datetime(2023, 2, 2, 8, tzinfo=pytz.UTC)
+        )
+        self.assertUsesIndex(query, 'cycles_task_active_range_idx')
+
+    def test_open_cycles_query(self):
+        query = Cycles.objects.filter(
+            created_by=self.user,
+            dt_end__isnull=True
+        )
+        self.assertUsesIndex(query, 'cycles_open_idx')
@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from tasktime.intervals import Intervals
+
+
+class IntervalsTests(SimpleTestCase):
+    """
+    TestCase to test the batched
+    interval math
+    """
+    def setUp(self):
+        # [0, 10) and [5, 15) overlap, [20, 30) is apart
+        self.intervals = Intervals([20, 0, 5], [30, 10, 15])
+
+    def test_totals(self):
+        self.assertEqual([10, 10, 10], list(self.intervals.durations()))
+        self.assertEqual(30, self.intervals.total())
+        clipped = self.intervals.clip(8, 25)
+        self.assertEqual(2 + 7 + 5, clipped.total())
+        self.assertEqual(0, len(self.intervals.clip(15, 20)))
+
+    def test_sum_per_bucket(self):
+        # Overlapping time counts once per interval
+        self.assertEqual(
+            [15, 5, 10],
+            self.intervals.sum_per_bucket([0, 10, 20, 40])
+        )
+        self.assertEqual([5, 25], self.intervals.sum_per_bucket([0, 5, 40]))
+
+    def test_union(self):
+        union = self.intervals.union()
+        self.assertEqual([0, 20], list(union.starts))
+        self.assertEqual([15, 30], list(union.ends))
+        self.assertEqual(0, len(Intervals().union()))
+
+    def test_overlap_stats(self):
+        self.assertEqual(
+            {
+                'overlapping_seconds': 5,
+                'overlapping_pairs': 1,
+                'max_concurrency': 2,
+            },
+            self.intervals.overlap_stats()
+        )
+        # Touching intervals do not overlap
+        self.assertEqual(
+            1,
+            Intervals([0, 10], [10, 20]).overlap_stats()['max_concurrency']
+        )
+        # Nor do empty ones, even within another interval
+        self.assertEqual(
+            {
+                'overlapping_seconds': 0,
+                'overlapping_pairs': 0,
+                'max_concurrency': 1,
+            },
+            Intervals(
+                [10, 15, 1, 24, 21],
+                [20, 15, 8, 28, 21]
+            ).overlap_stats()
+        )
+        self.assertEqual(
+            0,
+            Intervals([5], [5]).overlap_stats()['max_concurrency']
+        )
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytz
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import Cycles
+from users.factories.users_factories import CustomUserFactory
+
+
+class QueryPlanTests(APITestCase):
+    """
+    TestCase to assert that listing the nested
+    projects/tasks/cycles tree runs a constant
+    number of queries
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_1 = CustomUserFactory(
+            is_active=True
+        )
+        cls.dt_start = datetime(2023, 2, 2, 6, tzinfo=pytz.UTC)
+        cls.create_tree(1)
+
+    @classmethod
+    def create_tree(cls, size: int):
+        for _ in range(size):
+            project = ProjectFactory(
+                is_active=True,
+                created_by=cls.user_1,
+                modified_by=cls.user_1
+            )
+            for _ in range(size):
+                task = TaskFactory(
+                    is_active=True,
+                    created_by=cls.user_1,
+                    modified_by=cls.user_1,
+                    project=project
+                )
+                for _ in range(size):
+                    Cycles.objects.create(
+                        user=cls.user_1,
+                        task=task,
+                        dt_start=cls.dt_start,
+                        dt_end=cls.dt_start + timedelta(minutes=30)
+                    )
+                    cls.dt_start += timedelta(hours=1)
+
+    def count_queries(self, url_name: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        return len(context.captured_queries)
+
+    def test_constant_query_count(self):
+        self.client.force_authenticate(user=self.user_1)
+        projects_queries = self.count_queries('projects-list')
+        tasks_queries = self.count_queries('tasks-list')
+        # Projects, tasks and cycles
+        self.assertEqual(3, projects_queries)
+        # Tasks and cycles
+        self.assertEqual(2, tasks_queries)
+        self.create_tree(3)
+        self.assertEqual(
+            projects_queries,
+            self.count_queries('projects-list')
+        )
+        self.assertEqual(
+            tasks_queries,
+            self.count_queries('tasks-list')
+        )
+
+    def test_sparse_fieldsets(self):
+        self.client.force_authenticate(user=self.user_1)
+        url = reverse('projects-list')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'fields': 'name,public_id'})
+        # Only the projects query
+        self.assertEqual(1, len(context.captured_queries))
+        self.assertEqual(
+            {'name', 'public_id'},
+            set(response.data['results'][0].keys())
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'depth': 1})
+        # Projects and tasks
+        self.assertEqual(2, len(context.captured_queries))
+        task = response.data['results'][0]['tasks'][0]
+        self.assertNotIn('cycles', task)
+        self.assertIn('duration', task)
+        response = self.client.get(
+            url,
+            {'fields': 'name,tasks.name,tasks.cycles.dt_start'}
+        )
+        self.assertEqual(
+            {'name', 'tasks'},
+            set(response.data['results'][0].keys())
+        )
+        task = response.data['results'][0]['tasks'][0]
+        self.assertEqual({'name', 'cycles'}, set(task.keys()))
+        self.assertEqual({'dt_start'}, set(task['cycles'][0].keys()))
+        response = self.client.get(
+            reverse('tasks-list'),
+            {'expand': 'cycles', 'fields': 'name'}
+        )
+        self.assertEqual(
+            {'name', 'cycles'},
+            set(response.data['results'][0].keys())
+        )
+        response = self.client.get(url, {'depth': 'all'})
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
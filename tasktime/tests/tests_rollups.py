@@ -0,0 +1,146 @@
+from datetime import date, datetime
+from io import StringIO
+
+import pytz
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import (Cycles, ProjectRollups, TaskDailyBuckets,
+                             TaskRollups)
+from users.factories.users_factories import CustomUserFactory
+
+
+class RollupsTests(TestCase):
+    """
+    TestCase to test if the duration rollups
+    are kept up to date on cycle writes
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.test_user = CustomUserFactory(
+            is_active=True
+        )
+        cls.project_1 = ProjectFactory(
+            created_by=cls.test_user,
+            modified_by=cls.test_user
+        )
+        cls.project_2 = ProjectFactory(
+            created_by=cls.test_user,
+            modified_by=cls.test_user
+        )
+        cls.task_1 = TaskFactory(
+            project=cls.project_1,
+            created_by=cls.test_user,
+            modified_by=cls.test_user
+        )
+        cls.task_2 = TaskFactory(
+            project=cls.project_1,
+            created_by=cls.test_user,
+            modified_by=cls.test_user
+        )
+        cls.cycle_1 = Cycles.objects.create(
+            task=cls.task_1,
+            dt_start=datetime(2023, 2, 2, 7, tzinfo=pytz.UTC),
+            dt_end=datetime(2023, 2, 2, 8, tzinfo=pytz.UTC),
+            user=cls.test_user,
+        )
+        cls.cycle_2 = Cycles.objects.create(
+            task=cls.task_2,
+            dt_start=datetime(2023, 2, 2, 9, tzinfo=pytz.UTC),
+            user=cls.test_user,
+        )
+
+    def assertRollup(self, model, owner, expected):
+        rollup = model.objects.get(**{model.OWNER_FIELD: owner})
+        self.assertEqual(
+            expected,
+            tuple(getattr(rollup, field) for field in model.COUNTERS)
+        )
+
+    def assertBuckets(self, task, expected):
+        self.assertEqual(
+            expected,
+            dict(
+                TaskDailyBuckets.objects.filter(task=task).
+                values_list('day', 'total_seconds')
+            )
+        )
+
+    def test_create(self):
+        self.assertRollup(TaskRollups, self.task_1, (3600, 1, 0))
+        self.assertRollup(TaskRollups, self.task_2, (0, 1, 1))
+        self.assertRollup(ProjectRollups, self.project_1, (3600, 2, 1))
+
+    def test_update(self):
+        cycle = Cycles.objects.get(pk=self.cycle_2.pk)
+        cycle.dt_end = datetime(2023, 2, 2, 9, 30, tzinfo=pytz.UTC)
+        cycle.save()
+        self.assertRollup(TaskRollups, self.task_2, (1800, 1, 0))
+        self.assertRollup(ProjectRollups, self.project_1, (5400, 2, 0))
+        self.assertEqual(self.task_2.duration, 1800)
+        self.assertEqual(self.project_1.parsed_duration, "01:30:00")
+
+    def test_deactivate_and_delete(self):
+        cycle = Cycles.objects.get(pk=self.cycle_1.pk)
+        cycle.deactivate(user=self.test_user)
+        self.assertRollup(TaskRollups, self.task_1, (0, 0, 0))
+        cycle.activate(user=self.test_user)
+        self.assertRollup(TaskRollups, self.task_1, (3600, 1, 0))
+        cycle.delete()
+        self.assertRollup(TaskRollups, self.task_1, (0, 0, 0))
+        self.assertRollup(ProjectRollups, self.project_1, (0, 1, 1))
+
+    def test_move_task(self):
+        task = type(self.task_1).objects.get(pk=self.task_1.pk)
+        task.project = self.project_2
+        task.save()
+        self.assertRollup(ProjectRollups, self.project_1, (0, 1, 1))
+        self.assertRollup(ProjectRollups, self.project_2, (3600, 1, 0))
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_rollups', '--check', stdout=out)
+        self.assertIn("consistent", out.getvalue())
+        TaskRollups.objects.filter(task=self.task_1).update(total_seconds=1)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', '--check', stdout=StringIO())
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertRollup(TaskRollups, self.task_1, (3600, 1, 0))
+        call_command('rebuild_rollups', '--check', stdout=StringIO())
+
+    def test_daily_buckets(self):
+        self.assertBuckets(self.task_1, {date(2023, 2, 2): 3600})
+        self.assertBuckets(self.task_2, {})
+        cycle = Cycles.objects.get(pk=self.cycle_2.pk)
+        # Spans midnight
+        cycle.dt_end = datetime(2023, 2, 3, 1, tzinfo=pytz.UTC)
+        cycle.save()
+        self.assertBuckets(
+            self.task_2,
+            {date(2023, 2, 2): 15 * 3600, date(2023, 2, 3): 3600}
+        )
+        cycle.dt_start = datetime(2023, 2, 3, 0, 30, tzinfo=pytz.UTC)
+        cycle.save()
+        self.assertBuckets(self.task_2, {date(2023, 2, 3): 1800})
+        cycle.deactivate(user=self.test_user)
+        self.assertBuckets(self.task_2, {})
+
+    @override_settings(TIME_ZONE='America/Sao_Paulo')
+    def test_daily_contribution_timezone(self):
+        self.assertEqual(
+            {date(2023, 2, 1): 3600, date(2023, 2, 2): 1800},
+            Cycles.daily_contribution(
+                True,
+                datetime(2023, 2, 2, 2, tzinfo=pytz.UTC),
+                datetime(2023, 2, 2, 3, 30, tzinfo=pytz.UTC)
+            )
+        )
+
+    def test_rebuild_buckets(self):
+        TaskDailyBuckets.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', '--check', stdout=StringIO())
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertBuckets(self.task_1, {date(2023, 2, 2): 3600})
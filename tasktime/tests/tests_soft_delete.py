@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytz
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from tasktime.caching import UserDataVersion
+from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.models import Cycles, ProjectRollups, Projects, Tasks
+from users.factories.users_factories import CustomUserFactory
+
+
+class ScopedManagerTests(APITestCase):
+    """
+    TestCase to test that the default managers only query
+    the entries that are active along with their ancestors
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUserFactory(
+            username='soft_delete_user',
+            email='soft_delete_user@test.com',
+            is_active=True
+        )
+        cls.project = ProjectFactory(
+            name='Soft delete project',
+            created_by=cls.user,
+            modified_by=cls.user
+        )
+        cls.task = TaskFactory(
+            name='Soft delete task',
+            project=cls.project,
+            created_by=cls.user,
+            modified_by=cls.user
+        )
+        dt_start = datetime(2023, 2, 2, 6, tzinfo=pytz.UTC)
+        cls.cycle = Cycles.objects.create(
+            user=cls.user,
+            task=cls.task,
+            dt_start=dt_start,
+            dt_end=dt_start + timedelta(hours=1)
+        )
+
+    def test_scoped_to_active(self):
+        self.assertEqual(1, Cycles.objects.count())
+        self.cycle.deactivate(user=self.user)
+        self.assertEqual(0, Cycles.objects.count())
+        self.assertEqual(1, Cycles.all_objects.count())
+        self.assertEqual(1, Cycles.objects.query_inactive().count())
+
+    def test_related_managers_unscoped(self):
+        self.task.deactivate(user=self.user)
+        # Built from the default manager, the related managers
+        # query the inactive entries as well
+        self.assertEqual([self.task], list(self.project.tasks.all()))
+        self.assertEqual([self.cycle], list(self.task.cycles.all()))
+
+    def test_inactive_ancestors(self):
+        # Without cascading to the tasks and cycles
+        Projects.all_objects.filter(pk=self.project.pk).update(
+            is_active=False
+        )
+        self.assertFalse(Projects.objects.exists())
+        self.assertFalse(Tasks.objects.exists())
+        self.assertFalse(Cycles.objects.exists())
+        # Only the project itself is soft-deleted
+        self.assertEqual(
+            1,
+            Cycles.all_objects.active(ancestors=False).count()
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('cycles-list'))
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual([], response.data['results'])
+
+    def test_inactive_names_are_unique(self):
+        self.project.deactivate(user=self.user)
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('projects-list'),
+            data={'name': self.project.name},
+            format='json'
+        )
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+
+class CascadeTests(APITestCase):
+    """
+    TestCase to test that deactivating and activating an entry
+    cascades to its descendants with set-based updates
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUserFactory(
+            username='cascade_user',
+            email='cascade_user@test.com',
+            is_active=True
+        )
+        cls.project = ProjectFactory(
+            name='Cascade project',
+            created_by=cls.user,
+            modified_by=cls.user
+        )
+        dt_start = datetime(2023, 2, 2, 6, tzinfo=pytz.UTC)
+        cls.tasks = []
+        for index in range(3):
+            task = TaskFactory(
+                name=f'Cascade task {index}',
+                project=cls.project,
+                created_by=cls.user,
+                modified_by=cls.user
+            )
+            cls.tasks.append(task)
+            for _ in range(2):
+                Cycles.objects.create(
+                    user=cls.user,
+                    task=task,
+                    dt_start=dt_start,
+                    dt_end=dt_start + timedelta(minutes=30)
+                )
+                dt_start += timedelta(hours=1)
+
+    def project_seconds(self) -> int:
+        return ProjectRollups.objects.get(
+            project_id=self.project.pk
+        ).total_seconds
+
+    def test_destroy_cascades(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(
+            reverse(
+                'projects-detail',
+                kwargs={'public_id': self.project.public_id}
+            )
+        )
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+        self.assertTrue(Projects.all_objects.filter(pk=self.project.pk))
+        self.assertFalse(Tasks.all_objects.active(ancestors=False))
+        self.assertFalse(Cycles.all_objects.active(ancestors=False))
+        self.assertEqual(0, self.project_seconds())
+
+    def test_set_based_updates(self):
+        with CaptureQueriesContext(connection) as context:
+            self.project.deactivate(user=self.user)
+        updated_tables = [
+            query['sql'].split()[1] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        # One UPDATE per table, but for the rollups of each task
+        for table in ('projects', 'tasks', 'cycles', 'project_rollups'):
+            self.assertEqual(
+                1,
+                updated_tables.count(f'"tasktime_{table}"')
+            )
+        self.assertEqual(3, updated_tables.count('"tasktime_task_rollups"'))
+        self.assertEqual(
+            self.user.pk,
+            Cycles.all_objects.values_list('modified_by', flat=True)[0]
+        )
+
+    def test_activation_restores_cascaded_entries(self):
+        self.tasks[0].deactivate(user=self.user)
+        self.assertEqual(4, Cycles.objects.count())
+        self.project.deactivate(user=self.user)
+        self.project.activate(user=self.user)
+        # The task deactivated on its own stays inactive
+        self.assertEqual(
+            [task.pk for task in self.tasks[1:]],
+            list(Tasks.objects.order_by('pk').values_list('pk', flat=True))
+        )
+        self.assertEqual(4, Cycles.objects.count())
+        self.assertEqual(4 * 30 * 60, self.project_seconds())
+
+    def test_activation_after_save(self):
+        self.project.deactivate(user=self.user)
+        self.project.name = 'Renamed cascade project'
+        self.project.save()
+        self.project.activate(user=self.user)
+        self.assertEqual(3, Tasks.objects.count())
+        self.assertEqual(6, Cycles.objects.count())
+        self.assertEqual(6 * 30 * 60, self.project_seconds())
+
+    def test_update_cascades(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(
+            reverse(
+                'tasks-detail',
+                kwargs={'public_id': self.tasks[0].public_id}
+            ),
+            data={'is_active': False},
+            format='json'
+        )
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual(
+            0,
+            Cycles.all_objects.active(ancestors=False).filter(
+                task=self.tasks[0]
+            ).count()
+        )
+        self.assertEqual(4 * 30 * 60, self.project_seconds())
+
+    def test_cascade_command(self):
+        # Deactivated before deactivation cascaded
+        Projects.all_objects.filter(pk=self.project.pk).update(
+            is_active=False
+        )
+        version = UserDataVersion.get(self.user.pk)
+        call_command('cascade_soft_deletes', stdout=StringIO())
+        # The cached analytics of the owners are invalidated
+        self.assertNotEqual(version, UserDataVersion.get(self.user.pk))
+        self.assertFalse(Tasks.all_objects.active(ancestors=False))
+        self.assertFalse(Cycles.all_objects.active(ancestors=False))
+        self.assertEqual(0, self.project_seconds())
+        # Restored along with the project
+        Projects.all_objects.get(pk=self.project.pk).activate(user=self.user)
+        self.assertEqual(6, Cycles.objects.count())
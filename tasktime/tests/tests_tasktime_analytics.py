@@ -1,11 +1,16 @@
 from datetime import datetime, date
+from unittest import mock
+from zoneinfo import ZoneInfo
 
 import pytz
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
+from tasktime.analytics import Histogram, LocalDays
 from tasktime.factories.tasktime_factories import ProjectFactory, TaskFactory
+from tasktime.intervals import Intervals, to_epoch
 from tasktime.models import Cycles
 from users.factories.users_factories import CustomUserFactory
 
@@ -131,9 +136,13 @@ class AnalyticsTests(APITestCase):
             task=cls.tasks['task_11'],
             dt_start=datetime(2023, 3, 1, 4, tzinfo=pytz.UTC)
         )
-        cls.expected_project_ranking = ['Project 2', 'Project 4', 'Project 6', 'Project 5', 'Project 3']
+        cls.expected_project_ranking = [
+            'Project 2', 'Project 4', 'Project 6', 'Project 5', 'Project 3'
+        ]
         cls.expected_project_series = [205200, 28860, 21600, 18000, 10800]
-        cls.expected_task_ranking = ['Task 9', 'Task 6', 'Task 5', 'Task 8', 'Task 4']
+        cls.expected_task_ranking = [
+            'Task 9', 'Task 6', 'Task 5', 'Task 8', 'Task 4'
+        ]
         cls.expected_task_series = [198000, 21600, 18000, 14460, 14400]
         # Last month and week test
         project_feb = ProjectFactory(
@@ -198,6 +207,9 @@ class AnalyticsTests(APITestCase):
             dt_end=datetime(2022, 3, 1, 4, tzinfo=pytz.UTC)
         )
 
+    def setUp(self):
+        cache.clear()
+
     def test_ranking(self):
         self.client.force_authenticate(user=self.user_1)
         url = reverse('duration_ranking')
@@ -223,6 +235,54 @@ class AnalyticsTests(APITestCase):
             tuple(response.data['tasks']['series'])
         )
 
+    def test_ranking_range(self):
+        self.client.force_authenticate(user=self.user_1)
+        url = reverse('duration_ranking')
+        response = self.client.get(
+            url,
+            {'from': '2023-03-02', 'to': '2023-03-03'}
+        )
+        self.assertEqual(['Task 9'], response.data['tasks']['labels'])
+        self.assertEqual([122400], response.data['tasks']['series'])
+        response = self.client.get(url, {'period': 'all'})
+        self.assertEqual(
+            tuple(self.expected_task_series),
+            tuple(response.data['tasks']['series'])
+        )
+        response = self.client.get(url, {'period': 'week'})
+        self.assertEqual([], response.data['tasks']['series'])
+        for params in (
+            {'period': 'decade'},
+            {'period': 'week', 'from': '2023-03-02'},
+            {'to': '03/03/2023'}
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(
+                status.HTTP_400_BAD_REQUEST,
+                response.status_code
+            )
+
+    def test_ranking_timezone(self):
+        self.client.force_authenticate(user=self.user_1)
+        url = reverse('duration_ranking')
+        response = self.client.get(
+            url,
+            {
+                'from': '2023-03-02',
+                'to': '2023-03-03',
+                'timezone': 'America/Sao_Paulo'
+            }
+        )
+        # From march 2nd at 03:00 UTC, the local midnight
+        self.assertEqual(['Task 9'], response.data['tasks']['labels'])
+        self.assertEqual([111600], response.data['tasks']['series'])
+        self.assertEqual([111600], response.data['projects']['series'])
+        response = self.client.get(url, {'timezone': 'Mars/Olympus'})
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+
     def test_open_tasks(self):
         self.client.force_authenticate(user=self.user_2)
         url = reverse('open_tasks')
@@ -232,8 +292,8 @@ class AnalyticsTests(APITestCase):
             response.status_code
         )
         self.assertEqual(
-            set(['Task 10', 'Task 11']),
-            set([_['name'] for _ in response.data])
+            {'Task 10', 'Task 11'},
+            {task['name'] for task in response.data}
         )
 
     def test_latest_tasks(self):
@@ -294,6 +354,36 @@ class AnalyticsTests(APITestCase):
             response.data['year']['additional_info']['current_value']
         )
 
+    def test_total_time_single_query(self):
+        self.client.force_authenticate(user=self.user_3)
+        url = reverse('total_time')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'date_target': '2023-03-03'})
+        self.assertEqual(
+            status.HTTP_200_OK,
+            response.status_code
+        )
+        self.assertEqual(
+            [date(2023, 3, 1)],
+            response.data['week']['plot_data']['xaxis']
+        )
+        self.assertEqual(
+            [10800],
+            response.data['week']['plot_data']['series']
+        )
+        self.assertEqual(
+            [2, 3],
+            response.data['year']['plot_data']['xaxis']
+        )
+        self.assertEqual(
+            [18000, 10800],
+            response.data['year']['plot_data']['series']
+        )
+        self.assertEqual(
+            10800,
+            response.data['year']['additional_info']['last_value']
+        )
+
     def test_total_time_first_year_week(self):
         self.client.force_authenticate(user=self.user_3)
         date_target = date(2023, 1, 1).strftime('%Y-%m-%d')
@@ -308,3 +398,153 @@ class AnalyticsTests(APITestCase):
             status.HTTP_200_OK,
             response.status_code
         )
+        # 2021-01-01 belongs to the 53rd ISO week of 2020
+        self.assertEqual(
+            (date(2020, 12, 28), date(2021, 1, 4)),
+            Histogram(date(2021, 1, 1)).periods['week']
+        )
+
+    def test_total_time_timezone(self):
+        self.client.force_authenticate(user=self.user_3)
+        url = reverse('total_time')
+        response = self.client.get(
+            url,
+            {'date_target': '2023-03-03', 'timezone': 'America/Sao_Paulo'}
+        )
+        # The march cycle starts on february 28th at 22:00 local time
+        self.assertEqual(
+            [date(2023, 2, 28), date(2023, 3, 1)],
+            response.data['week']['plot_data']['xaxis']
+        )
+        self.assertEqual(
+            [7200, 3600],
+            response.data['week']['plot_data']['series']
+        )
+        self.assertEqual(
+            {'current_value': 3600, 'last_value': 25200},
+            response.data['month']['additional_info']
+        )
+        response = self.client.get(url, {'timezone': 'Mars/Olympus'})
+        self.assertEqual(
+            status.HTTP_400_BAD_REQUEST,
+            response.status_code
+        )
+
+    def test_total_time_lookback(self):
+        user = CustomUserFactory(
+            username='lookback_user',
+            email='lookback_user@test.com',
+            is_active=True
+        )
+        task = TaskFactory(
+            name="Lookback task",
+            project=ProjectFactory(
+                name="Lookback project",
+                created_by=user,
+                modified_by=user
+            ),
+            created_by=user,
+            modified_by=user
+        )
+        # Straddles the start of 2022, the first scanned day
+        Cycles.objects.create(
+            user=user,
+            task=task,
+            dt_start=datetime(2021, 12, 31, 22, tzinfo=pytz.UTC),
+            dt_end=datetime(2022, 1, 1, 2, tzinfo=pytz.UTC)
+        )
+        query = Histogram(date(2023, 3, 3)).query(
+            Cycles.objects.filter(created_by=user)
+        )
+        self.assertIn('"dt_start" >=', str(query.query))
+        self.client.force_authenticate(user=user)
+        response = self.client.get(
+            reverse('total_time'),
+            {'date_target': '2023-03-03'}
+        )
+        self.assertEqual(
+            {'current_value': 0, 'last_value': 7200},
+            response.data['year']['additional_info']
+        )
+
+    def test_local_days_dst(self):
+        days = LocalDays(
+            ZoneInfo('Europe/Berlin'),
+            date(2023, 3, 25),
+            date(2023, 3, 28)
+        )
+        # Clocks move forward on march 26th, a 23 hours day
+        self.assertEqual(
+            {
+                date(2023, 3, 25): 3600,
+                date(2023, 3, 26): 82800,
+                date(2023, 3, 27): 7200,
+            },
+            days.seconds_per_day(Intervals(
+                [
+                    to_epoch(datetime(2023, 3, 25, 22, tzinfo=pytz.UTC)),
+                    # Outside of the range
+                    to_epoch(datetime(2023, 3, 1, tzinfo=pytz.UTC)),
+                ],
+                [
+                    to_epoch(datetime(2023, 3, 27, 0, tzinfo=pytz.UTC)),
+                    to_epoch(datetime(2023, 3, 2, tzinfo=pytz.UTC)),
+                ]
+            ))
+        )
+
+    def test_cache_invalidation(self):
+        self.client.force_authenticate(user=self.user_2)
+        url = reverse('open_tasks')
+        response = self.client.get(url)
+        self.assertEqual(2, len(response.data))
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        cycle = Cycles.objects.get(
+            task=self.tasks['task_11'],
+            dt_end__isnull=True
+        )
+        cycle.dt_end = datetime(2023, 3, 1, 5, tzinfo=pytz.UTC)
+        cycle.save()
+        response = self.client.get(url)
+        self.assertEqual(['Task 10'], [tk['name'] for tk in response.data])
+        cycle.deactivate(user=self.user_2)
+        cycle.activate(user=self.user_2)
+        response = self.client.get(url)
+        self.assertEqual(['Task 10'], [tk['name'] for tk in response.data])
+
+    def test_not_modified(self):
+        self.client.force_authenticate(user=self.user_1)
+        url = reverse('duration_ranking')
+        response = self.client.get(url)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                url,
+                HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(status.HTTP_304_NOT_MODIFIED, response.status_code)
+
+    def test_not_modified_across_local_midnight(self):
+        self.client.force_authenticate(user=self.user_1)
+        url = reverse('total_time')
+        params = {'timezone': 'Asia/Tokyo'}
+        # 23:30 in Tokyo, 14:30 in TIME_ZONE
+        with mock.patch(
+            'django.utils.timezone.now',
+            return_value=datetime(2023, 3, 3, 14, 30, tzinfo=pytz.UTC)
+        ):
+            response = self.client.get(url, params)
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        # Past midnight in Tokyo, still march 3rd in TIME_ZONE
+        with mock.patch(
+            'django.utils.timezone.now',
+            return_value=datetime(2023, 3, 3, 15, 30, tzinfo=pytz.UTC)
+        ):
+            conditional = self.client.get(
+                url,
+                params,
+                HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(status.HTTP_200_OK, conditional.status_code)
+        self.assertNotEqual(response['ETag'], conditional['ETag'])
@@ -1,8 +1,23 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import (CyclesView, DurationRankingView, HistogramView,
-                    LastModifiedTasks, OpenTasksView, ProjectsView, TasksView)
+from .async_views import (AsyncDurationRankingView, AsyncHistogramView,
+                          AsyncLastModifiedTasks, AsyncOpenTasksView)
+from .views import (CyclesExportView, CyclesView, DurationRankingView,
+                    HistogramView, LastModifiedTasks, OpenTasksView,
+                    ProjectsView, TasksView)
+
+
+def analytics_view(sync_view, async_view):
+    """
+    The async version of an analytics view is served
+    when ASYNC_ANALYTICS is enabled
+    """
+    if settings.ASYNC_ANALYTICS:
+        return async_view.as_view()
+    return sync_view.as_view()
+
 
 router = DefaultRouter()
 router.register(r'projects', ProjectsView, 'projects')
@@ -13,22 +28,27 @@ urlpatterns = [
     path('', include(router.urls)),
     path(
         'duration-ranking/',
-        DurationRankingView.as_view(),
+        analytics_view(DurationRankingView, AsyncDurationRankingView),
         name="duration_ranking"
     ),
     path(
         'open-tasks/',
-        OpenTasksView.as_view(),
+        analytics_view(OpenTasksView, AsyncOpenTasksView),
         name="open_tasks"
     ),
     path(
         'latest-tasks/',
-        LastModifiedTasks.as_view(),
+        analytics_view(LastModifiedTasks, AsyncLastModifiedTasks),
         name="latest_tasks"
     ),
     path(
         'total-time/',
-        HistogramView.as_view(),
+        analytics_view(HistogramView, AsyncHistogramView),
         name="total_time"
     ),
+    path(
+        'export/cycles/',
+        CyclesExportView.as_view(),
+        name="cycles_export"
+    ),
 ]
@@ -1,44 +1,49 @@
-from datetime import date, datetime, timedelta
+import uuid
+from datetime import datetime, timedelta
 
-from django.db import models
-from django.db.models.fields import DateField
-from django.db.models.functions import Cast, ExtractMonth
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 
+from common.views import SoftDeleteViewMixin, SparseFieldsetViewMixin
+
+from .analytics import DurationRanking, Histogram
+from .bulk import CyclesBulkImport
+from .caching import cache_per_user, conditional_per_user
+from .exports import CyclesExport
 from .models import Cycles, Projects, Tasks
 from .serializers import CyclesSerializer, ProjectsSerializer, TasksSerializer
 
 
 # Create your views here.
-class ProjectsView(ModelViewSet):   # pylint: disable=R0901
+class ProjectsView(  # pylint: disable=R0901
+    SoftDeleteViewMixin,
+    SparseFieldsetViewMixin,
+    ModelViewSet
+):
     serializer_class = ProjectsSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'public_id'
 
     def get_queryset(self):
         user = self.request.user
-        self.queryset = Projects.objects.filter(
-            created_by=user,
-            is_active=True
+        fieldset = self.get_fieldset()
+        self.queryset = Projects.objects.query_tree(
+            user,
+            with_tasks=fieldset.is_expanded('tasks'),
+            with_cycles=fieldset.is_expanded('tasks.cycles')
         )
         return self.queryset
 
-    def list(self, request):
-        query_set = Projects.objects.filter(
-            created_by=request.user,
-            is_active=True
-        ).all()
-        return Response(
-            self.serializer_class(
-                query_set,
-                many=True
-            ).data,
-            status=status.HTTP_200_OK
-        )
+    @conditional_per_user
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
         request.data['user'] = request.user.id
@@ -57,19 +62,27 @@ class ProjectsView(ModelViewSet):   # pylint: disable=R0901
         )
 
 
-class TasksView(ModelViewSet):  # pylint: disable=R0901
+class TasksView(  # pylint: disable=R0901
+    SoftDeleteViewMixin,
+    SparseFieldsetViewMixin,
+    ModelViewSet
+):
     serializer_class = TasksSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "public_id"
 
     def get_queryset(self):
         user = self.request.user
-        self.queryset = Tasks.objects.filter(
-            created_by=user,
-            is_active=True
+        self.queryset = Tasks.objects.query_tree(
+            user,
+            with_cycles=self.get_fieldset().is_expanded('cycles')
         )
         return self.queryset
 
+    @conditional_per_user
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         request.data['user'] = request.user.id
         serializer = self.serializer_class(
@@ -87,61 +100,101 @@ class TasksView(ModelViewSet):  # pylint: disable=R0901
         )
 
 
-class CyclesView(ModelViewSet): # pylint: disable=R0901
+class CyclesView(  # pylint: disable=R0901
+    SoftDeleteViewMixin,
+    SparseFieldsetViewMixin,
+    ModelViewSet
+):
     serializer_class = CyclesSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "public_id"
+    # Bulk import limits
+    bulk_max_items = 5000
+    bulk_batch_size = 500
 
     def get_queryset(self):
         user = self.request.user
         self.queryset = Cycles.objects.filter(
-            created_by=user,
-            is_active=True
+            created_by=user
         )
         return self.queryset
 
+    @conditional_per_user
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @staticmethod
+    def overlap_response(cycle_data: dict, overlapping: tuple) -> Response:
+        """
+        Response describing how the given cycle data
+        overlaps an existing cycle interval
+        """
+        dt_start = cycle_data['dt_start']
+        dt_end = cycle_data.get('dt_end')
+        overlap_start, overlap_end = overlapping
+        if overlap_start <= dt_start and (
+            overlap_end is None or dt_start < overlap_end
+        ):
+            message = "A data de início já está contida em outro intervalo"
+        elif dt_end is not None and overlap_start < dt_end and (
+            overlap_end is None or dt_end <= overlap_end
+        ):
+            message = "A data de término já está contida em outro intervalo"
+        else:
+            message = "O intervalo contém outro intervalo"
+        return Response(
+            data={'message': message},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def save_without_overlap(self, serializer, cycle_data: dict,
+                             exclude_pk=None):
+        """
+        Saves the serializer as long as the cycle does not overlap
+        another active cycle of the same task. The task row is locked
+        first, so concurrent writes on the task are serialized (the
+        database exclusion constraint also guards PostgreSQL).
+        Returns an error response when it overlaps
+        """
+        with transaction.atomic():
+            if cycle_data.get('is_active', True):
+                Tasks.objects.lock(cycle_data['task'].pk)
+                overlapping = Cycles.objects.query_overlapping(
+                    cycle_data['task'],
+                    cycle_data['dt_start'],
+                    cycle_data.get('dt_end')
+                ).exclude(
+                    pk=exclude_pk
+                ).order_by(
+                    'dt_start'
+                ).values_list(
+                    'dt_start',
+                    'dt_end'
+                ).first()
+                if overlapping is not None:
+                    return self.overlap_response(cycle_data, overlapping)
+            try:
+                with transaction.atomic():
+                    serializer.save()
+            except IntegrityError:
+                return Response(
+                    data={'message': "O intervalo contém outro intervalo"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        return None
+
     def create(self, request, *args, **kwargs):
         request.data['user'] = request.user.id
         serializer = self.serializer_class(
             data=request.data
         )
         if serializer.is_valid():
-            # validate if dt_start or dt_end is contained between
-            # another cycle of the corresponding task
-            data = serializer.validated_data
-            dt_start_validation = Cycles.objects.filter(
-                is_active=True,
-                created_by=data['user'],
-                task=data['task'],
-                dt_start__lte=data['dt_start'],
-                dt_end__gte=data['dt_start']
-            ).all()
-            if len(dt_start_validation) > 0:
-                return Response(
-                    data={
-                        'message': "A data de início já "
-                        "está contida em outro intervalo"
-                    },
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            if 'dt_end' in data and data.get('dt_end') is not None:
-                dt_end_validation = Cycles.objects.filter(
-                    is_active=True,
-                    created_by=data['user'],
-                    task=data['task'],
-                    dt_start__lte=data['dt_end'],
-                    dt_end__gte=data['dt_end']
-                ).all()
-                if len(dt_end_validation) > 0:
-                    return Response(
-                        data={
-                            'message': "A data de término já está "
-                            "contida em outro intervalo"
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-            serializer.save()
+            error_response = self.save_without_overlap(
+                serializer,
+                serializer.validated_data
+            )
+            if error_response is not None:
+                return error_response
             return Response(
                 data=serializer.data,
                 status=status.HTTP_201_CREATED
@@ -161,39 +214,20 @@ class CyclesView(ModelViewSet): # pylint: disable=R0901
         )
         if serializer.is_valid():
             data = serializer.validated_data
-            if 'dt_start' in data:
-                dt_start_validation = Cycles.objects.filter(
-                    is_active=True,
-                    created_by=instance.created_by,
-                    task=instance.task,
-                    dt_start__lte=data['dt_start'],
-                    dt_end__gte=data['dt_start'],
-                ).exclude(id=instance.id).all()
-                if len(dt_start_validation) > 0:
-                    return Response(
-                        data={
-                            'message': 'A data de início já '
-                            'está contida em outro intervalo'
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            if 'dt_end' in data and data.get('dt_end') is not None:
-                dt_end_validation = Cycles.objects.filter(
-                    is_active=True,
-                    created_by=instance.created_by,
-                    task=instance.task,
-                    dt_start__lte=data['dt_end'],
-                    dt_end__gte=data['dt_end']
-                ).exclude(id=instance.id).all()
-                if len(dt_end_validation) > 0:
-                    return Response(
-                        data={
-                            'message': 'A data de término já '
-                            'está contida em outro intervalo'
-                        },
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-            self.perform_update(serializer)
+            # Cycle interval as it will be after the update
+            cycle_data = {
+                'task': data.get('task', instance.task),
+                'dt_start': data.get('dt_start', instance.dt_start),
+                'dt_end': data.get('dt_end', instance.dt_end),
+                'is_active': data.get('is_active', instance.is_active),
+            }
+            error_response = self.save_without_overlap(
+                serializer,
+                cycle_data,
+                exclude_pk=instance.pk
+            )
+            if error_response is not None:
+                return error_response
             return Response(
                 data=serializer.data,
                 status=status.HTTP_200_OK
@@ -203,73 +237,58 @@ class CyclesView(ModelViewSet): # pylint: disable=R0901
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Imports a list of cycles at once, returning
+        the result of each one of them
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                data={'message': "A non-empty list of cycles is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                data={
+                    'message': f"At most {self.bulk_max_items} cycles "
+                    "can be imported at once"
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            results = CyclesBulkImport(
+                request.user,
+                items,
+                batch_size=self.bulk_batch_size
+            ).run()
+        except IntegrityError:
+            return Response(
+                data={'message': "O intervalo contém outro intervalo"},
+                status=status.HTTP_409_CONFLICT
+            )
+        created = sum(result['status'] == 'created' for result in results)
+        return Response(
+            data={
+                'created': created,
+                'errors': len(results) - created,
+                'results': results
+            },
+            status=status.HTTP_201_CREATED
+            if created == len(results) else status.HTTP_207_MULTI_STATUS
+        )
+
 
 class DurationRankingView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_per_user
+    @cache_per_user
     def get(self, request):
-        user = request.user
-        #TODO detect period (week, month, year, all_time) and filter by it
-        tasks_summary = Tasks.objects.\
-            filter(
-                created_by=user,
-                is_active=True,
-                cycles__created_by=user,
-                cycles__dt_end__gte=models.F('cycles__dt_start'),
-                cycles__is_active=True,
-                project_id__is_active=True
-            ).\
-            annotate(
-                task_name=models.F('name')
-            ).\
-            values('task_name').\
-            annotate(
-                interval=models.Sum(
-                    models.F('cycles__dt_end') - models.F('cycles__dt_start')
-                )
-            ).\
-            values('task_name', 'interval').\
-            order_by('-interval')[0:5]
-        projects_summary = Projects.objects.\
-            filter(
-                created_by=user,
-                is_active=True,
-                tasks__created_by=user,
-                tasks__is_active=True,
-                tasks__cycles__created_by=user,
-                tasks__cycles__dt_end__gte=models.F('tasks__cycles__dt_start'),
-                tasks__cycles__is_active=True
-            ).\
-            annotate(
-                project_name=models.F('name')
-            ).\
-            values('project_name').\
-            annotate(
-                interval=models.Sum(
-                    models.F('tasks__cycles__dt_end') -
-                    models.F('tasks__cycles__dt_start')
-                )
-            ).\
-            values('project_name', 'interval').\
-            order_by('-interval')[0:5]
-        data = {
-            'projects': {
-                'series': [
-                    int(q['interval'].total_seconds())
-                    for q in projects_summary
-                ],
-                'labels': [q['project_name'] for q in projects_summary]
-            },
-            'tasks': {
-                'series': [
-                    int(q['interval'].total_seconds())
-                    for q in tasks_summary
-                ],
-                'labels': [q['task_name'] for q in tasks_summary]
-            }
-        }
+        ranking = DurationRanking.from_query_params(request.query_params)
         return Response(
-            data=data,
+            data=ranking.build(request.user),
             status=status.HTTP_200_OK
         )
 
@@ -277,34 +296,12 @@ class DurationRankingView(APIView):
 class OpenTasksView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_per_user
+    @cache_per_user
     def get(self, request):
-        user = request.user
         #TODO detect period (week, month, year, all_time) and filter by it
-        open_tasks = Tasks.objects.\
-            filter(
-                created_by=user,
-                cycles__created_by=user,
-                is_active=True,
-                cycles__is_active=True,
-                cycles__dt_end__isnull=True,
-                project_id__is_active=True
-            ).\
-            annotate(
-                project_public_id=models.F(
-                    'project_id__public_id'
-                )
-            ).\
-            values('public_id', 'name', 'project_public_id')
-        data = [
-            {
-                'public_id': q['public_id'],
-                'name': q['name'],
-                'project_public_id': q['project_public_id']
-            }
-            for q in open_tasks
-        ]
         return Response(
-            data=data,
+            data=list(Tasks.objects.query_open(request.user)),
             status=status.HTTP_200_OK
         )
 
@@ -312,44 +309,11 @@ class OpenTasksView(APIView):
 class LastModifiedTasks(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_per_user
+    @cache_per_user
     def get(self, request):
-        user = request.user
-        latest_tasks = Tasks.objects.\
-            filter(
-                created_by=user,
-                cycles__created_by=user,
-                is_active=True,
-                cycles__is_active=True,
-                project_id__is_active=True
-            ).\
-            annotate(
-                project_public_id=models.F(
-                    'project_id__public_id'
-                ),
-                last_modified_on=models.Max(
-                    models.F(
-                        'cycles__modified_on'
-                    )
-                )
-            ).\
-            values(
-                'public_id',
-                'name',
-                'project_public_id',
-                'last_modified_on'
-            ).\
-            order_by('-last_modified_on')[0:5]
-        data = [
-            {
-                'public_id': q['public_id'],
-                'name': q['name'],
-                'project_public_id': q['project_public_id'],
-                'last_modified_on': q['last_modified_on']
-            }
-            for q in latest_tasks
-        ]
         return Response(
-            data=data,
+            data=list(Tasks.objects.query_last_modified(request.user)),
             status=status.HTTP_200_OK
         )
 
@@ -357,202 +321,63 @@ class LastModifiedTasks(APIView):
 class HistogramView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request): # pylint: disable=R0914,R0912
-        #TODO detect period
-        user = request.user
-        cycle_base_query = Cycles.objects.\
-            filter(
-                dt_start__isnull=False,
-                created_by=user,
-                is_active=True,
-                dt_end__gte=models.F('dt_start'),
-                task_id__is_active=True,
-                task_id__project_id__is_active=True
-            )
-        date_target = request.GET.get('date_target', date.today())
-        if isinstance(date_target, str):
-            date_target = datetime.strptime(date_target, '%Y-%m-%d')
-        current_week = date_target.isocalendar()[1]
-        current_month = date_target.month
-        current_year = date_target.year
-
-        # Week
-        #TODO convert to the desired timezone
-        week_query = cycle_base_query.\
-            filter(
-                dt_start__week=current_week,
-                dt_start__year=current_year
-            ).\
-            annotate(day=Cast('dt_start', DateField())).\
-            values('day').\
-            annotate(
-                interval=models.Sum(
-                    models.F('dt_end') -
-                    models.F('dt_start')
-                )
-            ).\
-            values('day', 'interval')
-        week_agg_total = week_query.aggregate(
-            total=models.Sum(
-                models.F('interval')
-            )
-        )['total']
-        if week_agg_total is not None:
-            week_total = int(week_agg_total.total_seconds())
-        else:
-            week_total = 0
-        # Month
-        #TODO convert to the desired timezone
-        month_query = cycle_base_query.\
-            filter(
-                dt_start__month=current_month,
-                dt_start__year=current_year
-            ).\
-            annotate(
-                day=Cast('dt_start', DateField())
-            ).\
-            values('day').\
-            annotate(
-                interval=models.Sum(
-                    models.F('dt_end') -
-                    models.F('dt_start')
-                )
-            ).\
-            values('day', 'interval')
-        month_agg_total = month_query.aggregate(
-            total=models.Sum(
-                models.F('interval')
+    @conditional_per_user
+    @cache_per_user
+    def get(self, request):
+        cycle_base_query = Cycles.objects.query_finished(request.user)
+        histogram = Histogram.from_query_params(request.query_params)
+        data = histogram.build(cycle_base_query)
+        return Response(
+            data=data,
+            status=status.HTTP_200_OK
+        )
+
+
+class CyclesExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        output = request.GET.get('output', 'csv')
+        if output not in CyclesExport.CONTENT_TYPES:
+            return Response(
+                data={'output': "Supported outputs: csv, ndjson"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        )['total']
-        if month_agg_total is not None:
-            month_total = int(month_agg_total.total_seconds())
-        else:
-            month_total = 0
-        # Year
-        #TODO convert to the desired timezone
-        year_query = cycle_base_query.\
-            filter(
-                dt_start__year=current_year
-            ).\
-            annotate(
-                month=ExtractMonth('dt_start')
-            ).\
-            values('month').\
-            annotate(
-                interval=models.Sum(
-                    models.F('dt_end') -
-                    models.F('dt_start')
+        cycles_query = Cycles.objects.filter(
+            created_by=request.user
+        )
+        # Dates are turned into datetime ranges so that
+        # the dt_start index can be used
+        try:
+            if request.GET.get('from'):
+                cycles_query = cycles_query.filter(
+                    dt_start__gte=timezone.make_aware(
+                        datetime.strptime(request.GET['from'], '%Y-%m-%d')
+                    )
                 )
-            ).\
-            values('month', 'interval')
-        year_agg_total = year_query.aggregate(
-            total=models.Sum(
-                models.F('interval')
-            )
-        )['total']
-        if year_agg_total is not None:
-            year_total = year_agg_total.total_seconds()
-        else:
-            year_total = 0
-        #TODO deal when it is the first week of the year
-        #TODO convert to the desired timezone
-        last_week = date_target - timedelta(weeks=1)
-        last_week_query = cycle_base_query.\
-            filter(
-                dt_start__week=last_week.isocalendar()[1],
-                dt_start__year=last_week.year
-            ).\
-            aggregate(last_week_interval=models.Sum(
-                models.F('dt_end') -
-                models.F('dt_start')
-            ))
-        if last_week_query['last_week_interval'] is not None:
-            last_week_value = int(
-                last_week_query['last_week_interval'].total_seconds()
-            )
-        else:
-            last_week_value = 0
-        #TODO deal when it is the first month of the year
-        #TODO convert to the desired timezone
-        last_month = date_target - timedelta(days=30)
-        last_month_query = cycle_base_query.\
-            filter(
-                dt_start__month=last_month.month,
-                dt_start__year=last_month.year
-            ).\
-            aggregate(
-                last_month_interval=models.Sum(
-                    models.F('dt_end') -
-                    models.F('dt_start')
+            if request.GET.get('to'):
+                cycles_query = cycles_query.filter(
+                    dt_start__lt=timezone.make_aware(
+                        datetime.strptime(request.GET['to'], '%Y-%m-%d')
+                    ) + timedelta(days=1)
                 )
+        except ValueError:
+            return Response(
+                data={'message': "Invalid date, use YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        if last_month_query['last_month_interval'] is not None:
-            last_month_value = int(
-                last_month_query['last_month_interval'].total_seconds()
-            )
-        else:
-            last_month_value = 0
-        last_year = date_target - timedelta(days=360)
-        last_year_query = cycle_base_query.\
-            filter(
-                dt_start__year=last_year.year
-            ).\
-            aggregate(
-                last_year_interval=models.Sum(
-                    models.F('dt_end') -
-                    models.F('dt_start')
+        if request.GET.get('project'):
+            try:
+                cycles_query = cycles_query.filter(
+                    task__project__public_id=uuid.UUID(request.GET['project'])
                 )
-            )
-        if last_year_query['last_year_interval'] is not None:
-            last_year_value = int(
-                last_year_query['last_year_interval'].total_seconds()
-            )
-        else:
-            last_year_value = 0
-
-        data = {
-            'week': {
-                'plot_data': {
-                    'series': [
-                        int(q['interval'].total_seconds())
-                        for q in week_query
-                    ],
-                    'xaxis': [q['day'] for q in week_query]
-                },
-                'additional_info': {
-                    'current_value': week_total,
-                    'last_value': last_week_value
-                },
-            },
-            'month': {
-                'plot_data': {
-                    'series': [
-                        int(q['interval'].total_seconds())
-                        for q in month_query
-                    ],
-                    'xaxis': [q['day'] for q in month_query]
-                },
-                'additional_info': {
-                    'current_value': month_total,
-                    'last_value': last_month_value
-                }
-            },
-            'year': {
-                'plot_data': {
-                    'series': [
-                        int(q['interval'].total_seconds())
-                        for q in year_query
-                    ],
-                    'xaxis': [q['month'] for q in year_query]
-                },
-                'additional_info': {
-                    'current_value': year_total,
-                    'last_value': last_year_value
-                }
-            }
-        }
-
-        return Response(
-            data=data,
-            status=status.HTTP_200_OK
+            except ValueError:
+                # Matches no project, as any unknown public id
+                cycles_query = cycles_query.none()
+        response = StreamingHttpResponse(
+            CyclesExport(cycles_query).lines(output),
+            content_type=CyclesExport.CONTENT_TYPES[output]
         )
+        response['Content-Disposition'] = \
+            f'attachment; filename="cycles.{output}"'
+        return response
@@ -0,0 +1,201 @@
+"""
+Contains the writer of the user access logs, which inserts them in
+batches from a background thread instead of during the login request
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from common.utils import Utils
+
+from .models import UserAccessLogs
+
+logger = logging.getLogger(__name__)
+
+
+class AccessLogWriter:
+    """
+    Process wide queue of access logs, flushed with bulk_create by a
+    background thread every ACCESS_LOG_BATCH_SIZE logs or
+    ACCESS_LOG_FLUSH_INTERVAL seconds. Logs that cannot be inserted,
+    or are still queued when the process exits, are appended to
+    ACCESS_LOG_FALLBACK_FILE, which replay_access_logs loads
+    """
+    _queue = None
+    _thread = None
+    _pid = None
+    _lock = threading.Lock()
+    _file_lock = threading.Lock()
+    _stop = object()
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return settings.ACCESS_LOG_ASYNC
+
+    @classmethod
+    def log(cls, user_id: int, access_type: str, request) -> None:
+        """
+        Records an access of the user. It is written synchronously
+        when the writer is disabled, the queue is full or a
+        transaction is open, whose rollback must discard it
+        """
+        user_agent, platform, ip_address = Utils.get_request_info(request)
+        entry = cls.truncate({
+            'user_id': user_id,
+            'access_type': access_type,
+            'access_timestamp': timezone.now(),
+            'user_agent': user_agent,
+            'platform': platform,
+            'ip_address': ip_address,
+        })
+        if not cls.enabled() or connection.in_atomic_block:
+            cls.write([entry])
+            return
+        try:
+            cls.get_queue().put_nowait(entry)
+        except queue.Full:
+            cls.write([entry])
+
+    @staticmethod
+    def truncate(entry: dict) -> dict:
+        """
+        Cuts the request headers down to the max_length of their
+        fields, so that a single log cannot fail the whole batch
+        """
+        for name in ('user_agent', 'platform', 'ip_address'):
+            if entry.get(name):
+                max_length = UserAccessLogs._meta.get_field(name).max_length
+                entry[name] = entry[name][:max_length]
+        return entry
+
+    @classmethod
+    def get_queue(cls) -> queue.Queue:
+        """
+        Queue of the process, starting its thread on first use
+        and again in processes forked after it
+        """
+        with cls._lock:
+            if cls._thread is None or cls._pid != os.getpid():
+                cls._queue = queue.Queue(
+                    maxsize=settings.ACCESS_LOG_QUEUE_SIZE
+                )
+                cls._thread = threading.Thread(
+                    target=cls._run,
+                    args=(cls._queue,),
+                    name='access-log-writer',
+                    daemon=True
+                )
+                cls._pid = os.getpid()
+                cls._thread.start()
+            return cls._queue
+
+    @classmethod
+    def _run(cls, entries: queue.Queue) -> None:
+        stopped = False
+        while not stopped:
+            batch = [entries.get()]
+            deadline = time.monotonic() + settings.ACCESS_LOG_FLUSH_INTERVAL
+            while batch[-1] is not cls._stop and \
+                    len(batch) < settings.ACCESS_LOG_BATCH_SIZE:
+                try:
+                    batch.append(entries.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    ))
+                except queue.Empty:
+                    break
+            stopped = batch[-1] is cls._stop
+            if stopped:
+                batch.pop()
+            if batch:
+                close_old_connections()
+                cls.write(batch)
+        connection.close()
+
+    @classmethod
+    def write(cls, entries: list) -> None:
+        """
+        Inserts the given logs, appending them
+        to the fallback file on failure
+        """
+        try:
+            UserAccessLogs.objects.bulk_create(
+                [UserAccessLogs(**entry) for entry in entries]
+            )
+        except Exception:  # pylint: disable=W0703
+            logger.exception("Could not insert %d access logs", len(entries))
+            cls.spill(entries)
+
+    @classmethod
+    def spill(cls, entries: list, path: str = None) -> None:
+        """
+        Appends the given logs to the fallback file, or to path
+        """
+        with cls._file_lock, open(
+            path or settings.ACCESS_LOG_FALLBACK_FILE,
+            'a',
+            encoding='utf-8'
+        ) as file:
+            for entry in entries:
+                file.write(json.dumps(
+                    dict(
+                        entry,
+                        access_timestamp=entry['access_timestamp']
+                        .isoformat()
+                    )
+                ) + '\n')
+
+    @classmethod
+    def flush(cls, timeout: float = None) -> None:
+        """
+        Writes the queued logs and stops the thread, which the next
+        log starts again. Logs not written within the timeout are
+        appended to the fallback file
+        """
+        with cls._lock:
+            thread, entries = cls._thread, cls._queue
+            if thread is None or cls._pid != os.getpid():
+                return
+            cls._thread = cls._queue = None
+        try:
+            entries.put(cls._stop, timeout=timeout)
+        except queue.Full:
+            pass
+        thread.join(timeout)
+        if thread.is_alive():
+            pending = []
+            while True:
+                try:
+                    pending.append(entries.get_nowait())
+                except queue.Empty:
+                    break
+            cls.spill([entry for entry in pending if entry is not cls._stop])
+
+    @staticmethod
+    def load(path: str) -> list:
+        """
+        Access logs of a fallback file
+        """
+        entries = []
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    entry['access_timestamp'] = parse_datetime(
+                        entry['access_timestamp']
+                    )
+                    # Spilled before the fields were truncated
+                    entries.append(AccessLogWriter.truncate(entry))
+        return entries
+
+
+# Gunicorn workers exit normally on SIGTERM, running this handler
+atexit.register(lambda: AccessLogWriter.flush(timeout=10))
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Imported once the models are loaded
+        # pylint: disable=C0415
+        from .partitions import partition_access_logs
+        from .signals import forget_user_status, refresh_user_status
+        post_migrate.connect(partition_access_logs, sender=self)
+        model = self.get_model('CustomUser')
+        post_save.connect(refresh_user_status, sender=model)
+        post_delete.connect(forget_user_status, sender=model)
@@ -0,0 +1,82 @@
+"""
+Contains the JWT authentication trusting the token claims, which
+spares the users table lookup of every authenticated request
+"""
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+
+class UserStatus:
+    """
+    Active status of the users, cached for USER_STATUS_CACHE_TIMEOUT
+    seconds. Saving a user refreshes it, so deactivated users are
+    rejected right away by every worker sharing the cache
+    """
+    KEY = "users:active:{user_id}"
+
+    @classmethod
+    def is_active(cls, user_id: int) -> bool:
+        key = cls.KEY.format(user_id=user_id)
+        active = cache.get(key)
+        if active is None:
+            active = User.objects.filter(id=user_id, is_active=True)\
+                .exists()
+            cls.set(user_id, active)
+        return active
+
+    @classmethod
+    def set(cls, user_id: int, active: bool) -> None:
+        cache.set(
+            cls.KEY.format(user_id=user_id),
+            active,
+            timeout=settings.USER_STATUS_CACHE_TIMEOUT
+        )
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Builds the user from the claims of the validated token instead
+    of loading it. The user only holds its id, public id and active
+    status, the other fields are loaded at once on first access
+    """
+    CLAIMS = ('public_id', 'is_active')
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in self.CLAIMS):
+            # Tokens issued before the claims were added
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as error:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from error
+        if not validated_token['is_active'] or \
+                not UserStatus.is_active(user_id):
+            raise AuthenticationFailed(
+                _("User is inactive"),
+                code="user_inactive"
+            )
+        return User.from_db(
+            None,
+            [api_settings.USER_ID_FIELD, 'public_id', 'is_active'],
+            [user_id, uuid.UUID(validated_token['public_id']), True]
+        )
+
+
+class StatelessJWTScheme(SimpleJWTScheme):
+    """
+    Documents the stateless authentication as the JWT one
+    """
+    target_class = 'users.authentication.StatelessJWTAuthentication'
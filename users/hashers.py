@@ -0,0 +1,24 @@
+"""
+Contains the password hasher with a configurable bcrypt cost
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import BCryptSHA256PasswordHasher
+
+
+class ConfigurableBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """
+    bcrypt_sha256 hasher using BCRYPT_ROUNDS as its cost. Existing
+    hashes keep verifying whatever their cost; BCRYPT_REHASH sets
+    which ones are rehashed at the next successful login
+    """
+    @property
+    def rounds(self) -> int:
+        return settings.BCRYPT_ROUNDS
+
+    def must_update(self, encoded) -> bool:
+        work_factor = self.decode(encoded)['work_factor']
+        if settings.BCRYPT_REHASH == 'never':
+            return False
+        if settings.BCRYPT_REHASH == 'upgrade':
+            return work_factor < self.rounds
+        return work_factor != self.rounds
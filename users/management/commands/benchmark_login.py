@@ -0,0 +1,78 @@
+# pylint: disable=C0209
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from users.views import LoginView
+
+PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the logins per second a single core serves through the "
+        "login view, for each bcrypt cost. The benchmark user and its "
+        "access logs are rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            nargs="+",
+            default=[10, 11, 12],
+            help="bcrypt costs to measure."
+        )
+        parser.add_argument(
+            "--logins",
+            type=int,
+            default=20,
+            help="Number of logins per cost."
+        )
+
+    def measure(self, logins: int) -> tuple:
+        """
+        Seconds and queries per login of a new user
+        """
+        user = get_user_model().objects.create_user(
+            email="benchmark-login@example.com",
+            username="benchmark-login",
+            password=PASSWORD
+        )
+        view = LoginView.as_view()
+        factory = RequestFactory()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            for _ in range(logins):
+                response = view(factory.post(
+                    '/api/v1/auth/login/',
+                    {'email': user.email, 'password': PASSWORD},
+                    content_type='application/json'
+                ))
+                if response.status_code != 200:
+                    raise CommandError(
+                        "Login failed: {}".format(response.data)
+                    )
+            elapsed = time.perf_counter() - started
+        return elapsed / logins, len(context.captured_queries) / logins
+
+    def handle(self, **options):
+        for rounds in options['rounds']:
+            with override_settings(BCRYPT_ROUNDS=rounds), \
+                    transaction.atomic():
+                seconds, queries = self.measure(options['logins'])
+                transaction.set_rollback(True)
+            self.stdout.write(
+                "cost {rounds:>2}: {ms:>8.1f}ms per login "
+                "{rate:>7.1f} logins/s per core "
+                "{queries:.1f} queries per login".format(
+                    rounds=rounds,
+                    ms=seconds * 1000,
+                    rate=1 / seconds,
+                    queries=queries
+                )
+            )
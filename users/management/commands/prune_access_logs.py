@@ -0,0 +1,89 @@
+# pylint: disable=C0209
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from users.models import UserAccessLogs
+from users.partitions import (add_months, ensure_partitions,
+                              expire_partitions, is_partitioned,
+                              month_bounds, month_of)
+
+
+class Command(BaseCommand):
+    help = (
+        "Removes the access logs older than the retention period. On "
+        "PostgreSQL whole monthly partitions are dropped (or archived) "
+        "and the upcoming ones are created; other databases delete the "
+        "old rows with a single DELETE"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=settings.ACCESS_LOG_RETENTION_MONTHS,
+            help=(
+                "Number of full months kept before the current one, "
+                "defaults to ACCESS_LOG_RETENTION_MONTHS."
+            )
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help=(
+                "Detaches the expired partitions as standalone tables "
+                "instead of dropping them (PostgreSQL only)."
+            )
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database to prune."
+        )
+
+    def handle(self, **options):
+        if options['months'] < 1:
+            raise CommandError("--months must be at least 1.")
+        connection = connections[options['database']]
+        this_month = month_of(datetime.now(dt_timezone.utc))
+        before = add_months(this_month, -options['months'])
+        if connection.vendor != 'postgresql':
+            if options['archive']:
+                raise CommandError("Archiving requires PostgreSQL.")
+            # Access logs have no dependent rows nor signals,
+            # so this is a single DELETE statement
+            deleted, _ = UserAccessLogs.objects\
+                .using(options['database'])\
+                .filter(access_timestamp__lt=month_bounds(before)[0])\
+                .delete()
+            self.stdout.write(
+                "Deleted {} access logs older than {}.".format(
+                    deleted,
+                    before
+                )
+            )
+            return
+        with transaction.atomic(using=options['database']), \
+                connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                raise CommandError(
+                    "The access logs table is not partitioned, run "
+                    "migrate first."
+                )
+            expired = expire_partitions(cursor, before, options['archive'])
+            created = ensure_partitions(
+                cursor,
+                this_month,
+                add_months(this_month, settings.ACCESS_LOG_PARTITIONS_AHEAD)
+            )
+        self.stdout.write(
+            "{} {} partitions older than {}, created {} partitions.".format(
+                "Archived" if options['archive'] else "Dropped",
+                len(expired),
+                before,
+                len(created)
+            )
+        )
@@ -0,0 +1,85 @@
+# pylint: disable=C0209
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from users.access_logs import AccessLogWriter
+from users.models import UserAccessLogs
+
+
+class Command(BaseCommand):
+    help = (
+        "Inserts the access logs appended to the fallback file when "
+        "they could not be written to the database. Logs that still "
+        "cannot be inserted are reported and kept in a rejected file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            help="Fallback file, defaults to ACCESS_LOG_FALLBACK_FILE."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of access logs per INSERT."
+        )
+
+    def handle(self, **options):
+        path = options['file'] or settings.ACCESS_LOG_FALLBACK_FILE
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError("--batch-size must be positive.")
+        if not os.path.exists(path):
+            self.stdout.write("No access logs to replay.")
+            return
+        # Logs spilled while replaying go to a new file
+        replaying = "{}.{}".format(path, os.getpid())
+        os.replace(path, replaying)
+        entries = AccessLogWriter.load(replaying)
+        rejected = []
+        for index in range(0, len(entries), batch_size):
+            rejected.extend(self.insert(entries[index:index + batch_size]))
+        if rejected:
+            AccessLogWriter.spill(rejected, "{}.rejected".format(path))
+        os.remove(replaying)
+        self.stdout.write(
+            "Replayed {} access logs.".format(len(entries) - len(rejected))
+        )
+        if rejected:
+            self.stderr.write(
+                "Could not insert {} access logs, which were kept in "
+                "{}.rejected.".format(len(rejected), path)
+            )
+
+    def insert(self, entries: list) -> list:
+        """
+        Inserts the given logs in a single INSERT, or one by one when
+        it fails, returning the logs that could not be inserted
+        """
+        try:
+            with transaction.atomic():
+                UserAccessLogs.objects.bulk_create(
+                    [UserAccessLogs(**entry) for entry in entries]
+                )
+            return []
+        except DatabaseError:
+            pass
+        rejected = []
+        for entry in entries:
+            try:
+                with transaction.atomic():
+                    UserAccessLogs.objects.create(**entry)
+            except DatabaseError as error:
+                self.stderr.write(
+                    "Rejected the access log of user {} at {}: {}".format(
+                        entry.get('user_id'),
+                        entry.get('access_timestamp'),
+                        error
+                    )
+                )
+                rejected.append(entry)
+        return rejected
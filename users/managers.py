@@ -1,5 +1,7 @@
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
+from django.db import models
+from django.db.models import OuterRef, Subquery
 from django.db.models.query import QuerySet
 from django.utils.translation import gettext_lazy as _
 
@@ -52,3 +54,18 @@ class CustomUserManager(BaseUserManager):
 
     def query_inactive(self) -> QuerySet:
         return self.filter(is_active=False)
+
+
+class AccessLogsManager(models.Manager):
+    def query_recent(self, size: int) -> QuerySet:
+        """
+        Returns the size most recent access logs of every user,
+        newest first. Meant to be prefetched for a page of users:
+        the subquery is correlated by user, so its cost does not
+        grow with their login history
+        """
+        recent_ids = self.filter(user=OuterRef('user'))\
+            .order_by('-access_timestamp', '-id')\
+            .values('id')[:size]
+        return self.filter(id__in=Subquery(recent_ids))\
+            .order_by('-access_timestamp', '-id')
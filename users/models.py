@@ -1,20 +1,20 @@
-import uuid
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from .managers import CustomUserManager
+from common.uuids import public_id_default
+
+from .managers import AccessLogsManager, CustomUserManager
 
 
 # Create your models here.
 class CustomUser(AbstractUser):
     email = models.EmailField(_("email address"), unique=True)
     username = models.CharField(_("username"), unique=True, max_length=50)
-    public_id = models.CharField(
-        default=uuid.uuid4,
-        unique=True,
-        max_length=36
+    public_id = models.UUIDField(
+        default=public_id_default,
+        unique=True
     )
     address = models.CharField(
         _("user address"),
@@ -40,6 +40,17 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Loads every deferred field along with the first one that is
+        accessed (e.g. of the users built from the token claims), so
+        that reading several of them costs a single query
+        """
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
+
     def activate(self) -> None:
         """
         Method to activate user
@@ -84,8 +95,10 @@ class UserAccessLogs(models.Model):
         blank=False,
         null=False
     )
+    # Set when the access happens, the log may be inserted later
     access_timestamp = models.DateTimeField(
-        auto_now_add=True
+        default=timezone.now,
+        editable=False
     )
     user_agent = models.CharField(
         max_length=255,
@@ -99,3 +112,16 @@ class UserAccessLogs(models.Model):
         max_length=50,
         null=True
     )
+
+    objects = AccessLogsManager()
+
+    class Meta:
+        indexes = [
+            # Serves the recent and paginated logs of a user. On
+            # PostgreSQL the table is partitioned by month (see
+            # users.partitions)
+            models.Index(
+                fields=['user', 'access_timestamp'],
+                name='users_access_user_time_idx'
+            ),
+        ]
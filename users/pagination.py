@@ -0,0 +1,13 @@
+from common.pagination import CreationCursorPagination
+
+
+class AccessTimestampCursorPagination(CreationCursorPagination):
+    """
+    Cursor pagination for access logs, newest first. They are
+    ordered by access_timestamp, which the (user, access_timestamp)
+    index serves, rather than by id, which batched writes assign
+    out of timestamp order. Rows sharing the position of a cursor
+    are told apart by the offset DRF keeps along with it, which
+    stays valid since logs are only appended with newer timestamps
+    """
+    ordering = ('-access_timestamp',)
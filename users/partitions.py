@@ -0,0 +1,280 @@
+# pylint: disable=C0209
+"""
+Contains the monthly partitioning of the access logs table, which
+is specific to PostgreSQL. Other backends keep a single table
+"""
+import logging
+import re
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db import (DEFAULT_DB_ALIAS, DatabaseError, connections,
+                       transaction)
+
+logger = logging.getLogger(__name__)
+
+TABLE = "users_useraccesslogs"
+UNPARTITIONED_TABLE = TABLE + "_unpartitioned"
+DEFAULT_PARTITION = TABLE + "_default"
+DEFAULT_ARCHIVE = TABLE + "_archive_default"
+INDEX = "users_access_user_time_idx"
+PARTITION = re.compile(r"^" + TABLE + r"_p(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """
+    First day of the month the given number of months away
+    """
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_of(moment: datetime) -> date:
+    """
+    First day of the UTC month of the given moment
+    """
+    moment = moment.astimezone(dt_timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+def partition_name(month: date) -> str:
+    return "{}_p{:04d}_{:02d}".format(TABLE, month.year, month.month)
+
+
+def archive_name(month: date) -> str:
+    return "{}_archive_{:04d}_{:02d}".format(TABLE, month.year, month.month)
+
+
+def month_bounds(month: date) -> tuple:
+    """
+    UTC range of the partition of the given month
+    """
+    return tuple(
+        datetime(day.year, day.month, 1, tzinfo=dt_timezone.utc)
+        for day in (month, add_months(month, 1))
+    )
+
+
+def is_partitioned(cursor) -> bool:
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE relname = %s",
+        [TABLE]
+    )
+    row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def list_partitions(cursor) -> list:
+    """
+    Months of the existing monthly partitions, oldest first
+    """
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = %s",
+        [TABLE]
+    )
+    months = []
+    for (name,) in cursor.fetchall():
+        match = PARTITION.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def create_partition(cursor, month: date) -> None:
+    """
+    Creates the partition of the given month. Rows of that month
+    stored meanwhile in the default partition are moved into it
+    """
+    start, end = month_bounds(month)
+    cursor.execute(
+        "SELECT EXISTS (SELECT 1 FROM {} WHERE access_timestamp >= %s "
+        "AND access_timestamp < %s)".format(DEFAULT_PARTITION),
+        [start, end]
+    )
+    misplaced = cursor.fetchone()[0]
+    if misplaced:
+        cursor.execute(
+            "ALTER TABLE {} DETACH PARTITION {}".format(
+                TABLE,
+                DEFAULT_PARTITION
+            )
+        )
+    cursor.execute(
+        "CREATE TABLE {} PARTITION OF {} "
+        "FOR VALUES FROM (%s) TO (%s)".format(partition_name(month), TABLE),
+        [start, end]
+    )
+    if misplaced:
+        cursor.execute(
+            "WITH moved AS (DELETE FROM {default} WHERE "
+            "access_timestamp >= %s AND access_timestamp < %s "
+            "RETURNING *) INSERT INTO {table} SELECT * FROM moved".format(
+                default=DEFAULT_PARTITION,
+                table=TABLE
+            ),
+            [start, end]
+        )
+        cursor.execute(
+            "ALTER TABLE {} ATTACH PARTITION {} DEFAULT".format(
+                TABLE,
+                DEFAULT_PARTITION
+            )
+        )
+
+
+def ensure_partitions(cursor, first: date, last: date) -> list:
+    """
+    Creates the missing partitions from the month first to the
+    month last, returning the months created
+    """
+    existing = set(list_partitions(cursor))
+    created = []
+    month = first
+    while month <= last:
+        if month not in existing:
+            create_partition(cursor, month)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
+
+
+def expire_partitions(cursor, before: date, archive: bool) -> list:
+    """
+    Drops the monthly partitions older than the month before, or
+    detaches them as standalone archive tables, returning their
+    months. Older rows of the default partition are deleted, after
+    being copied to an archive table when archiving
+    """
+    expired = [month for month in list_partitions(cursor) if month < before]
+    for month in expired:
+        if archive:
+            cursor.execute(
+                "ALTER TABLE {} DETACH PARTITION {}".format(
+                    TABLE,
+                    partition_name(month)
+                )
+            )
+            cursor.execute(
+                "ALTER TABLE {} RENAME TO {}".format(
+                    partition_name(month),
+                    archive_name(month)
+                )
+            )
+        else:
+            cursor.execute("DROP TABLE {}".format(partition_name(month)))
+    cutoff = month_bounds(before)[0]
+    if archive:
+        cursor.execute(
+            "CREATE TABLE IF NOT EXISTS {} (LIKE {})".format(
+                DEFAULT_ARCHIVE,
+                TABLE
+            )
+        )
+        cursor.execute(
+            "WITH moved AS (DELETE FROM {default} WHERE "
+            "access_timestamp < %s RETURNING *) "
+            "INSERT INTO {archive} SELECT * FROM moved".format(
+                default=DEFAULT_PARTITION,
+                archive=DEFAULT_ARCHIVE
+            ),
+            [cutoff]
+        )
+    else:
+        cursor.execute(
+            "DELETE FROM {} WHERE access_timestamp < %s".format(
+                DEFAULT_PARTITION
+            ),
+            [cutoff]
+        )
+    return expired
+
+
+def convert_table(cursor) -> None:
+    """
+    Replaces the table created by the migrations with a table
+    partitioned by access_timestamp, holding the same rows. The
+    partition key must be part of the primary key, which becomes
+    (id, access_timestamp). The migration state keeps the id as
+    primary key: makemigrations compares the models with it, never
+    with the database, so it does not try to restore it, but later
+    changes to the id or the index must be applied by hand
+    """
+    cursor.execute(
+        "ALTER TABLE {} RENAME TO {}".format(TABLE, UNPARTITIONED_TABLE)
+    )
+    cursor.execute(
+        "ALTER INDEX IF EXISTS {index} RENAME TO "
+        "{index}_unpartitioned".format(index=INDEX)
+    )
+    cursor.execute(
+        "CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING IDENTITY) "
+        "PARTITION BY RANGE (access_timestamp)".format(
+            TABLE,
+            UNPARTITIONED_TABLE
+        )
+    )
+    cursor.execute(
+        "ALTER TABLE {} ADD PRIMARY KEY (id, access_timestamp)".format(TABLE)
+    )
+    cursor.execute(
+        "CREATE INDEX {} ON {} (user_id, access_timestamp)".format(
+            INDEX,
+            TABLE
+        )
+    )
+    cursor.execute(
+        "ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fk "
+        "FOREIGN KEY (user_id) REFERENCES users_customuser (id) "
+        "DEFERRABLE INITIALLY DEFERRED".format(table=TABLE)
+    )
+    cursor.execute(
+        "CREATE TABLE {} PARTITION OF {} DEFAULT".format(
+            DEFAULT_PARTITION,
+            TABLE
+        )
+    )
+    cursor.execute(
+        "SELECT MIN(access_timestamp), MAX(access_timestamp) "
+        "FROM {}".format(UNPARTITIONED_TABLE)
+    )
+    oldest, newest = cursor.fetchone()
+    if oldest is not None:
+        ensure_partitions(cursor, month_of(oldest), month_of(newest))
+    cursor.execute(
+        "INSERT INTO {} SELECT * FROM {}".format(TABLE, UNPARTITIONED_TABLE)
+    )
+    cursor.execute(
+        "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+        "COALESCE(MAX(id), 0) + 1, false) FROM {}".format(TABLE),
+        [TABLE]
+    )
+    cursor.execute("DROP TABLE {}".format(UNPARTITIONED_TABLE))
+
+
+def partition_access_logs(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_migrate receiver that partitions the access logs by month
+    on PostgreSQL, and creates the partitions of the current month
+    and of the ACCESS_LOG_PARTITIONS_AHEAD following ones. Rows out
+    of every monthly partition go to a default partition
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    this_month = month_of(datetime.now(dt_timezone.utc))
+    try:
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                convert_table(cursor)
+            ensure_partitions(
+                cursor,
+                this_month,
+                add_months(this_month, settings.ACCESS_LOG_PARTITIONS_AHEAD)
+            )
+    except DatabaseError as e:
+        # e.g.: a server older than PostgreSQL 11
+        logger.warning("Could not partition the %s table: %s", TABLE, e)
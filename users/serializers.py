@@ -1,12 +1,14 @@
 # pylint: disable=W0223
 from copy import copy
 
+from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.utils.translation import gettext_lazy as _
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import UserAccessLogs
+from .tokens import UserRefreshToken
 
 User = get_user_model()
 
@@ -37,7 +39,9 @@ class LoginSerializer(serializers.Serializer):
                 _("Access denied: wrong email and password"),
                 code="no_active_account"
             )
-        refresh = RefreshToken.for_user(user)
+        # Kept for the view, which logs the access
+        self.user = user
+        refresh = UserRefreshToken.for_user(user)
         pair_token = {
             'refresh': str(refresh),
             'access': str(refresh.access_token)
@@ -59,10 +63,7 @@ class UserSerializer(serializers.ModelSerializer):
     public_id = serializers.CharField(
         read_only=True
     )
-    access_logs = UserAccessLogsSerializer(
-        many=True,
-        read_only=True
-    )
+    access_logs = serializers.SerializerMethodField()
     password = serializers.CharField(
         required=True,
         write_only=True
@@ -72,6 +73,19 @@ class UserSerializer(serializers.ModelSerializer):
         write_only=True
     )
 
+    @extend_schema_field(UserAccessLogsSerializer(many=True))
+    def get_access_logs(self, user) -> list:
+        """
+        Most recent access logs of the user, prefetched by UserView.
+        The full history has its own paginated endpoint
+        """
+        logs = getattr(user, 'recent_access_logs', None)
+        if logs is None:
+            logs = UserAccessLogs.objects.query_recent(
+                settings.RECENT_ACCESS_LOGS
+            ).filter(user=user)
+        return UserAccessLogsSerializer(logs, many=True).data
+
     def create(self, validated_data):
         # Validates whether matching passwords
         # were given or not
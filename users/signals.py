@@ -0,0 +1,16 @@
+from .authentication import UserStatus
+
+
+def refresh_user_status(instance, **kwargs):
+    """
+    post_save receiver that caches the active status of the user,
+    rejecting the tokens of a deactivated user right away
+    """
+    UserStatus.set(instance.id, instance.is_active)
+
+
+def forget_user_status(instance, **kwargs):
+    """
+    post_delete receiver that rejects the tokens of a deleted user
+    """
+    UserStatus.set(instance.id, False)
@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from users.access_logs import AccessLogWriter
+from users.models import AccessTypes, UserAccessLogs
+
+User = get_user_model()
+
+
+class AccessLogWriterTests(TransactionTestCase):
+    """
+    TestCase to test the batched writing of the access logs
+    from the background thread
+    """
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.fallback_file = os.path.join(directory, 'logs.jsonl')
+        settings = override_settings(
+            ACCESS_LOG_ASYNC=True,
+            ACCESS_LOG_BATCH_SIZE=2,
+            ACCESS_LOG_FALLBACK_FILE=self.fallback_file
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(AccessLogWriter.flush)
+        self.password = "testpassword"
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password=self.password
+        )
+        self.request = RequestFactory().post(
+            '/',
+            HTTP_USER_AGENT='agent',
+            REMOTE_ADDR='10.0.0.1'
+        )
+
+    def test_batched_write(self):
+        for _ in range(5):
+            AccessLogWriter.log(
+                self.user.id,
+                AccessTypes.ACCESS_TOKEN,
+                self.request
+            )
+        AccessLogWriter.flush()
+        logs = UserAccessLogs.objects.filter(user=self.user)
+        self.assertEqual(logs.count(), 5)
+        self.assertEqual(
+            set(logs.values_list('user_agent', 'ip_address')),
+            {('agent', '10.0.0.1')}
+        )
+        self.assertFalse(os.path.exists(self.fallback_file))
+
+    def test_login(self):
+        response = self.client.post(
+            reverse('user_login'),
+            {"email": self.user.email, "password": self.password},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        AccessLogWriter.flush()
+        self.assertEqual(
+            list(UserAccessLogs.objects.values_list('user', 'access_type')),
+            [(self.user.id, AccessTypes.EMAIL_PASSWORD)]
+        )
+
+    def test_fallback_file(self):
+        missing_id = self.user.id + 1
+        AccessLogWriter.log(missing_id, AccessTypes.ACCESS_TOKEN, self.request)
+        AccessLogWriter.flush()
+        self.assertFalse(UserAccessLogs.objects.exists())
+        entries = AccessLogWriter.load(self.fallback_file)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['user_id'], missing_id)
+        User.objects.create_user(
+            id=missing_id,
+            email="other@user.com",
+            username="otheruser",
+            password=self.password
+        )
+        call_command('replay_access_logs', stdout=StringIO())
+        log = UserAccessLogs.objects.get()
+        self.assertEqual(log.user_id, missing_id)
+        self.assertEqual(log.access_timestamp, entries[0]['access_timestamp'])
+        self.assertFalse(os.path.exists(self.fallback_file))
+
+    def test_long_headers(self):
+        request = RequestFactory().post(
+            '/',
+            HTTP_USER_AGENT='a' * 1000,
+            HTTP_SEC_CH_UA_PLATFORM='p' * 1000,
+            REMOTE_ADDR='10.0.0.1'
+        )
+        AccessLogWriter.log(self.user.id, AccessTypes.ACCESS_TOKEN, request)
+        AccessLogWriter.flush()
+        log = UserAccessLogs.objects.get()
+        self.assertEqual(log.user_agent, 'a' * 255)
+        self.assertEqual(log.platform, 'p' * 100)
+        self.assertFalse(os.path.exists(self.fallback_file))
+
+    def test_replay_rejects_invalid_logs(self):
+        missing_id = self.user.id + 1
+        entry = {
+            'user_id': self.user.id,
+            'access_type': AccessTypes.ACCESS_TOKEN,
+            'access_timestamp': timezone.now(),
+            'user_agent': 'agent',
+            'platform': None,
+            'ip_address': None,
+        }
+        # Spilled before the fields were truncated
+        AccessLogWriter.spill([
+            entry,
+            dict(entry, user_id=missing_id),
+            dict(entry, user_agent='a' * 1000),
+        ])
+        call_command(
+            'replay_access_logs',
+            stdout=StringIO(),
+            stderr=StringIO()
+        )
+        self.assertEqual(
+            sorted(
+                UserAccessLogs.objects.values_list('user_agent', flat=True)
+            ),
+            ['a' * 255, 'agent']
+        )
+        rejected = AccessLogWriter.load(self.fallback_file + '.rejected')
+        self.assertEqual(
+            [missing_id],
+            [entry['user_id'] for entry in rejected]
+        )
+        self.assertFalse(os.path.exists(self.fallback_file))
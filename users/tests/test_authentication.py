@@ -0,0 +1,96 @@
+# pylint: disable=C0209
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.tokens import UserRefreshToken
+
+User = get_user_model()
+
+
+class StatelessAuthenticationTests(APITestCase):
+    """
+    TestCase to test the authentication built from the token claims
+    """
+    def setUp(self):
+        cache.clear()
+        self.password = "testpassword"
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password=self.password
+        )
+        self.url = reverse('tasks-list')
+
+    def authorize(self, token) -> None:
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(token))
+
+    def user_queries(self) -> list:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query['sql'] for query in context.captured_queries
+            if '"users_customuser"' in query['sql']
+        ]
+
+    def test_login_claims(self):
+        response = self.client.post(
+            reverse('user_login'),
+            {"email": self.user.email, "password": self.password},
+            format="json"
+        )
+        token = AccessToken(response.data['access'])
+        self.assertEqual(token['public_id'], str(self.user.public_id))
+        self.assertTrue(token['is_active'])
+
+    def test_no_user_query(self):
+        self.authorize(UserRefreshToken.for_user(self.user).access_token)
+        # The active status is cached on save
+        self.assertEqual(self.user_queries(), [])
+
+    def test_status_cache_miss(self):
+        self.authorize(UserRefreshToken.for_user(self.user).access_token)
+        cache.clear()
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_legacy_token(self):
+        self.authorize(AccessToken.for_user(self.user))
+        self.assertEqual(len(self.user_queries()), 1)
+
+    def test_deactivated_user(self):
+        self.authorize(UserRefreshToken.for_user(self.user).access_token)
+        self.user.deactivate()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.activate()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleted_user(self):
+        self.authorize(UserRefreshToken.for_user(self.user).access_token)
+        self.user.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_lazy_fields(self):
+        self.authorize(UserRefreshToken.for_user(self.user).access_token)
+        response = self.client.post(
+            reverse('token_login'),
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user = response.wsgi_request.user
+        self.assertEqual(user.id, self.user.id)
+        self.assertTrue(user.get_deferred_fields())
+        # The other fields are loaded together
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+            self.assertEqual(user.username, self.user.username)
+            self.assertFalse(user.is_staff)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+User = get_user_model()
+
+
+def work_factor(user) -> int:
+    return int(user.password.split('$')[3])
+
+
+@override_settings(BCRYPT_ROUNDS=4)
+class PasswordHashingTests(TestCase):
+    """
+    TestCase to test the configurable bcrypt cost and rehash policy
+    """
+    def setUp(self):
+        self.password = "testpassword"
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password=self.password
+        )
+
+    def login(self):
+        return self.client.post(
+            reverse('user_login'),
+            {"email": self.user.email, "password": self.password},
+            format="json"
+        )
+
+    def test_cost(self):
+        self.assertEqual(work_factor(self.user), 4)
+
+    def test_rehash_always(self):
+        with self.settings(BCRYPT_ROUNDS=5, BCRYPT_REHASH='always'):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(work_factor(self.user), 5)
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(work_factor(self.user), 4)
+
+    def test_rehash_upgrade(self):
+        with self.settings(BCRYPT_ROUNDS=5, BCRYPT_REHASH='upgrade'):
+            self.login()
+        self.user.refresh_from_db()
+        self.assertEqual(work_factor(self.user), 5)
+        with self.settings(BCRYPT_REHASH='upgrade'):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(work_factor(self.user), 5)
+
+    def test_rehash_never(self):
+        with self.settings(BCRYPT_ROUNDS=5, BCRYPT_REHASH='never'):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(work_factor(self.user), 4)
+
+    def test_single_user_fetch(self):
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        user_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "users_customuser"' in query['sql']
+        ]
+        self.assertEqual(len(user_queries), 1)
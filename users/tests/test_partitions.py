@@ -0,0 +1,175 @@
+# pylint: disable=C0209
+import unittest
+from datetime import date, datetime, timedelta
+from io import StringIO
+from unittest import mock
+
+import pytz
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from users.models import AccessTypes, UserAccessLogs
+from users.partitions import (INDEX, TABLE, add_months, convert_table,
+                              is_partitioned, list_partitions, month_bounds,
+                              month_of, partition_name)
+
+User = get_user_model()
+
+
+class PartitionHelpersTests(TestCase):
+    """
+    TestCase to test the month arithmetic of the partitions
+    """
+    def test_months(self):
+        self.assertEqual(add_months(date(2023, 11, 1), 3), date(2024, 2, 1))
+        self.assertEqual(add_months(date(2023, 1, 1), -1), date(2022, 12, 1))
+        moment = datetime(2023, 3, 1, 2, tzinfo=pytz.timezone('Etc/GMT-3'))
+        self.assertEqual(month_of(moment), date(2023, 2, 1))
+        self.assertEqual(
+            month_bounds(date(2023, 12, 1)),
+            (
+                datetime(2023, 12, 1, tzinfo=pytz.UTC),
+                datetime(2024, 1, 1, tzinfo=pytz.UTC)
+            )
+        )
+        self.assertEqual(
+            partition_name(date(2023, 3, 1)),
+            'users_useraccesslogs_p2023_03'
+        )
+
+    def test_index(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                UserAccessLogs._meta.db_table
+            )
+        self.assertEqual(
+            constraints[INDEX]['columns'],
+            ['user_id', 'access_timestamp']
+        )
+
+
+class PruneAccessLogsTests(TestCase):
+    """
+    TestCase to test the retention command on a single table
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password="testpassword"
+        )
+        now = datetime(2023, 5, 15, tzinfo=pytz.UTC)
+        UserAccessLogs.objects.bulk_create([
+            UserAccessLogs(
+                user=self.user,
+                access_type=AccessTypes.ACCESS_TOKEN,
+                access_timestamp=now - timedelta(days=days)
+            )
+            for days in (0, 30, 45, 80, 400)
+        ])
+        patcher = mock.patch(
+            'users.management.commands.prune_access_logs.datetime',
+            wraps=datetime
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start().now.return_value = now
+
+    def test_prune(self):
+        out = StringIO()
+        call_command('prune_access_logs', months=2, stdout=out)
+        self.assertIn(
+            "Deleted 2 access logs older than 2023-03-01",
+            out.getvalue()
+        )
+        self.assertEqual(
+            sorted(
+                timestamp.date() for timestamp in
+                UserAccessLogs.objects.values_list(
+                    'access_timestamp',
+                    flat=True
+                )
+            ),
+            [date(2023, 3, 31), date(2023, 4, 15), date(2023, 5, 15)]
+        )
+
+    def test_archive_requires_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command('prune_access_logs', archive=True)
+        with self.assertRaises(CommandError):
+            call_command('prune_access_logs', months=0)
+
+
+@unittest.skipUnless(
+    connection.vendor == 'postgresql',
+    "The access logs are only partitioned on PostgreSQL"
+)
+class ConvertTableTests(TestCase):
+    """
+    TestCase to test the conversion of the table created by
+    the migrations into the partitioned table
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@user.com",
+            username="testuser",
+            password="testpassword"
+        )
+
+    def primary_key(self, cursor) -> list:
+        constraints = connection.introspection.get_constraints(cursor, TABLE)
+        return next(
+            constraint['columns'] for constraint in constraints.values()
+            if constraint['primary_key']
+        )
+
+    def log(self, moment: datetime) -> UserAccessLogs:
+        return UserAccessLogs.objects.create(
+            user=self.user,
+            access_type=AccessTypes.ACCESS_TOKEN,
+            access_timestamp=moment
+        )
+
+    def test_convert_table(self):
+        with connection.cursor() as cursor:
+            # Partitioned by the post_migrate receiver
+            self.assertTrue(is_partitioned(cursor))
+            cursor.execute("DROP TABLE {} CASCADE".format(TABLE))
+        # Back to the table created by the migrations
+        with connection.schema_editor() as editor:
+            editor.create_model(UserAccessLogs)
+        logs = [
+            self.log(datetime(2023, 1, 15, tzinfo=pytz.UTC)),
+            self.log(datetime(2023, 2, 15, tzinfo=pytz.UTC)),
+        ]
+        with connection.cursor() as cursor:
+            self.assertFalse(is_partitioned(cursor))
+            self.assertEqual(self.primary_key(cursor), ['id'])
+            convert_table(cursor)
+            self.assertTrue(is_partitioned(cursor))
+            self.assertEqual(
+                list_partitions(cursor),
+                [date(2023, 1, 1), date(2023, 2, 1)]
+            )
+            self.assertEqual(
+                self.primary_key(cursor),
+                ['id', 'access_timestamp']
+            )
+        self.assertEqual(
+            sorted(UserAccessLogs.objects.values_list('id', flat=True)),
+            [log.id for log in logs]
+        )
+        # The id sequence carries on from the copied rows
+        log = self.log(datetime(2023, 2, 20, tzinfo=pytz.UTC))
+        self.assertGreater(log.id, logs[-1].id)
+        # The migration state still has the id as primary key, which
+        # makemigrations does not try to restore
+        call_command(
+            'makemigrations',
+            'users',
+            check=True,
+            dry_run=True,
+            stdout=StringIO()
+        )
@@ -1,16 +1,22 @@
 import os
 from copy import copy
+from datetime import datetime, timedelta
 from io import StringIO
 from unittest import mock
 
+import pytz
+
 from django.contrib.auth import get_user_model
 from django.core.management import call_command
-from django.test import TestCase, tag
+from django.db import connection
+from django.test import TestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from users.factories.users_factories import CustomUserFactory
+from users.models import AccessTypes, UserAccessLogs
 
 # Create your tests here.
 User = get_user_model()
@@ -298,6 +304,19 @@ class UsersEndpointTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_list_users(self):
+        """
+        Test for users listing through cursor pages
+        """
+        self.client.force_authenticate(user=self.user_admin)
+        response = self.client.get(self.base_url, {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [self.test_user.email],
+            [user['email'] for user in response.data['results']]
+        )
+        self.assertIsNotNone(response.data['next'])
+
     def test_retrieve_user(self):
         """
         Test to retrieve a user
@@ -325,3 +344,61 @@ class UsersEndpointTest(APITestCase):
         self.client.force_authenticate(user=self.user_admin)
         response = self.client.delete(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def create_access_logs(self, user, size: int) -> list:
+        start = datetime(2023, 3, 1, tzinfo=pytz.UTC)
+        return UserAccessLogs.objects.bulk_create([
+            UserAccessLogs(
+                user=user,
+                access_type=AccessTypes.ACCESS_TOKEN,
+                access_timestamp=start + timedelta(minutes=minute)
+            )
+            for minute in range(size)
+        ])
+
+    @override_settings(RECENT_ACCESS_LOGS=3)
+    def test_recent_access_logs(self):
+        """
+        Test that users only nest their most recent access logs,
+        fetched in a single query whatever their history
+        """
+        logs = self.create_access_logs(self.test_user, 10)
+        self.create_access_logs(self.user_admin, 1)
+        self.client.force_authenticate(user=self.user_admin)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), 2)
+        nested = {
+            user['email']: [log['id'] for log in user['access_logs']]
+            for user in response.data['results']
+        }
+        self.assertEqual(
+            nested[self.test_user.email],
+            [log.id for log in reversed(logs[-3:])]
+        )
+        self.assertEqual(len(nested[self.user_admin.email]), 1)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(len(response.data['access_logs']), 3)
+
+    def test_access_logs_history(self):
+        """
+        Test the cursor pages of the access logs of a user
+        """
+        logs = self.create_access_logs(self.test_user, 5)
+        self.client.force_authenticate(user=self.user_admin)
+        url = reverse(
+            'users-access-logs',
+            kwargs={"public_id": self.test_user.public_id}
+        )
+        response = self.client.get(url, {'page_size': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [log['id'] for log in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [log['id'] for log in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(ids, [log.id for log in reversed(logs)])
+        response = self.client.get(
+            reverse('users-access-logs', kwargs={"public_id": "missing"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,18 @@
+"""
+Contains the JWT issued at login, carrying the claims
+the stateless authentication builds the user from
+"""
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class UserRefreshToken(RefreshToken):
+    """
+    Refresh token also carrying the public id and the active status
+    of the user. Access tokens derived from it copy both claims
+    """
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['public_id'] = str(user.public_id)
+        token['is_active'] = user.is_active
+        return token
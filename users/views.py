@@ -1,19 +1,23 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from django.utils.translation import gettext_lazy as _
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (OpenApiExample, OpenApiParameter,
                                    extend_schema, extend_schema_view)
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from common.utils import Utils
-
-from .models import AccessTypes
+from .access_logs import AccessLogWriter
+from .models import AccessTypes, UserAccessLogs
+from .pagination import AccessTimestampCursorPagination
 from .serializers import (LoginSerializer, UserAccessLogsSerializer,
                           UserSerializer)
 
@@ -29,35 +33,17 @@ class LoginView(TokenObtainPairView):
         summary=_("Endpoint to get JWT pair token (access and refresh tokens)")
     )
     def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
         try:
-            response = super().post(request, *args, **kwargs)
-            if response.status_code == 200:
-                user_agent, platform, ip_address = Utils.get_request_info(
-                    request
-                )
-                user = User.objects.filter(email=request.data.get('email'))\
-                    .first()
-                user_access_log_data = {
-                    "user": user.id,
-                    "access_type": AccessTypes.EMAIL_PASSWORD,
-                    "user_agent": user_agent,
-                    "platform": platform,
-                    "ip_address": ip_address,
-                }
-
-                access_log_data = UserAccessLogsSerializer(
-                    data=user_access_log_data
-                )
-                if access_log_data.is_valid():
-                    access_log_data.save()
-                else:
-                    return Response(
-                        access_log_data.errors,
-                        status.HTTP_400_BAD_REQUEST
-                    )
-            return response
-        except InvalidToken as e:
-            raise e
+            serializer.is_valid(raise_exception=True)
+        except TokenError as e:
+            raise InvalidToken(e.args[0]) from e
+        AccessLogWriter.log(
+            serializer.user.id,
+            AccessTypes.EMAIL_PASSWORD,
+            request
+        )
+        return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
 
 class LoginWithTokenView(APIView):
@@ -68,27 +54,8 @@ class LoginWithTokenView(APIView):
         summary=_("Endpoint to login with JWT access token")
     )
     def post(self, request):
-        user_agent, platform, ip_address = Utils.get_request_info(
-            request
-        )
-        user = request.user
-        data = {
-            "user": user.id,
-            "access_type": AccessTypes.ACCESS_TOKEN,
-            "user_agent": user_agent,
-            "platform": platform,
-            "ip_addres": ip_address
-        }
-        access_log_data = UserAccessLogsSerializer(
-            data=data
-        )
-        if access_log_data.is_valid():
-            access_log_data.save()
-            return Response("OK", status=status.HTTP_200_OK)
-        return Response(
-            access_log_data.errors,
-            status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        AccessLogWriter.log(request.user.id, AccessTypes.ACCESS_TOKEN, request)
+        return Response("OK", status=status.HTTP_200_OK)
 
 
 class UserView(ModelViewSet):   # pylint: disable=R0901
@@ -97,3 +64,33 @@ class UserView(ModelViewSet):   # pylint: disable=R0901
     permission_classes = [IsAuthenticated]
     # Changes default lookup field for details endpoints
     lookup_field = 'public_id'
+
+    def get_queryset(self):
+        # Users come with their RECENT_ACCESS_LOGS latest
+        # logs only, fetched in a single query per page
+        return super().get_queryset().prefetch_related(
+            Prefetch(
+                'access_logs',
+                queryset=UserAccessLogs.objects.query_recent(
+                    settings.RECENT_ACCESS_LOGS
+                ),
+                to_attr='recent_access_logs'
+            )
+        )
+
+    @extend_schema(
+        summary=_("Endpoint to list the access logs of a user, newest first")
+    )
+    @action(
+        detail=True,
+        url_path='access-logs',
+        serializer_class=UserAccessLogsSerializer,
+        pagination_class=AccessTimestampCursorPagination
+    )
+    def access_logs(self, request, public_id=None):
+        user = get_object_or_404(User.objects.only('id'), public_id=public_id)
+        page = self.paginate_queryset(
+            UserAccessLogs.objects.filter(user=user)
+        )
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)